@@ -1,6 +1,14 @@
 # app/__init__.py
-from .runtime import CommandLine
-from .services.ff_scraper_service import ForexFactoryScraperService
-from .config import Config
+# Imported on first use, see app/services/__init__.py
+from app.helpers.lazy_exports import lazy_exports
 
-__all__ = ['CommandLine', 'ForexFactoryScraperService', 'Config']
+_EXPORTS = {
+    'CommandLine': '.runtime.command_line',
+    'ForexFactoryScraperService': '.services.ff_scraper_service',
+    'Config': '.config',
+}
+
+# Optional, for explicit API exposure
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(globals(), _EXPORTS)
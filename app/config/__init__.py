@@ -1,4 +1,5 @@
 # app/config/__init__.py
 from .config import Config
+from .run_settings import RunSettings
 
-__all__ = ['Config']
+__all__ = ['Config', 'RunSettings']
@@ -1,5 +1,4 @@
 from datetime import datetime
-import json
 import logging
 import os
 
@@ -19,15 +18,43 @@ class Config(metaclass=SingletonMeta):
     IMPACT_FILTERS_KEY = 'IMPACT_FILTERS'
     NNFX_FILTERS_KEY = 'NNFX_FILTERS'
     CALENDAR_TEMPLATE_KEY = 'CALENDAR_TEMPLATE'
+    BROWSER_PAGE_CONCURRENCY_KEY = 'BROWSER_PAGE_CONCURRENCY'
+    BROWSER_MAX_NAVIGATIONS_KEY = 'BROWSER_MAX_NAVIGATIONS'
+    BROWSER_MAX_RSS_MB_KEY = 'BROWSER_MAX_RSS_MB'
+    HTTP_POOL_SIZE_KEY = 'HTTP_POOL_SIZE'
+    HTTP_TIMEOUT_SECONDS_KEY = 'HTTP_TIMEOUT_SECONDS'
+    BLOCKED_RESOURCE_TYPES_KEY = 'BLOCKED_RESOURCE_TYPES'
+    BLOCK_THIRD_PARTY_KEY = 'BLOCK_THIRD_PARTY'
+    DATA_READY_TIMEOUT_MS_KEY = 'DATA_READY_TIMEOUT_MS'
+    FETCH_DEADLINE_SECONDS_KEY = 'FETCH_DEADLINE_SECONDS'
+    FETCH_HEDGE_ENABLED_KEY = 'FETCH_HEDGE_ENABLED'
+    FETCH_HEDGE_PERCENTILE_KEY = 'FETCH_HEDGE_PERCENTILE'
+    FETCH_HEDGE_DELAY_MS_KEY = 'FETCH_HEDGE_DELAY_MS'
+    SHARD_CONCURRENCY_KEY = 'SHARD_CONCURRENCY'
+    SCHEDULER_CONCURRENCY_KEY = 'SCHEDULER_CONCURRENCY'
+    OUTPUT_CONCURRENCY_KEY = 'OUTPUT_CONCURRENCY'
+    ANALYSIS_POOL_THRESHOLD_KEY = 'ANALYSIS_POOL_THRESHOLD'
+    ANALYSIS_POOL_WORKERS_KEY = 'ANALYSIS_POOL_WORKERS'
+    INCREMENTAL_ANALYSIS_KEY = 'INCREMENTAL_ANALYSIS'
+    ANALYSIS_STATE_MAX_ENTRIES_KEY = 'ANALYSIS_STATE_MAX_ENTRIES'
+    WORKER_SOCKET_KEY = 'WORKER_SOCKET'
+    PROMETHEUS_TEXTFILE_KEY = 'PROMETHEUS_TEXTFILE'
+    WORKER_CONCURRENCY_KEY = 'WORKER_CONCURRENCY'
+    WORKER_CLIENT_ENABLED_KEY = 'WORKER_CLIENT_ENABLED'
+    SHARD_RETRIES_KEY = 'SHARD_RETRIES'
+    CALENDAR_CACHE_DIR_KEY = 'CALENDAR_CACHE_DIR'
+    CALENDAR_CACHE_TTL_SECONDS_KEY = 'CALENDAR_CACHE_TTL_SECONDS'
+    CALENDAR_CACHE_STALE_WHILE_REVALIDATE_KEY = 'CALENDAR_CACHE_STALE_WHILE_REVALIDATE'
     EXTRA_HTTP_HEADERS = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/110.0.0.0 Safari/537.36',
         'Accept-Language': 'en-US,en;q=0.9'
     }
 
     _is_initialized = False
+    _environment_loaded = False
 
     def __init__(self, base_dir=None, custom_nnfx_filters=None, custom_calendar_template=None):
-        load_dotenv()  # Load environment variables from .env file
+        Config.load_environment()
         # Prevent re-initialization
         if not self._is_initialized:
             # Initialize other configuration settings here
@@ -56,10 +83,46 @@ class Config(metaclass=SingletonMeta):
         # This method can be expanded to include more initialization parameters if needed
         cls(base_dir=base_dir)
 
+    @staticmethod
+    def load_environment():
+        """
+        Load environment variables from the .env file, once per process.
+        """
+        if not Config._environment_loaded:
+            load_dotenv()
+            Config._environment_loaded = True
+
     @staticmethod
     def get(key, default=None):
+        Config.load_environment()
         return os.getenv(key, default)
 
+    @staticmethod
+    def get_int(key, default):
+        value = Config.get(key)
+        if value is None or str(value).strip() == '':
+            return default
+        try:
+            return int(value)
+        except ValueError:
+            logging.getLogger(__name__).warning(
+                "Invalid integer for %s: '%s'. Using default %s", key, value, default)
+            return default
+
+    @staticmethod
+    def get_bool(key, default):
+        value = Config.get(key)
+        if value is None or str(value).strip() == '':
+            return default
+        return str(value).strip().lower() in ('1', 'true', 'yes', 'on')
+
+    @staticmethod
+    def get_list(key, default):
+        value = Config.get(key)
+        if value is None:
+            return list(default)
+        return [item.strip() for item in value.split(',') if item.strip()]
+
     def set_filters(self, impact_classes=None, currencies=None):
         if impact_classes is not None and len(impact_classes) > 0:
             self.impact_filters = impact_classes
@@ -82,14 +145,39 @@ class Config(metaclass=SingletonMeta):
 
     def get_url(self):
         if self.time_period == TimePeriod.CUSTOM and self.custom_start_date and self.custom_end_date:
-            start_date_formatted = self._format_date(self.custom_start_date)
-            end_date_formatted = self._format_date(self.custom_end_date)
-            href = f'{self.get_href()}{start_date_formatted}-{end_date_formatted}'
-            url = Utils.create_full_url(Config.get(Config.BASE_URL_KEY), href)
-            return url
+            return Config.build_custom_url(self.custom_start_date, self.custom_end_date)
         else:
-            url = Utils.create_full_url(Config.get(Config.BASE_URL_KEY), self.get_href())
-            return url
+            return Config.build_period_url(self.time_period)
+
+    @staticmethod
+    def build_period_url(time_period):
+        """
+        Build the calendar URL for a relative time period such as 'this week'.
+
+        Parameters:
+        time_period (TimePeriod): The time period.
+
+        Returns:
+        str: The full calendar URL.
+        """
+        return Utils.create_full_url(Config.get(Config.BASE_URL_KEY), TimePeriod.to_href(time_period))
+
+    @staticmethod
+    def build_custom_url(start_date, end_date):
+        """
+        Build the calendar URL for a custom date range.
+
+        Parameters:
+        start_date (str): Start of the range (YYYY-MM-DD).
+        end_date (str): End of the range (YYYY-MM-DD).
+
+        Returns:
+        str: The full calendar URL.
+        """
+        start_date_formatted = Config._format_date(start_date)
+        end_date_formatted = Config._format_date(end_date)
+        href = f'{TimePeriod.to_href(TimePeriod.CUSTOM)}{start_date_formatted}-{end_date_formatted}'
+        return Utils.create_full_url(Config.get(Config.BASE_URL_KEY), href)
 
     @staticmethod
     def _format_date(date_str):
@@ -111,18 +199,11 @@ class Config(metaclass=SingletonMeta):
 
     def load_nnfx_filters(self):
         if self.custom_nnfx_filters:
-            self.logger.info('Loading custom nnfx filters: %s',
-                             self.custom_nnfx_filters)
-            filters_content = ResourceLoader.load_resource_file(
-                self.custom_nnfx_filters)
-        else:
-            filters_content = ResourceLoader.load_resource_file_by_key(
-                Config.NNFX_FILTERS_KEY)
-        try:
-            return json.loads(filters_content) if filters_content else {}
-        except json.JSONDecodeError:
-            self.logger.error("Failed to decode JSON for NNFX filters")
-            return {}
+            logging.getLogger(__name__).info('Loading custom nnfx filters: %s',
+                                             self.custom_nnfx_filters)
+        filters = ResourceLoader.load_json_resource_file(
+            self.custom_nnfx_filters or Config.get(Config.NNFX_FILTERS_KEY))
+        return dict(filters) if isinstance(filters, dict) else {}
 
     def load_template(self):
         """
@@ -0,0 +1,104 @@
+import logging
+from dataclasses import dataclass, field
+from types import MappingProxyType
+
+from app.config.config import Config
+from app.helpers import ResourceLoader
+from app.models.currencies import Currencies
+from app.models.impact_class import ImpactClass
+from app.models.time_period import TimePeriod
+
+# Initialize the logger for this module
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RunSettings:
+    """
+    Immutable settings of one run, resolved once from the command line
+    arguments and the environment and passed explicitly to the services.
+    """
+    time_period: TimePeriod = TimePeriod.TODAY
+    impact_filters: tuple = ()
+    currency_filters: tuple = ()
+    nnfx: bool = False
+    nnfx_filters: MappingProxyType = field(default_factory=lambda: MappingProxyType({}))
+    calendar_template: str = None
+    custom_start_date: str = None
+    custom_end_date: str = None
+
+    @classmethod
+    def from_args(cls, args=None):
+        """
+        Build the settings of a run.
+
+        Filters given on the command line replace the IMPACT_FILTERS and
+        CURRENCY_FILTERS defaults from the environment. The NNFX filters and the
+        calendar template come from the process-wide resource cache.
+
+        Parameters:
+        args (CommandLineArgs, optional): The run's arguments. Without them the
+            environment defaults are used.
+
+        Returns:
+        RunSettings: The settings.
+        """
+        Config.load_environment()
+
+        impact_filters = tuple(getattr(args, 'impact_classes', None) or ()) or tuple(
+            ImpactClass.from_text(ic.strip()) for ic in Config.get_list(Config.IMPACT_FILTERS_KEY, []))
+        currency_filters = tuple(getattr(args, 'currencies', None) or ()) or tuple(
+            Currencies.from_text(curr.strip()) for curr in Config.get_list(Config.CURRENCY_FILTERS_KEY, []))
+        time_period = getattr(args, 'time_period', None) or TimePeriod.TODAY
+
+        custom_nnfx_filters = getattr(args, 'custom_nnfx_filters', None)
+        if custom_nnfx_filters:
+            logger.info('Using custom nnfx filters: %s', custom_nnfx_filters)
+        nnfx_filters = ResourceLoader.load_json_resource_file(
+            custom_nnfx_filters or Config.get(Config.NNFX_FILTERS_KEY))
+        if not isinstance(nnfx_filters, dict):
+            if nnfx_filters is not None:
+                logger.error("NNFX filters must be a JSON object")
+            nnfx_filters = {}
+
+        custom_calendar_template = getattr(args, 'custom_calendar_template', None)
+        if custom_calendar_template:
+            logger.info('Using custom calendar template: %s', custom_calendar_template)
+        calendar_template = ResourceLoader.load_resource_file(
+            custom_calendar_template or Config.get(Config.CALENDAR_TEMPLATE_KEY))
+
+        is_custom = time_period == TimePeriod.CUSTOM
+        return cls(
+            time_period=time_period,
+            impact_filters=impact_filters,
+            currency_filters=currency_filters,
+            nnfx=bool(getattr(args, 'nnfx', False)),
+            nnfx_filters=MappingProxyType(nnfx_filters),
+            calendar_template=calendar_template,
+            custom_start_date=args.start_date if is_custom else None,
+            custom_end_date=args.end_date if is_custom else None,
+        )
+
+    def __getstate__(self):
+        # MappingProxyType cannot be pickled, e.g. to send the settings to an analysis worker
+        return dict(self.__dict__, nnfx_filters=dict(self.nnfx_filters))
+
+    def __setstate__(self, state):
+        state['nnfx_filters'] = MappingProxyType(state['nnfx_filters'])
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
+    def get_url(self):
+        """
+        Returns:
+        str: The calendar URL of the run's time period.
+        """
+        if self.time_period == TimePeriod.CUSTOM and self.custom_start_date and self.custom_end_date:
+            return Config.build_custom_url(self.custom_start_date, self.custom_end_date)
+        return Config.build_period_url(self.time_period)
+
+    def get_impact_filter_list(self):
+        return [item.value for item in self.impact_filters] if self.impact_filters else None
+
+    def get_currency_filter_list(self):
+        return [item.value for item in self.currency_filters] if self.currency_filters else None
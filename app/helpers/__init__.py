@@ -1,5 +1,9 @@
 # app/config/__init__.py
 from .utils import Utils
 from .resource_loader import ResourceLoader
+from .calendar_state_parser import CalendarStateParser, CalendarMarkupError
+from .latency_history import LatencyHistory
+from .run_profiler import RunProfiler
 
-__all__ = ['Utils', 'ResourceLoader']
+__all__ = ['Utils', 'ResourceLoader',
+           'CalendarStateParser', 'CalendarMarkupError', 'LatencyHistory', 'RunProfiler']
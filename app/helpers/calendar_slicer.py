@@ -0,0 +1,62 @@
+import re
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from app.helpers.constants import CALENDAR_TIMEZONE
+
+
+class CalendarSlicer:
+    """
+    Cuts narrower date ranges out of an already fetched days array.
+    """
+
+    MARKUP_PATTERN = re.compile(r'<[^>]+>')
+
+    @staticmethod
+    def day_date(day, year_hint=None):
+        """
+        Determine the calendar date of a day entry.
+
+        The day's 'dateline' is midnight in the calendar's timezone. Entries without
+        one fall back to their 'date' label (e.g. 'Mon <span>Jun 3</span>'), which
+        carries no year, so year_hint is used to complete it.
+
+        Parameters:
+        day (dict): A day of the days array.
+        year_hint (int, optional): Year used for a day label without a dateline.
+
+        Returns:
+        date: The day's date, or None if it cannot be determined.
+        """
+        dateline = day.get('dateline')
+        if isinstance(dateline, (int, float)):
+            return datetime.fromtimestamp(dateline, ZoneInfo(CALENDAR_TIMEZONE)).date()
+
+        label = CalendarSlicer.MARKUP_PATTERN.sub(' ', day.get('date') or '').split()
+        if year_hint is None or len(label) < 3:
+            return None
+        try:
+            return datetime.strptime(f'{label[-2]} {label[-1]} {year_hint}', '%b %d %Y').date()
+        except ValueError:
+            return None
+
+    @staticmethod
+    def slice_days(days_array, start, end):
+        """
+        Keep the days that fall inside an inclusive date range.
+
+        Parameters:
+        days_array (list): The fetched days array.
+        start (date): First day of the range.
+        end (date): Last day of the range.
+
+        Returns:
+        list: The days inside the range, in their original order.
+        """
+        sliced = []
+        for day in days_array:
+            # A range can span New Year, so try both years for labels without a dateline
+            day_dates = {CalendarSlicer.day_date(day, year) for year in (start.year, end.year)}
+            if any(day_date is not None and start <= day_date <= end for day_date in day_dates):
+                sliced.append(day)
+        return sliced
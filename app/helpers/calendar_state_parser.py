@@ -0,0 +1,56 @@
+import json
+import re
+
+
+class CalendarMarkupError(ValueError):
+    """
+    Raised when the calendar HTML does not contain a recognizable calendar state.
+    """
+
+
+class CalendarStateParser:
+    """
+    Extracts `window.calendarComponentStates[1].days` from raw calendar HTML
+    without executing any JavaScript.
+    """
+
+    STATE_ASSIGNMENT_PATTERN = re.compile(
+        r'calendarComponentStates\s*\[\s*1\s*\]\s*=\s*\{')
+    DAYS_PATTERN = re.compile(r'[{,]\s*["\']?days["\']?\s*:\s*(?=\[)')
+
+    @staticmethod
+    def extract_days(html):
+        """
+        Parse the days array out of the inline script that assigns calendarComponentStates.
+
+        Parameters:
+        html (str): The calendar page HTML.
+
+        Returns:
+        list: The days array, as the browser would have returned it.
+
+        Raises:
+        CalendarMarkupError: If the script or the days array cannot be found or parsed.
+        """
+        if not html:
+            raise CalendarMarkupError("Empty calendar HTML")
+
+        state_match = CalendarStateParser.STATE_ASSIGNMENT_PATTERN.search(html)
+        if state_match is None:
+            raise CalendarMarkupError("calendarComponentStates[1] assignment not found")
+
+        # The state object starts with the '{' that closed the assignment match
+        days_match = CalendarStateParser.DAYS_PATTERN.search(html, state_match.end() - 1)
+        if days_match is None:
+            raise CalendarMarkupError("days array not found in calendarComponentStates[1]")
+
+        try:
+            days_array, _ = json.JSONDecoder().raw_decode(html, days_match.end())
+        except json.JSONDecodeError as e:
+            raise CalendarMarkupError(f"days array is not valid JSON: {e}") from e
+
+        if not isinstance(days_array, list) or not all(
+                isinstance(day, dict) and isinstance(day.get('events'), list) for day in days_array):
+            raise CalendarMarkupError("days array does not have the expected structure")
+
+        return days_array
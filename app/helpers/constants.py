@@ -1 +1,4 @@
 BASE_URL_KEY = 'BASE_URL'
+
+# Timezone the calendar site publishes its datelines in for anonymous visitors
+CALENDAR_TIMEZONE = 'US/Eastern'
@@ -0,0 +1,49 @@
+from datetime import datetime, timedelta
+
+from app.models.shard_by import ShardBy
+
+
+class DateRangeSharder:
+
+    @staticmethod
+    def split(start_date, end_date, shard_by):
+        """
+        Split an inclusive date range into week or month chunks.
+
+        Weeks follow the calendar's Sunday-to-Saturday layout, months follow
+        calendar months. The first and last chunks are clipped to the range.
+
+        Parameters:
+        start_date (str): Start of the range (YYYY-MM-DD).
+        end_date (str): End of the range (YYYY-MM-DD).
+        shard_by (ShardBy): The chunk size.
+
+        Returns:
+        list: (start_date, end_date) string tuples in chronological order.
+        """
+        start = datetime.strptime(start_date, '%Y-%m-%d').date()
+        end = datetime.strptime(end_date, '%Y-%m-%d').date()
+        if start > end:
+            raise ValueError(f"Start date {start_date} is after end date {end_date}")
+
+        if shard_by == ShardBy.NONE:
+            return [(start_date, end_date)]
+
+        shards = []
+        chunk_start = start
+        while chunk_start <= end:
+            if shard_by == ShardBy.WEEK:
+                # Python weeks start on Monday (0); the calendar's start on Sunday
+                days_until_saturday = (5 - chunk_start.weekday()) % 7
+                chunk_end = chunk_start + timedelta(days=days_until_saturday)
+            elif shard_by == ShardBy.MONTH:
+                next_month = (chunk_start.replace(day=1) + timedelta(days=32)).replace(day=1)
+                chunk_end = next_month - timedelta(days=1)
+            else:
+                raise ValueError(f"Invalid ShardBy value: '{shard_by}'")
+
+            chunk_end = min(chunk_end, end)
+            shards.append((chunk_start.strftime('%Y-%m-%d'), chunk_end.strftime('%Y-%m-%d')))
+            chunk_start = chunk_end + timedelta(days=1)
+
+        return shards
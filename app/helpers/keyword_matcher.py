@@ -0,0 +1,86 @@
+import hashlib
+import json
+import re
+import threading
+
+import pandas as pd
+
+
+class KeywordMatcher:
+    """
+    Matches event names against currency -> keywords filters, such as the
+    NNFX filters file.
+
+    Keywords are matched literally and case-insensitively. Each currency's
+    keywords are compiled into one pattern, built once per distinct filters
+    content, and every row is searched once, with its own currency's pattern.
+    """
+
+    _cache = {}
+    _lock = threading.Lock()
+
+    def __init__(self, filters):
+        """
+        Parameters:
+        filters (dict): Currencies as keys and lists of keywords as values.
+        """
+        self.patterns = {}
+        self.keywords = {}
+        for currency, keywords in filters.items():
+            keywords = list(keywords)
+            # One group per keyword, so the match tells which keyword it was
+            self.patterns[currency] = re.compile(
+                '|'.join(f'({re.escape(keyword)})' for keyword in keywords), re.IGNORECASE)
+            self.keywords[currency] = keywords
+
+    @staticmethod
+    def content_hash(filters):
+        """
+        Returns:
+        str: SHA-256 of the filters' canonical JSON form.
+        """
+        canonical = json.dumps(filters, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    @classmethod
+    def for_filters(cls, filters):
+        """
+        Get the matcher of a filters mapping, compiling it on first use.
+
+        Parameters:
+        filters (Mapping): Currencies as keys and lists of keywords as values.
+
+        Returns:
+        KeywordMatcher: The matcher, shared by every caller with the same filters.
+        """
+        filters = {currency: list(keywords) for currency, keywords in filters.items()}
+        key = cls.content_hash(filters)
+        with cls._lock:
+            matcher = cls._cache.get(key)
+            if matcher is None:
+                matcher = cls._cache[key] = cls(filters)
+        return matcher
+
+    def match(self, df, currency_column='currency', text_column='name'):
+        """
+        Find the first keyword of each row's currency in its text.
+
+        Parameters:
+        df (pd.DataFrame): The events.
+        currency_column (str): Column holding the currency.
+        text_column (str): Column searched for the keywords.
+
+        Returns:
+        pd.Series: The matched keyword as written in the filters, or None, aligned with df.
+        """
+        matched = [None] * len(df)
+        rows = zip(df[currency_column].tolist(), df[text_column].tolist())
+        for row, (currency, text) in enumerate(rows):
+            pattern = self.patterns.get(currency)
+            if pattern is None or not isinstance(text, str):
+                continue
+            match = pattern.search(text)
+            if match is not None:
+                # An empty keyword list matches every event, with no keyword to report
+                matched[row] = self.keywords[currency][match.lastindex - 1] if match.lastindex else ''
+        return pd.Series(matched, index=df.index, dtype=object)
@@ -0,0 +1,40 @@
+import math
+from collections import deque
+
+
+class LatencyHistory:
+    """
+    Rolling window of recent fetch latencies, used to decide when a slow
+    fetch deserves a hedged second attempt.
+    """
+
+    def __init__(self, size=50):
+        self._samples = deque(maxlen=size)
+
+    def __len__(self):
+        return len(self._samples)
+
+    def add(self, latency_ms):
+        """
+        Record the latency of a successful fetch.
+
+        Parameters:
+        latency_ms (float): Fetch latency in milliseconds.
+        """
+        self._samples.append(latency_ms)
+
+    def percentile(self, percentile):
+        """
+        Return a percentile of the recorded latencies (nearest rank).
+
+        Parameters:
+        percentile (float): Percentile between 0 and 100.
+
+        Returns:
+        float: The latency in milliseconds, or None when nothing was recorded.
+        """
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        rank = math.ceil(min(max(percentile, 0), 100) / 100 * len(ordered))
+        return ordered[max(rank, 1) - 1]
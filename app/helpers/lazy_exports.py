@@ -0,0 +1,29 @@
+import importlib
+
+
+def lazy_exports(module_globals, exports):
+    """
+    Build the module __getattr__ and __dir__ (PEP 562) of a package whose
+    exports are imported on first use.
+
+    Parameters:
+    module_globals (dict): The package's globals().
+    exports (dict): Exported name -> module that defines it, relative to the package.
+
+    Returns:
+    tuple: (__getattr__, __dir__) to assign in the package.
+    """
+    package = module_globals['__name__']
+
+    def __getattr__(name):
+        if name in exports:
+            value = getattr(importlib.import_module(exports[name], package), name)
+            # Cache it, so later lookups do not reach __getattr__
+            module_globals[name] = value
+            return value
+        raise AttributeError(f"module {package!r} has no attribute {name!r}")
+
+    def __dir__():
+        return sorted(set(module_globals) | set(exports))
+
+    return __getattr__, __dir__
@@ -1,23 +1,50 @@
+import json
 import os
 import logging
+import threading
 
 # Initialize the logger for this module
 logger = logging.getLogger(__name__)
 
 
 class ResourceLoader:
+    """
+    Loads resource files, caching their content process-wide until the file's
+    modification time or size changes.
+    """
+
+    _cache = {}
+    _lock = threading.Lock()
+
     @staticmethod
     def load_resource_file_by_key(key):
         return ResourceLoader.load_resource_file(os.getenv(key))
 
     @staticmethod
-    def load_resource_file(filename):
+    def _signature(file_path):
+        stat = os.stat(file_path)
+        return stat.st_mtime_ns, stat.st_size
+
+    @staticmethod
+    def _load_cached(filename, parse, kind):
+        """
+        Return the parsed content of a file, re-reading it only when it changed.
+        """
         file_path = os.path.join(filename)
         try:
+            signature = ResourceLoader._signature(file_path)
+            cache_key = (kind, os.path.abspath(file_path))
+            with ResourceLoader._lock:
+                cached = ResourceLoader._cache.get(cache_key)
+            if cached is not None and cached[0] == signature:
+                return cached[1]
+
             with open(file_path, 'r', encoding='UTF-8') as file:
-                content = file.read()
-                logger.info("Successfully loaded resource file: %s", filename)
-                return content
+                content = parse(file.read())
+            with ResourceLoader._lock:
+                ResourceLoader._cache[cache_key] = (signature, content)
+            logger.info("Successfully loaded resource file: %s", filename)
+            return content
         except FileNotFoundError:
             logger.error("Resource file not found: %s", filename)
             return None
@@ -25,3 +52,26 @@ class ResourceLoader:
             logger.exception(
                 "Failed to load resource file %s: %s", filename, e)
             return None
+
+    @staticmethod
+    def load_resource_file(filename):
+        return ResourceLoader._load_cached(filename, lambda content: content, 'text')
+
+    @staticmethod
+    def load_json_resource_file(filename):
+        """
+        Load and parse a JSON resource file.
+
+        Parameters:
+        filename (str): Path of the JSON file.
+
+        Returns:
+        object: The parsed JSON, shared between callers and not to be modified,
+            or None if the file cannot be read or parsed.
+        """
+        return ResourceLoader._load_cached(filename, json.loads, 'json')
+
+    @staticmethod
+    def clear_cache():
+        with ResourceLoader._lock:
+            ResourceLoader._cache.clear()
@@ -0,0 +1,83 @@
+import contextlib
+import time
+from datetime import datetime, timezone
+
+from app.models.stage_span import StageSpan
+
+
+class RunProfiler:
+    """
+    Collects per-stage spans of one run: wall time, CPU time, row counts and
+    bytes written.
+
+    CPU time is the process CPU time spent while the span was open, so spans
+    of runs executing side by side in one process include each other's work.
+    """
+
+    def __init__(self):
+        self.spans = []
+        self.started_at = datetime.now(timezone.utc)
+        self._wall_started = time.perf_counter()
+        self._cpu_started = time.process_time()
+
+    @contextlib.contextmanager
+    def span(self, stage, label=None):
+        """
+        Time a stage.
+
+        Usage:
+            with profiler.span('normalize') as span:
+                df = ...
+                span.rows = len(df)
+
+        Parameters:
+        stage (str): Stage name, e.g. 'fetch' or 'json_write'.
+        label (str, optional): What the stage worked on, e.g. the output frame.
+
+        Returns:
+        StageSpan: The span, whose rows and bytes_written the block may set.
+        """
+        span = StageSpan(stage=stage, label=label)
+        wall_started = time.perf_counter()
+        cpu_started = time.process_time()
+        try:
+            yield span
+        finally:
+            span.wall_ms = (time.perf_counter() - wall_started) * 1000
+            span.cpu_ms = (time.process_time() - cpu_started) * 1000
+            self.spans.append(span)
+
+    def stage_totals(self):
+        """
+        Returns:
+        dict: Per stage, the summed wall_ms, cpu_ms, rows and bytes_written and the span count.
+        """
+        totals = {}
+        for span in self.spans:
+            total = totals.setdefault(span.stage, {
+                'count': 0, 'wall_ms': 0.0, 'cpu_ms': 0.0, 'rows': 0, 'bytes_written': 0})
+            total['count'] += 1
+            total['wall_ms'] += span.wall_ms
+            total['cpu_ms'] += span.cpu_ms
+            total['rows'] += span.rows or 0
+            total['bytes_written'] += span.bytes_written or 0
+        return totals
+
+    def report(self, **details):
+        """
+        Build the run report.
+
+        Parameters:
+        details: Extra top-level fields, e.g. the time period or fetch metrics.
+
+        Returns:
+        dict: The report, JSON serializable.
+        """
+        return {
+            'started_at': self.started_at.isoformat(),
+            'wall_ms': (time.perf_counter() - self._wall_started) * 1000,
+            'cpu_ms': (time.process_time() - self._cpu_started) * 1000,
+            **details,
+            'stages': self.stage_totals(),
+            'spans': [span.to_dict() for span in self.spans],
+        }
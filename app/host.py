@@ -2,15 +2,25 @@ import asyncio
 import logging
 import os
 
-from app.config import Config
+from app.config import Config, RunSettings
+from app.helpers import RunProfiler
+from app.helpers.calendar_slicer import CalendarSlicer
+from app.helpers.date_range_sharder import DateRangeSharder
 from app.models import CommandLineArgs
+from app.models.analysis_state import AnalysisState
+from app.models.calendar_fields import CalendarFields
+from app.models.fetch_mode import FetchMode
+from app.models.output_format import OutputFormat
+from app.models.output_frame import OutputFrame
+from app.models.shard_by import ShardBy
 from app.models.time_period import TimePeriod
-from app.services import (AnalyzeService, ForexFactoryScraperService,
-                          OutputService)
-from app.services.report_service import ReportService
+from app.services import (AnalysisPoolService, BrowserPoolService, CalendarCacheService,
+                          ForexFactoryScraperService, SingleFlightService)
 
 
 class Host:
+    DEFAULT_OUTPUT_CONCURRENCY = 4
+
     def __init__(self, args: CommandLineArgs):
         """
         Initialize the Host class with command line arguments and configuration.
@@ -19,78 +29,440 @@ class Host:
         args (CommandLineArgs): Command line arguments passed to the script.
         """
         self.args = args
-        self.config = Config(custom_nnfx_filters=self.args.custom_nnfx_filters,
-                             custom_calendar_template=args.custom_calendar_template)
-
-        # Set filters and time period on the config object
-        self.config.set_filters(self.args.impact_classes, self.args.currencies)
-        self.config.set_time_period(self.args.time_period)
-        self.config.set_nnfx(self.args.nnfx)
-
-        # Set custom dates if specified
-        if self.args.time_period == TimePeriod.CUSTOM:
-            self.config.set_custom_dates(self.args.start_date, self.args.end_date)
+        # Resolve the run's filters, time period and resources once
+        self.settings = RunSettings.from_args(self.args)
 
-        self.ff_scraper = ForexFactoryScraperService(url=self.config.get_url())
+        self.ff_scraper = ForexFactoryScraperService(
+            url=self.settings.get_url(), engine=self.args.fetch_engine,
+            fetch_mode=self.args.fetch_mode, fixtures_dir=self.args.fixtures_dir,
+            full_payload=self.args.needs_full_payload())
+        self.profiler = RunProfiler()
+        self.frame_memory = []
+        self.changes = []
+        # Caps the outputs being built and written at once, and so the rendered content held in memory
+        self.output_slots = asyncio.Semaphore(
+            max(1, Config.get_int(Config.OUTPUT_CONCURRENCY_KEY, self.DEFAULT_OUTPUT_CONCURRENCY)))
         self.logger = logging.getLogger(__name__)
 
     def run(self):
         """
-        Run the asynchronous run_async method.
+        Run the asynchronous run_async method and shut down the browser pool afterwards.
         """
-        return asyncio.run(self.run_async())
+        async def run_and_shutdown():
+            try:
+                return await self.run_async()
+            finally:
+                await CalendarCacheService().wait_for_refreshes()
+                await BrowserPoolService().shutdown()
+                AnalysisPoolService().shutdown()
 
-    async def run_async(self):
+        return asyncio.run(run_and_shutdown())
+
+    def _scraper_for(self, time_period):
         """
-        Asynchronous method to perform the main logic:
-        - Fetch calendar data
-        - Write raw data to a JSON file
-        - Analyze the data
-        - Write analyzed data to JSON files
+        Return the scraper for a time period, reusing the main one when possible.
+        """
+        if time_period == self.settings.time_period:
+            return self.ff_scraper
+        return ForexFactoryScraperService(
+            url=Config.build_period_url(time_period),
+            engine=self.args.fetch_engine, fetch_mode=self.args.fetch_mode,
+            fixtures_dir=self.args.fixtures_dir, full_payload=self.args.needs_full_payload())
+
+    async def fetch_calendar_async(self, time_period=None):
+        """
+        Fetch the calendar days for a time period through the on-disk calendar
+        cache. Record and replay runs bypass the cache.
+
+        Parameters:
+        time_period (TimePeriod, optional): Defaults to the configured time period.
+
+        Returns:
+        list: The days array.
+        """
+        time_period = time_period or self.settings.time_period
+        scraper = self._scraper_for(time_period)
+        if self.args.fetch_mode != FetchMode.LIVE:
+            return await self._fetch_calendar_uncached_async(time_period, scraper)
+
+        cache = CalendarCacheService()
+        start, end = TimePeriod.resolve_date_range(
+            time_period, self.args.start_date, self.args.end_date)
+        # Full payloads keep every field; projected ones change with CalendarFields
+        cache_key = cache.make_key(
+            scraper.url, start, end,
+            variant='full' if self.args.needs_full_payload() else f'fields-{CalendarFields.fingerprint()}')
+
+        days_array, cache_status = await cache.get_or_fetch(
+            cache_key, start, end,
+            lambda: self._fetch_calendar_uncached_async(time_period, scraper))
+
+        if cache.enabled:
+            self.logger.info(
+                "Calendar cache %s for %s (hits: %d, stale: %d, misses: %d).",
+                cache_status, cache_key, cache.metrics[cache.HIT],
+                cache.metrics[cache.STALE], cache.metrics[cache.MISS])
+        return days_array
+
+    async def _fetch_calendar_uncached_async(self, time_period, scraper):
+        """
+        Fetch the calendar days from the site, splitting long custom ranges
+        into shards when requested.
+
+        Returns:
+        list: The days array.
+        """
+        if time_period == TimePeriod.CUSTOM and self.args.shard_by != ShardBy.NONE:
+            shards = DateRangeSharder.split(
+                self.args.start_date, self.args.end_date, self.args.shard_by)
+            self.logger.info("Fetching custom range in %d %s shard(s).",
+                             len(shards), ShardBy.to_text(self.args.shard_by))
+            shard_urls = [Config.build_custom_url(start, end) for start, end in shards]
+            return await scraper.get_calendar_sharded_async(
+                shard_urls,
+                concurrency=Config.get_int(Config.SHARD_CONCURRENCY_KEY, 3),
+                retries=Config.get_int(Config.SHARD_RETRIES_KEY, 2))
+
+        if self.args.shard_by != ShardBy.NONE:
+            self.logger.warning("--shard-by only applies to the custom time period. Ignoring.")
+        return await scraper.get_calendar_async()
+
+    async def derive_calendar_async(self, time_period, days_array):
+        """
+        Get the days of a narrower time period from the already fetched days,
+        fetching it separately only when it is not contained in the fetched range.
+
+        Parameters:
+        time_period (TimePeriod): The period to derive.
+        days_array (list): The days of the configured time period.
+
+        Returns:
+        list: The days array of the derived period.
+        """
+        # Resolve both periods against the same calendar date, so the check
+        # does not depend on the host timezone or on midnight passing in between
+        today = TimePeriod.calendar_today()
+        fetched_start, fetched_end = TimePeriod.resolve_date_range(
+            self.settings.time_period, self.args.start_date, self.args.end_date, today=today)
+        start, end = TimePeriod.resolve_date_range(time_period, today=today)
+
+        if fetched_start <= start and end <= fetched_end:
+            derived_days = CalendarSlicer.slice_days(days_array, start, end)
+            self.logger.info("Derived %s (%d days) from the %s data without fetching.",
+                             TimePeriod.to_text(time_period), len(derived_days),
+                             TimePeriod.to_text(self.settings.time_period))
+            return derived_days
+
+        self.logger.info("%s (%s to %s) is not inside the fetched range. Fetching it separately.",
+                         TimePeriod.to_text(time_period), start, end)
+        return await self.fetch_calendar_async(time_period)
+
+    async def write_outputs_async(self, time_period, days_array):
+        """
+        Write the raw calendar data, analyze it and write the analyzed frames
+        as JSON and HTML files for one time period. Only the frames and formats
+        selected with --frames and --formats are produced.
+
+        Parameters:
+        time_period (TimePeriod): The period the days belong to, used in file names.
+        days_array (list): The days to write and analyze.
+
+        Returns:
+        tuple: (number of JSON files written, number of HTML files written)
         """
-        self.logger.info("Starting to retrieve calendar data.")
+        # The analysis stage is the only one that needs pandas
+        from app.services import OutputService
 
-        # Fetch calendar data
-        days_array = await self.ff_scraper.get_calendar_async()
+        file_name_ending = TimePeriod.to_file_name_ending(time_period)
+        frames = self.args.get_frames()
+        formats = self.args.get_formats()
 
         # Write the raw calendar data to a JSON file
-        days_output_json = (
-            f'calendar_data_{TimePeriod.to_file_name_ending(self.config.time_period)}.json'
-        )
-        days_output_json = os.path.join(self.args.output_folder, days_output_json)
-        await OutputService.write_json_to_file_async(days_array, days_output_json)
-        self.logger.info("Calendar data written to file: %s", days_output_json)
+        if OutputFrame.RAW in frames and OutputFormat.JSON in formats:
+            days_output_json = f'calendar_data_{file_name_ending}.json'
+            days_output_json = os.path.join(self.args.output_folder, days_output_json)
+            with self.profiler.span('raw_write', label=file_name_ending) as span:
+                await OutputService.write_json_to_file_async(days_array, days_output_json)
+                span.rows = len(days_array)
+                span.bytes_written = self._file_size(days_output_json)
+            self.logger.info("Calendar data written to file: %s", days_output_json)
+
+        if not frames - {OutputFrame.RAW}:
+            return 0, 0
 
         # Analyze the data
         self.logger.info("Starting to analyze the data.")
-        analyzed_data = await AnalyzeService.analyze_data(days_array)
+        state, previous, change_set = await self._analyze_async(file_name_ending, days_array, frames)
+        analyzed_data = state.results
+
+        # Write the events added, removed or updated since the previous run of this output
+        if change_set is not None and OutputFormat.JSON in formats:
+            changes_output_json = f'calendar_changes_{file_name_ending}.json'
+            changes_output_json = os.path.join(self.args.output_folder, changes_output_json)
+            with self.profiler.span('json_write', label=f'{file_name_ending}_changes') as span:
+                await OutputService.write_json_to_file_async(change_set, changes_output_json)
+                span.rows = len(change_set['added']) + len(change_set['removed']) + len(change_set['updated'])
+                span.bytes_written = self._file_size(changes_output_json)
+            self.logger.info("Calendar changes written to file: %s", changes_output_json)
 
-        # Initialize counter for the number of outputs
-        json_output_count = 0
-        html_output_count = 0
+        # Outputs written from the same frames with the same formats and template are up to date
+        outputs_key = (frozenset(formats), self.settings.calendar_template)
+        if (previous is not None and previous.results is analyzed_data and previous.outputs_key == outputs_key
+                and all(os.path.exists(path) for path in previous.output_paths)):
+            self.logger.info("Outputs of %s are unchanged since the previous run. Not rewriting them.",
+                             file_name_ending)
+            state.outputs_key, state.output_paths = previous.outputs_key, previous.output_paths
+            self._keep_state(file_name_ending, state)
+            return (1 if change_set is not None and OutputFormat.JSON in formats else 0), 0
 
-        # Output the analyzed data to JSON files
+        # Build and write every frame's outputs concurrently, at most
+        # OUTPUT_CONCURRENCY frames at a time
+        frame_outputs = []
         for key, df in analyzed_data.items():
             if df is not None:
-                # Write analyzed data to a JSON file
-                output_file_json = (
-                    f'calendar_data_{TimePeriod.to_file_name_ending(self.config.time_period)}_{key}.json'
-                )
+                self.frame_memory.append({
+                    'time_period': file_name_ending, 'frame': key, 'rows': len(df),
+                    'memory_bytes': int(df.memory_usage(deep=True).sum())})
+                frame_outputs.append(self._write_frame_async(key, df, file_name_ending, formats))
+
+        results = await asyncio.gather(*frame_outputs)
+        state.outputs_key = outputs_key
+        output_paths = [
+            os.path.join(self.args.output_folder, f'calendar_data_{file_name_ending}_{key}.{output_format.value}')
+            for key in analyzed_data for output_format in formats]
+        state.output_paths = [path for path in output_paths if os.path.exists(path)]
+        # Only a run whose outputs were all written becomes the base of the next one
+        self._keep_state(file_name_ending, state)
+        json_output_count = sum(json_count for json_count, _ in results)
+        if change_set is not None and OutputFormat.JSON in formats:
+            json_output_count += 1
+        html_output_count = sum(html_count for _, html_count in results)
+        return json_output_count, html_output_count
+
+    async def _analyze_async(self, file_name_ending, days_array, frames):
+        """
+        Analyze a period's days. With incremental analysis enabled, only the
+        days that changed since the previous run of the same output in this
+        process are analyzed, and the changes are collected.
+
+        Parameters:
+        file_name_ending (str): The time period part of the file names.
+        days_array (list): The days to analyze.
+        frames (set): The OutputFrame members to produce.
+
+        The state is not kept for the next run here, see _keep_state.
+
+        Returns:
+        tuple: (AnalysisState of this run, AnalysisState of the previous run or
+            None, the change set or None without a previous run)
+        """
+        from app.services import AnalysisStateService, AnalyzeService
+
+        state_service = AnalysisStateService()
+        if not state_service.enabled:
+            analyzed_data = await AnalyzeService.analyze_data(
+                days_array, settings=self.settings, profiler=self.profiler, frames=frames)
+            return AnalysisState(None, days_array, analyzed_data), None, None
+
+        previous = state_service.get(self._state_key(file_name_ending))
+        change_set = unchanged = None
+        if previous is not None:
+            with self.profiler.span('diff', label=file_name_ending) as span:
+                unchanged = AnalysisStateService.match_days(previous.days, days_array)
+                change_set = AnalysisStateService.change_set(previous.days, days_array, unchanged)
+                span.rows = change_set['days_changed']
+
+        state = await AnalyzeService.analyze_incremental(
+            days_array, previous, unchanged, settings=self.settings, profiler=self.profiler,
+            frames=frames)
+
+        if change_set is not None:
+            self.changes.append({
+                'time_period': file_name_ending, 'previous_run_at': previous.recorded_at.isoformat(),
+                'days': len(days_array), 'days_changed': change_set['days_changed'],
+                'added': len(change_set['added']), 'removed': len(change_set['removed']),
+                'updated': len(change_set['updated'])})
+            change_set = dict(time_period=file_name_ending,
+                              previous_run_at=previous.recorded_at.isoformat(), **change_set)
+        return state, previous, change_set
+
+    def _state_key(self, file_name_ending):
+        return os.path.abspath(self.args.output_folder), file_name_ending
+
+    def _keep_state(self, file_name_ending, state):
+        """
+        Keep a run's analysis state for the next run of the same output, once
+        its outputs are written.
+
+        Parameters:
+        file_name_ending (str): The time period part of the file names.
+        state (AnalysisState): The run's state.
+        """
+        from app.services import AnalysisStateService
+
+        state_service = AnalysisStateService()
+        if state_service.enabled:
+            state_service.put(self._state_key(file_name_ending), state)
+
+    async def _write_frame_async(self, key, df, file_name_ending, formats):
+        """
+        Expand an analyzed frame into its display form and write it as JSON
+        and HTML, once a frame slot is free.
+
+        Parameters:
+        key (str): The frame name, used in file names.
+        df (pd.DataFrame): The analyzed frame, in its compact form.
+        file_name_ending (str): The time period part of the file names.
+        formats (set): The OutputFormat members to write.
+
+        Returns:
+        tuple: (number of JSON files written, number of HTML files written)
+        """
+        from app.services import AnalyzeService, ReportService
+
+        async with self.output_slots:
+            # Display strings are only built here, for as long as the frame is being written
+            display_df = await asyncio.to_thread(AnalyzeService.to_display_frame, df)
+
+            outputs = []
+            # Write analyzed data to a JSON file
+            if OutputFormat.JSON in formats:
+                output_file_json = f'calendar_data_{file_name_ending}_{key}.json'
                 output_path_json = os.path.join(self.args.output_folder, output_file_json)
-                await OutputService.write_dataframe_to_json_async(df, output_path_json)
-                json_output_count += 1
+                outputs.append(self._write_frame_json_async(
+                    display_df, output_path_json, label=f'{file_name_ending}_{key}'))
 
-                # Write analyzed data to an HTML file
-                output_file_html = (
-                    f'calendar_data_{TimePeriod.to_file_name_ending(self.config.time_period)}_{key}.html'
-                )
+            # Write analyzed data to an HTML file
+            if OutputFormat.HTML in formats:
+                output_file_html = f'calendar_data_{file_name_ending}_{key}.html'
                 output_path_html = os.path.join(self.args.output_folder, output_file_html)
-                html_result = await ReportService.write_html_report_from_dataframe_async(
-                    df, output_path_html, repeat_date=False, 
-                    report_name=f"{TimePeriod.to_file_name_ending(self.config.time_period)} {key} Data"
-                )
-                html_output_count += 1 if html_result == 0 else 0
+                outputs.append(ReportService.write_html_report_from_dataframe_async(
+                    display_df, output_path_html, repeat_date=False,
+                    report_name=f"{file_name_ending} {key} Data", settings=self.settings,
+                    profiler=self.profiler
+                ))
+
+            results = await asyncio.gather(*outputs)
+
+        json_count = 1 if OutputFormat.JSON in formats else 0
+        html_count = sum(1 for html_result in results[json_count:] if html_result == 0)
+        return json_count, html_count
+
+    async def _write_frame_json_async(self, df, output_path_json, label):
+        """
+        Write an analyzed frame to a JSON file inside a json_write span.
+        """
+        from app.services import OutputService
+
+        with self.profiler.span('json_write', label=label) as span:
+            await OutputService.write_dataframe_to_json_async(df, output_path_json)
+            span.rows = len(df)
+            span.bytes_written = self._file_size(output_path_json)
 
-        # Print a summary of the outputs
+    @staticmethod
+    def _file_size(file_path):
+        try:
+            return os.path.getsize(file_path)
+        except OSError:
+            return 0
+
+    async def write_run_report_async(self, report):
+        """
+        Write the run report with the per-stage spans next to the outputs.
+
+        Parameters:
+        report (dict): The report built by RunProfiler.report.
+        """
+        from app.services import OutputService
+
+        file_name_ending = TimePeriod.to_file_name_ending(self.settings.time_period)
+        report_path = os.path.join(self.args.output_folder, f'run_report_{file_name_ending}.json')
+        await OutputService.write_json_to_file_async(report, report_path)
+        self.logger.info("Summary: run took %.0f ms wall, %.0f ms CPU. Report written to %s",
+                         report['wall_ms'], report['cpu_ms'], report_path)
+
+    async def run_async(self, days_array=None):
+        """
+        Asynchronous method to perform the main logic:
+        - Fetch calendar data
+        - Write raw data to a JSON file
+        - Analyze the data
+        - Write analyzed data to JSON files
+        - Repeat the writing for every derived period, sliced from the same data
+
+        Parameters:
+        days_array (list, optional): Calendar days fetched beforehand, e.g. by a
+            batch that shares one fetch between tasks. Skips the fetch.
+
+        Returns:
+        dict: Number of days of the main period, of JSON and HTML files written,
+            and the run report.
+        """
+        self.profiler = RunProfiler()
+        self.frame_memory = []
+        self.changes = []
+        if days_array is None:
+            self.logger.info("Starting to retrieve calendar data.")
+
+            # Fetch calendar data
+            self.ff_scraper.last_fetch_metrics = None
+            with self.profiler.span('fetch', label=self.ff_scraper.url) as span:
+                days_array = await self.fetch_calendar_async()
+                span.rows = len(days_array)
+            fetch_metrics = self.ff_scraper.last_fetch_metrics
+        else:
+            self.logger.info("Using %d already fetched calendar days.", len(days_array))
+            fetch_metrics = None
+
+        json_output_count, html_output_count = await self.write_outputs_async(
+            self.settings.time_period, days_array)
+
+        for derived_period in self.args.derived_periods:
+            with self.profiler.span('derive', label=TimePeriod.to_text(derived_period)) as span:
+                derived_days = await self.derive_calendar_async(derived_period, days_array)
+                span.rows = len(derived_days)
+            json_count, html_count = await self.write_outputs_async(derived_period, derived_days)
+            json_output_count += json_count
+            html_output_count += html_count
+
+        # Print a summary of the fetch and the outputs
+        if fetch_metrics is not None:
+            self.logger.info(
+                "Summary: fetched %d days via %s, %d bytes transferred, %d requests blocked, time-to-data %s ms.",
+                len(days_array), fetch_metrics.engine, fetch_metrics.bytes_transferred,
+                fetch_metrics.blocked_requests,
+                f'{fetch_metrics.time_to_data_ms:.0f}' if fetch_metrics.time_to_data_ms is not None else 'n/a')
+            self.logger.info(
+                "Summary: %d fetch attempt(s), %d hedge win(s), time-to-first-byte %s ms.",
+                fetch_metrics.attempts, fetch_metrics.hedge_wins,
+                f'{fetch_metrics.time_to_first_byte_ms:.0f}'
+                if fetch_metrics.time_to_first_byte_ms is not None else 'n/a')
+        fetch_flights = SingleFlightService().stats()
+        self.logger.info("Summary: %d calendar fetches issued, %d coalesced in this process.",
+                         fetch_flights['issued'], fetch_flights['coalesced'])
         self.logger.info("Summary: %d JSON files written.", json_output_count)
         self.logger.info("Summary: %d HTML files written.", html_output_count)
+        for changes in self.changes:
+            self.logger.info(
+                "Summary: %s: %d of %d days changed since the previous run; "
+                "%d events added, %d removed, %d updated.",
+                changes['time_period'], changes['days_changed'], changes['days'],
+                changes['added'], changes['removed'], changes['updated'])
+        for frame in self.frame_memory:
+            self.logger.info("Summary: %s %s frame holds %d rows in %.1f KiB.",
+                             frame['time_period'], frame['frame'], frame['rows'],
+                             frame['memory_bytes'] / 1024)
+
+        report = self.profiler.report(
+            time_period=TimePeriod.to_text(self.settings.time_period),
+            url=self.ff_scraper.url,
+            days=len(days_array),
+            json_files=json_output_count,
+            html_files=html_output_count,
+            frames=self.frame_memory,
+            changes=self.changes,
+            fetch=fetch_metrics.to_dict() if fetch_metrics is not None else None)
+        await self.write_run_report_async(report)
+
+        return {'days': len(days_array), 'json_files': json_output_count,
+                'html_files': html_output_count, 'report': report}
@@ -0,0 +1,20 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+
+@dataclass
+class AnalysisState:
+    """
+    What one run left behind for the next run of the same output: its days
+    and the analyzed frames.
+    """
+    # Identifies the filters and frames the analyzed frames were built with
+    analysis_key: tuple
+    # The analyzed days, in calendar order
+    days: list
+    # The analyzed frames, with rows labelled by event index
+    results: dict = field(default_factory=dict)
+    # The formats and template the outputs were written with, and their paths
+    outputs_key: tuple = None
+    output_paths: list = field(default_factory=list)
+    recorded_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
@@ -0,0 +1,8 @@
+class CalendarFetchError(Exception):
+    """
+    Raised when calendar data could not be retrieved for a URL.
+    """
+
+    def __init__(self, message, url=None):
+        super().__init__(message)
+        self.url = url
@@ -0,0 +1,59 @@
+import hashlib
+
+
+class CalendarFields:
+    """
+    The parts of the calendar payload the pipeline actually reads.
+
+    The scraper projects each day and event down to these fields before the
+    payload leaves the page, so anything not listed here is never serialized.
+    """
+
+    # Fields of each day; 'date' becomes the 'meta_date' column after normalization
+    DAY_FIELDS = ['date', 'dateline']
+
+    # Fields of each event used by AnalyzeService and the HTML reports
+    ANALYZED_FIELDS = [
+        'date', 'country', 'currency', 'impactClass', 'impactTitle', 'name',
+        'trimmedPrefixedName', 'dateline', 'forecast', 'previous', 'timeLabel',
+        'timeMasked'
+    ]
+
+    # Fields of each event kept by the scraper; 'id' and 'actual' let
+    # AnalysisStateService match events between runs and report new actuals
+    EVENT_FIELDS = ANALYZED_FIELDS + ['id', 'actual']
+
+    SELECTED_FIELDS = ['meta_date'] + ANALYZED_FIELDS
+
+    @staticmethod
+    def fingerprint():
+        """
+        Identify the projected payload shape, so data cached with other
+        DAY_FIELDS or EVENT_FIELDS is not mistaken for the current shape.
+
+        Returns:
+        str: A short hash of DAY_FIELDS and EVENT_FIELDS.
+        """
+        fields = ','.join(CalendarFields.DAY_FIELDS) + ';' + ','.join(CalendarFields.EVENT_FIELDS)
+        return hashlib.sha1(fields.encode('utf-8')).hexdigest()[:8]
+
+    @staticmethod
+    def project_days(days_array):
+        """
+        Keep only DAY_FIELDS and EVENT_FIELDS of a days array.
+
+        Parameters:
+        days_array (list): The full days array.
+
+        Returns:
+        list: A new days array holding only the projected fields.
+        """
+        projected = []
+        for day in days_array:
+            projected_day = {field: day[field] for field in CalendarFields.DAY_FIELDS if field in day}
+            projected_day['events'] = [
+                {field: event[field] for field in CalendarFields.EVENT_FIELDS if field in event}
+                for event in day.get('events', [])
+            ]
+            projected.append(projected_day)
+        return projected
@@ -1,7 +1,12 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from app.models.currencies import Currencies
+from app.models.fetch_engine import FetchEngine
+from app.models.fetch_mode import FetchMode
+from app.models.shard_by import ShardBy
 from app.models.impact_class import ImpactClass
+from app.models.output_format import OutputFormat
+from app.models.output_frame import OutputFrame
 from app.models.time_period import TimePeriod
 
 
@@ -16,6 +21,15 @@ class CommandLineArgs:
     custom_calendar_template: str
     start_date: str = None  
     end_date: str = None    
+    fetch_engine: FetchEngine = FetchEngine.PLAYWRIGHT
+    shard_by: ShardBy = ShardBy.NONE
+    fetch_mode: FetchMode = FetchMode.LIVE
+    fixtures_dir: str = None
+    full_payload: bool = False
+    derived_periods: list[TimePeriod] = field(default_factory=list)
+    # Empty means every frame / every format
+    frames: list[OutputFrame] = field(default_factory=list)
+    formats: list[OutputFormat] = field(default_factory=list)
 
     def __post_init__(self):
         if self.time_period == TimePeriod.CUSTOM:
@@ -23,3 +37,32 @@ class CommandLineArgs:
                 raise ValueError("Start date and end date must be provided for custom time period")
             self.start_date = TimePeriod.validate_date_format(self.start_date)
             self.end_date = TimePeriod.validate_date_format(self.end_date)    
+        if TimePeriod.CUSTOM in self.derived_periods:
+            raise ValueError("The custom time period cannot be derived from another period")
+        if OutputFrame.RAW in self.frames and self.formats and OutputFormat.JSON not in self.formats:
+            raise ValueError("The raw frame is only written as JSON")
+
+    def get_frames(self):
+        """
+        Returns:
+        set: The frames to produce.
+        """
+        return set(self.frames or OutputFrame)
+
+    def get_formats(self):
+        """
+        Returns:
+        set: The formats to write.
+        """
+        return set(self.formats or OutputFormat)
+
+    def needs_full_payload(self):
+        """
+        Returns:
+        bool: Whether events are fetched with every field: with --full-payload,
+            and when the raw calendar data or the normalized data is written,
+            as both hold the events as the site publishes them.
+        """
+        frames = self.get_frames()
+        return (self.full_payload or OutputFrame.NORMALIZED in frames
+                or (OutputFrame.RAW in frames and OutputFormat.JSON in self.get_formats()))
@@ -0,0 +1,30 @@
+from enum import Enum
+
+
+class FetchEngine(Enum):
+    PLAYWRIGHT = 'playwright'
+    HTTP = 'http'
+
+    @staticmethod
+    def from_text(text):
+        if text is None:
+            raise ValueError("Input text cannot be None")
+        text = text.strip().lower()
+        mapping = {
+            'playwright': FetchEngine.PLAYWRIGHT,
+            'browser': FetchEngine.PLAYWRIGHT,
+            'http': FetchEngine.HTTP,
+        }
+        if text not in mapping:
+            raise ValueError(f"Invalid text for FetchEngine: '{text}'")
+        return mapping[text]
+
+    @staticmethod
+    def to_text(enum_value):
+        reverse_mapping = {
+            FetchEngine.PLAYWRIGHT: 'playwright',
+            FetchEngine.HTTP: 'http',
+        }
+        if enum_value not in reverse_mapping:
+            raise ValueError(f"Invalid FetchEngine value: '{enum_value}'")
+        return reverse_mapping[enum_value]
@@ -0,0 +1,25 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class FetchMetrics:
+    url: str
+    engine: str
+    bytes_transferred: int = 0
+    blocked_requests: int = 0
+    time_to_data_ms: float = None
+    time_to_first_byte_ms: float = None
+    attempts: int = 1
+    hedge_wins: int = 0
+
+    def to_dict(self):
+        return {
+            'url': self.url,
+            'engine': self.engine,
+            'bytes_transferred': self.bytes_transferred,
+            'blocked_requests': self.blocked_requests,
+            'time_to_data_ms': self.time_to_data_ms,
+            'time_to_first_byte_ms': self.time_to_first_byte_ms,
+            'attempts': self.attempts,
+            'hedge_wins': self.hedge_wins,
+        }
@@ -0,0 +1,32 @@
+from enum import Enum
+
+
+class FetchMode(Enum):
+    LIVE = 'live'
+    RECORD = 'record'
+    REPLAY = 'replay'
+
+    @staticmethod
+    def from_text(text):
+        if text is None:
+            raise ValueError("Input text cannot be None")
+        text = text.strip().lower()
+        mapping = {
+            'live': FetchMode.LIVE,
+            'record': FetchMode.RECORD,
+            'replay': FetchMode.REPLAY,
+        }
+        if text not in mapping:
+            raise ValueError(f"Invalid text for FetchMode: '{text}'")
+        return mapping[text]
+
+    @staticmethod
+    def to_text(enum_value):
+        reverse_mapping = {
+            FetchMode.LIVE: 'live',
+            FetchMode.RECORD: 'record',
+            FetchMode.REPLAY: 'replay',
+        }
+        if enum_value not in reverse_mapping:
+            raise ValueError(f"Invalid FetchMode value: '{enum_value}'")
+        return reverse_mapping[enum_value]
@@ -0,0 +1,29 @@
+from enum import Enum
+
+
+class OutputFormat(Enum):
+    JSON = 'json'
+    HTML = 'html'
+
+    @staticmethod
+    def from_text(text):
+        if text is None:
+            raise ValueError("Input text cannot be None")
+        text = text.strip().lower()
+        mapping = {
+            'json': OutputFormat.JSON,
+            'html': OutputFormat.HTML,
+        }
+        if text not in mapping:
+            raise ValueError(f"Invalid text for OutputFormat: '{text}'")
+        return mapping[text]
+
+    @staticmethod
+    def to_text(enum_value):
+        reverse_mapping = {
+            OutputFormat.JSON: 'json',
+            OutputFormat.HTML: 'html',
+        }
+        if enum_value not in reverse_mapping:
+            raise ValueError(f"Invalid OutputFormat value: '{enum_value}'")
+        return reverse_mapping[enum_value]
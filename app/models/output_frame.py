@@ -0,0 +1,43 @@
+from enum import Enum
+
+
+class OutputFrame(Enum):
+    RAW = 'raw'
+    NORMALIZED = 'normalized_data'
+    CLEANED = 'cleaned_data'
+    FILTERED = 'filtered_data'
+    NNFX_FILTERED = 'nnfx_filtered_data'
+
+    @staticmethod
+    def from_text(text):
+        if text is None:
+            raise ValueError("Input text cannot be None")
+        text = text.strip().lower()
+        mapping = {
+            'raw': OutputFrame.RAW,
+            'normalized': OutputFrame.NORMALIZED,
+            'normalized_data': OutputFrame.NORMALIZED,
+            'cleaned': OutputFrame.CLEANED,
+            'cleaned_data': OutputFrame.CLEANED,
+            'filtered': OutputFrame.FILTERED,
+            'filtered_data': OutputFrame.FILTERED,
+            'nnfx': OutputFrame.NNFX_FILTERED,
+            'nnfx_filtered': OutputFrame.NNFX_FILTERED,
+            'nnfx_filtered_data': OutputFrame.NNFX_FILTERED,
+        }
+        if text not in mapping:
+            raise ValueError(f"Invalid text for OutputFrame: '{text}'")
+        return mapping[text]
+
+    @staticmethod
+    def to_text(enum_value):
+        reverse_mapping = {
+            OutputFrame.RAW: 'raw',
+            OutputFrame.NORMALIZED: 'normalized',
+            OutputFrame.CLEANED: 'cleaned',
+            OutputFrame.FILTERED: 'filtered',
+            OutputFrame.NNFX_FILTERED: 'nnfx',
+        }
+        if enum_value not in reverse_mapping:
+            raise ValueError(f"Invalid OutputFrame value: '{enum_value}'")
+        return reverse_mapping[enum_value]
@@ -0,0 +1,33 @@
+from enum import Enum
+
+
+class ShardBy(Enum):
+    NONE = 'none'
+    WEEK = 'week'
+    MONTH = 'month'
+
+    @staticmethod
+    def from_text(text):
+        if text is None:
+            raise ValueError("Input text cannot be None")
+        text = text.strip().lower()
+        mapping = {
+            '': ShardBy.NONE,
+            'none': ShardBy.NONE,
+            'week': ShardBy.WEEK,
+            'month': ShardBy.MONTH,
+        }
+        if text not in mapping:
+            raise ValueError(f"Invalid text for ShardBy: '{text}'")
+        return mapping[text]
+
+    @staticmethod
+    def to_text(enum_value):
+        reverse_mapping = {
+            ShardBy.NONE: 'none',
+            ShardBy.WEEK: 'week',
+            ShardBy.MONTH: 'month',
+        }
+        if enum_value not in reverse_mapping:
+            raise ValueError(f"Invalid ShardBy value: '{enum_value}'")
+        return reverse_mapping[enum_value]
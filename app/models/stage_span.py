@@ -0,0 +1,21 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class StageSpan:
+    stage: str
+    label: str = None
+    wall_ms: float = 0.0
+    cpu_ms: float = 0.0
+    rows: int = None
+    bytes_written: int = None
+
+    def to_dict(self):
+        return {
+            'stage': self.stage,
+            'label': self.label,
+            'wall_ms': self.wall_ms,
+            'cpu_ms': self.cpu_ms,
+            'rows': self.rows,
+            'bytes_written': self.bytes_written,
+        }
@@ -1,5 +1,8 @@
 from enum import Enum
-from datetime import datetime
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from app.helpers.constants import CALENDAR_TIMEZONE
 
 class TimePeriod(Enum):
     TOMORROW = 'tomorrow'
@@ -99,6 +102,68 @@ class TimePeriod(Enum):
             raise ValueError(f"Incorrect date format, should be YYYY-MM-DD: '{date_text}'")
         return date_text
 
+    @staticmethod
+    def calendar_today():
+        """
+        Returns:
+        date: The current date in the calendar's timezone, which is what the
+            site resolves 'today', 'this week' and 'this month' against.
+        """
+        return datetime.now(ZoneInfo(CALENDAR_TIMEZONE)).date()
+
+    @staticmethod
+    def resolve_date_range(value, start_date=None, end_date=None, today=None):
+        """
+        Resolve a time period to the concrete, inclusive range of dates it covers.
+
+        Weeks follow the calendar's Sunday-to-Saturday layout.
+
+        Parameters:
+        value (TimePeriod): The time period.
+        start_date (str, optional): Start date for the custom period (YYYY-MM-DD).
+        end_date (str, optional): End date for the custom period (YYYY-MM-DD).
+        today (date, optional): Reference date, defaults to the current date in the calendar's timezone.
+
+        Returns:
+        tuple: (start, end) as datetime.date objects.
+        """
+        if not isinstance(value, TimePeriod):
+            raise ValueError(f"Invalid TimePeriod value: '{value}'")
+        today = today or TimePeriod.calendar_today()
+
+        def week_of(day):
+            # Python weeks start on Monday (0); the calendar's start on Sunday
+            week_start = day - timedelta(days=(day.weekday() + 1) % 7)
+            return week_start, week_start + timedelta(days=6)
+
+        def month_of(day):
+            month_start = day.replace(day=1)
+            next_month = (month_start + timedelta(days=32)).replace(day=1)
+            return month_start, next_month - timedelta(days=1)
+
+        if value == TimePeriod.TODAY:
+            return today, today
+        if value == TimePeriod.TOMORROW:
+            return today + timedelta(days=1), today + timedelta(days=1)
+        if value == TimePeriod.YESTERDAY:
+            return today - timedelta(days=1), today - timedelta(days=1)
+        if value == TimePeriod.THIS_WEEK:
+            return week_of(today)
+        if value == TimePeriod.NEXT_WEEK:
+            return week_of(today + timedelta(days=7))
+        if value == TimePeriod.LAST_WEEK:
+            return week_of(today - timedelta(days=7))
+        if value == TimePeriod.THIS_MONTH:
+            return month_of(today)
+        if value == TimePeriod.NEXT_MONTH:
+            return month_of(month_of(today)[1] + timedelta(days=1))
+        if value == TimePeriod.LAST_MONTH:
+            return month_of(today.replace(day=1) - timedelta(days=1))
+        if not start_date or not end_date:
+            raise ValueError("Start date and end date must be provided for custom time period")
+        return (datetime.strptime(start_date, '%Y-%m-%d').date(),
+                datetime.strptime(end_date, '%Y-%m-%d').date())
+
 # # Example usage
 # try:
 #     print(TimePeriod.from_text('Tomorrow'))       # Output: TimePeriod.TOMORROW
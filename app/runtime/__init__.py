@@ -1,7 +1,21 @@
 # app/runtime/__init__.py
-# Import and expose from subpackages if needed
-from .command_line import CommandLine
+# Entry point helpers are imported on first use, so parsing the command line
+# does not load the services behind the batch runner and the worker
+from app.helpers.lazy_exports import lazy_exports
 
+_EXPORTS = {
+    'CommandLine': '.command_line',
+    'StandinServer': '.standin_server',
+    'TaskConfig': '.task_config',
+    'BatchRunner': '.batch_runner',
+    'TaskTiming': '.batch_runner',
+    'RunQueue': '.run_queue',
+    'QueuedJob': '.run_queue',
+    'WorkerClient': '.worker_client',
+    'WorkerServer': '.worker_server',
+}
 
 # Optional, for explicit API exposure
-__all__ = ['CommandLine']
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(globals(), _EXPORTS)
@@ -0,0 +1,138 @@
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass
+
+from app.host import Host
+from app.models.calendar_fetch_error import CalendarFetchError
+from app.models.fetch_mode import FetchMode
+from app.runtime.task_config import TaskConfig
+
+# Initialize the logger for this module
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TaskTiming:
+    task_name: str
+    url: str = None
+    fetch_ms: float = 0.0
+    pipeline_ms: float = 0.0
+    shared_fetch: bool = False
+    error: str = None
+
+    @property
+    def succeeded(self):
+        return self.error is None
+
+
+class BatchRunner:
+    """
+    Runs several tasks in one process.
+
+    Tasks are grouped by the calendar fetch they need (resolved URL and fetch
+    options). Each group is fetched once and the days are fanned out to every
+    task's filter and output pipeline, so a batch pays the interpreter, pandas
+    and browser startup once and scrapes each distinct calendar once.
+    """
+
+    def __init__(self, task_configs):
+        """
+        Parameters:
+        task_configs (list): Task configurations in the app/data/tasks.json format.
+        """
+        self.task_configs = list(task_configs)
+        self.timings = []
+
+    @staticmethod
+    def fetch_key(host):
+        """
+        Identify the fetch a host needs. Hosts with equal keys get identical days.
+        """
+        args = host.args
+        return (host.ff_scraper.url, args.fetch_engine, args.fetch_mode,
+                args.fixtures_dir if args.fetch_mode != FetchMode.LIVE else None,
+                args.needs_full_payload(), args.shard_by)
+
+    def _prepare(self):
+        """
+        Build a Host per task and group them by fetch key.
+
+        Returns:
+        dict: Lists of (Host, TaskTiming) keyed by fetch key, in task order.
+        """
+        groups = {}
+        for task_config in self.task_configs:
+            timing = TaskTiming(task_name=task_config.get('task_name', '?'))
+            self.timings.append(timing)
+            try:
+                args = TaskConfig.to_command_line_args(task_config)
+                if args is None:
+                    timing.error = 'invalid time period'
+                    continue
+                os.makedirs(args.output_folder, exist_ok=True)
+                host = Host(args)
+            except (ValueError, OSError) as e:
+                logger.error("Skipping task %s: %s", timing.task_name, e)
+                timing.error = str(e)
+                continue
+            timing.url = host.ff_scraper.url
+            groups.setdefault(self.fetch_key(host), []).append((host, timing))
+        return groups
+
+    async def _run_group(self, members):
+        """
+        Fetch the calendar of a group once, then run every member's pipeline on it.
+        """
+        started = time.perf_counter()
+        try:
+            days_array = await members[0][0].fetch_calendar_async()
+        except CalendarFetchError as e:
+            logger.error("Failed to fetch calendar data from %s: %s", e.url, e)
+            for _, timing in members:
+                timing.error = str(e)
+            return
+        fetch_ms = (time.perf_counter() - started) * 1000
+
+        for host, timing in members:
+            timing.fetch_ms = fetch_ms
+            timing.shared_fetch = len(members) > 1
+            task_started = time.perf_counter()
+            try:
+                await host.run_async(days_array=days_array)
+            except Exception as e:  # One task's failure must not stop the rest of the batch
+                logger.exception("Task %s failed: %s", timing.task_name, e)
+                timing.error = str(e)
+            timing.pipeline_ms = (time.perf_counter() - task_started) * 1000
+
+    async def run_async(self):
+        """
+        Run every task of the batch.
+
+        Returns:
+        list: A TaskTiming per task, in task order.
+        """
+        started = time.perf_counter()
+        groups = self._prepare()
+        logger.info("Running %d task(s) with %d distinct calendar fetch(es).",
+                    len(self.task_configs), len(groups))
+
+        await asyncio.gather(*(self._run_group(members) for members in groups.values()))
+
+        self.log_summary((time.perf_counter() - started) * 1000)
+        return self.timings
+
+    def log_summary(self, total_ms):
+        """
+        Log the per-task timing summary.
+        """
+        logger.info("Batch summary (%d task(s), %.0f ms in total):", len(self.timings), total_ms)
+        for timing in self.timings:
+            if timing.succeeded:
+                logger.info("  %-30s fetch %7.0f ms%s  pipeline %7.0f ms",
+                            timing.task_name, timing.fetch_ms,
+                            ' (shared)' if timing.shared_fetch else '         ',
+                            timing.pipeline_ms)
+            else:
+                logger.info("  %-30s FAILED: %s", timing.task_name, timing.error)
@@ -2,7 +2,12 @@ import os
 import argparse
 from app.models import CommandLineArgs
 from app.models.currencies import Currencies
+from app.models.fetch_engine import FetchEngine
+from app.models.fetch_mode import FetchMode
 from app.models.impact_class import ImpactClass
+from app.models.output_format import OutputFormat
+from app.models.output_frame import OutputFrame
+from app.models.shard_by import ShardBy
 from app.models.time_period import TimePeriod
 
 
@@ -70,6 +75,61 @@ class CommandLine:
             help='End date for the custom time period (YYYY-MM-DD)'
         )
 
+        parser.add_argument(
+            '--fetch-engine', '-e',
+            type=str,
+            help='Calendar fetch engine (playwright, http). http falls back to playwright if the page cannot be parsed',
+            default='playwright'
+        )
+
+        parser.add_argument(
+            '--shard-by',
+            type=str,
+            help='Split a custom time period into week or month chunks fetched in parallel (none, week, month)',
+            default='none'
+        )
+
+        parser.add_argument(
+            '--fetch-mode',
+            type=str,
+            help='live (default), record (also save pages and days arrays to the fixtures directory) or replay (serve them back without network access)',
+            default='live'
+        )
+
+        parser.add_argument(
+            '--fixtures-dir',
+            type=str,
+            help='Fixture archive directory used by the record and replay fetch modes',
+            default='./fixtures'
+        )
+
+        parser.add_argument(
+            '--full-payload',
+            action='store_true',
+            help='Keep every field of the scraped calendar events instead of only the ones the reports use (for debugging)'
+        )
+
+        parser.add_argument(
+            '--derive-periods',
+            type=str,
+            help='Comma-separated list of narrower time periods (e.g. "Today,This Week") whose outputs are sliced from the --time-period data instead of being fetched again',
+            default=''
+        )
+
+        parser.add_argument(
+            '--frames',
+            type=str,
+            help='Comma-separated list of outputs to produce (raw, normalized, cleaned, filtered, nnfx). Frames that are not asked for are not computed. Default: all',
+            default=''
+        )
+
+        parser.add_argument(
+            '--formats',
+            type=str,
+            help='Comma-separated list of output formats (json, html). Default: all',
+            default=''
+        )
+
         args = parser.parse_args()
 
         # Process impact classes
@@ -107,6 +167,27 @@ class CommandLine:
         start_date = args.start_date
         end_date = args.end_date
 
+        # Process fetch engine
+        fetch_engine = FetchEngine.from_text(args.fetch_engine)
+
+        # Process custom period sharding
+        shard_by = ShardBy.from_text(args.shard_by)
+
+        # Process derived time periods
+        if args.derive_periods:
+            derived_periods = [TimePeriod.from_text(
+                period.strip()) for period in args.derive_periods.split(',')]
+        else:
+            derived_periods = []
+
+        # Process output frame and format selection
+        frames = [OutputFrame.from_text(frame) for frame in args.frames.split(',') if frame.strip()]
+        formats = [OutputFormat.from_text(fmt) for fmt in args.formats.split(',') if fmt.strip()]
+
+        # Process record/replay fetch mode
+        fetch_mode = FetchMode.from_text(args.fetch_mode)
+        fixtures_dir = args.fixtures_dir
+
         if time_period == TimePeriod.CUSTOM:
             if not start_date or not end_date:
                 raise ValueError("Both start-date and end-date must be provided for custom time period")
@@ -122,5 +203,13 @@ class CommandLine:
             custom_nnfx_filters=custom_nnfx_filters,
             custom_calendar_template=custom_calendar_template,
             start_date=start_date,
-            end_date=end_date
+            end_date=end_date,
+            fetch_engine=fetch_engine,
+            shard_by=shard_by,
+            fetch_mode=fetch_mode,
+            fixtures_dir=fixtures_dir,
+            full_payload=args.full_payload,
+            derived_periods=derived_periods,
+            frames=frames,
+            formats=formats
         )
@@ -0,0 +1,184 @@
+import asyncio
+import contextlib
+import itertools
+import logging
+import math
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+
+# Initialize the logger for this module
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class QueuedJob:
+    task_name: str
+    task_config: dict
+    priority: int = 0
+    # time.monotonic() values
+    scheduled_at: float = 0.0
+    enqueued_at: float = 0.0
+    deadline: float = None
+    sequence: int = 0
+    coalesced: int = 0
+    status: str = 'pending'
+    finished: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def exclusive_keys(self):
+        # A task never overlaps itself, nor tasks of its exclusive group
+        group = self.task_config.get('exclusive_group')
+        return {('task', self.task_name)} | ({('group', group)} if group else set())
+
+    def sort_key(self):
+        """
+        Higher priority first, then the earliest deadline, then first come first served.
+        """
+        return (-self.priority, self.deadline if self.deadline is not None else math.inf, self.sequence)
+
+
+class RunQueue:
+    """
+    Run queue of the scheduler.
+
+    Jobs are dispatched by priority and deadline to a fixed number of slots.
+    A job that has not started by its deadline is dropped instead of running
+    late, and a job fired again while still waiting is coalesced with the
+    waiting one, since both would produce the same outputs.
+
+    Task fields:
+    - priority (int): Higher runs first (default 0).
+    - deadline_seconds (float): How long after its scheduled time the job may
+      still start. No deadline when absent.
+    """
+
+    def __init__(self, run_job, concurrency):
+        """
+        Parameters:
+        run_job (callable): Coroutine function that runs a task configuration.
+        concurrency (int): Number of jobs that may run at the same time.
+        """
+        self.run_job = run_job
+        self.concurrency = max(1, concurrency)
+        self.misfires = Counter()
+        self.coalesced = Counter()
+        self._pending = []
+        self._busy_keys = set()
+        self._sequence = itertools.count()
+        self._wakeup = None
+        self._dispatchers = []
+
+    def _ensure_dispatchers(self):
+        if not self._dispatchers:
+            self._wakeup = asyncio.Event()
+            self._dispatchers = [asyncio.create_task(self._dispatch_loop())
+                                 for _ in range(self.concurrency)]
+
+    def submit(self, task_config, scheduled_at=None):
+        """
+        Queue a task, or coalesce it with the same task already waiting.
+
+        Parameters:
+        task_config (dict): The task's configuration.
+        scheduled_at (float, optional): time.monotonic() value of the scheduled
+            run time. Defaults to now.
+
+        Returns:
+        QueuedJob: The queued job. Await job.finished.wait() for its completion.
+
+        Raises:
+        ValueError: If the priority or deadline_seconds field is invalid.
+        """
+        self._ensure_dispatchers()
+        now = time.monotonic()
+        scheduled_at = now if scheduled_at is None else scheduled_at
+        task_name = task_config['task_name']
+        priority = int(task_config.get('priority') or 0)
+        deadline_seconds = task_config.get('deadline_seconds')
+        deadline = scheduled_at + float(deadline_seconds) if deadline_seconds is not None else None
+
+        for job in self._pending:
+            if job.task_name == task_name:
+                # The waiting job now stands for the newer run as well, so it may start until the later deadline
+                job.coalesced += 1
+                job.deadline = None if job.deadline is None or deadline is None else max(job.deadline, deadline)
+                job.task_config = task_config
+                self.coalesced[task_name] += 1
+                logger.info("Coalesced %s with its waiting run (%d coalesced so far).",
+                            task_name, self.coalesced[task_name])
+                self._notify()
+                return job
+
+        job = QueuedJob(task_name=task_name, task_config=task_config, priority=priority,
+                        scheduled_at=scheduled_at, enqueued_at=now, deadline=deadline,
+                        sequence=next(self._sequence))
+        self._pending.append(job)
+        self._notify()
+        return job
+
+    def _notify(self):
+        self._wakeup.set()
+
+    def _drop_missed(self, now):
+        for job in [job for job in self._pending if job.deadline is not None and now > job.deadline]:
+            self._pending.remove(job)
+            self.misfires[job.task_name] += 1
+            job.status = 'missed'
+            job.finished.set()
+            logger.warning(
+                "Dropped %s: still waiting %.0f ms past its deadline (priority %d, waited %.0f ms, %d misfire(s) so far).",
+                job.task_name, (now - job.deadline) * 1000, job.priority,
+                (now - job.enqueued_at) * 1000, self.misfires[job.task_name])
+
+    async def _next_job(self):
+        while True:
+            now = time.monotonic()
+            self._drop_missed(now)
+            eligible = [job for job in self._pending if not job.exclusive_keys & self._busy_keys]
+            if eligible:
+                job = min(eligible, key=QueuedJob.sort_key)
+                self._pending.remove(job)
+                self._busy_keys |= job.exclusive_keys
+                return job
+
+            # Sleep until the queue changes, or until the next deadline to drop the job that misses it
+            self._wakeup.clear()
+            deadlines = [job.deadline for job in self._pending if job.deadline is not None]
+            timeout = max(0.0, min(deadlines) - now) if deadlines else None
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+
+    async def _dispatch_loop(self):
+        while True:
+            job = await self._next_job()
+            started = time.monotonic()
+            logger.info(
+                "Dispatching %s (priority %d): queue wait %.0f ms, dispatch latency %.0f ms, "
+                "%d coalesced, %d misfire(s) so far.",
+                job.task_name, job.priority, (started - job.enqueued_at) * 1000,
+                (started - job.scheduled_at) * 1000, job.coalesced, self.misfires[job.task_name])
+            job.status = 'running'
+            try:
+                await self.run_job(job.task_config)
+                job.status = 'done'
+            except Exception as e:  # Keep dispatching the other jobs
+                job.status = 'failed'
+                logger.exception("Task %s failed: %s", job.task_name, e)
+            finally:
+                self._busy_keys -= job.exclusive_keys
+                job.finished.set()
+                self._notify()
+
+    async def stop(self):
+        """
+        Stop dispatching. Waiting jobs are discarded and running ones cancelled.
+        """
+        for dispatcher in self._dispatchers:
+            dispatcher.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        self._dispatchers = []
+        for job in self._pending:
+            job.status = 'cancelled'
+            job.finished.set()
+        self._pending = []
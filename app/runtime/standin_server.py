@@ -0,0 +1,112 @@
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.services.fixture_archive_service import FixtureArchiveService
+
+# Initialize the logger for this module
+logger = logging.getLogger(__name__)
+
+
+class StandinServer:
+    """
+    Local HTTP server that mimics the calendar URLs produced by TimePeriod.to_href.
+
+    Requests are answered from a fixture archive: a recorded page is served as-is,
+    and a URL that only has a recorded days array gets a minimal page that assigns
+    window.calendarComponentStates[1].days, which is all the scraper reads.
+    Pointing BASE_URL at this server lets the Playwright and HTTP fetch engines
+    run without network access.
+    """
+
+    PAGE_TEMPLATE = '''<!doctype html>
+<html>
+<head>
+<script type="text/javascript">
+window.calendarComponentStates = window.calendarComponentStates || [];
+window.calendarComponentStates[1] = {
+    days: {days_json},
+    time: 0
+};
+</script>
+</head>
+<body></body>
+</html>
+'''
+
+    def __init__(self, fixtures_dir, host='127.0.0.1', port=0):
+        self.archive = FixtureArchiveService(fixtures_dir)
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def render_page(self, path):
+        """
+        Build the page for a calendar path from the fixture archive.
+
+        Parameters:
+        path (str): Request path with query, e.g. '/calendar?week=this'.
+
+        Returns:
+        str: The page HTML, or None if nothing was recorded for the path.
+        """
+        html = self.archive.load_page(path)
+        if html is not None:
+            return html
+        days_array = self.archive.load_days(path)
+        if days_array is None:
+            return None
+        # Escape '</' so event text can never close the inline script early
+        days_json = json.dumps(days_array).replace('</', '<\\/')
+        return self.PAGE_TEMPLATE.replace('{days_json}', days_json)
+
+    def _make_handler(self):
+        server = self
+
+        class CalendarRequestHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                html = server.render_page(self.path)
+                if html is None:
+                    self.send_error(404, f'No fixture recorded for {self.path}')
+                    return
+                body = html.encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+                logger.debug("%s - %s", self.address_string(), format % args)
+
+        return CalendarRequestHandler
+
+    def start(self):
+        """
+        Serve requests on a background thread.
+        """
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info("Stand-in calendar server listening on %s", self.base_url)
+        return self
+
+    def serve_forever(self):
+        """
+        Serve requests on the calling thread until interrupted.
+        """
+        logger.info("Stand-in calendar server listening on %s", self.base_url)
+        try:
+            self.httpd.serve_forever()
+        finally:
+            self.httpd.server_close()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
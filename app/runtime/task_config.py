@@ -0,0 +1,138 @@
+import json
+import logging
+import os
+
+from app.models import CommandLineArgs
+from app.models.currencies import Currencies
+from app.models.fetch_engine import FetchEngine
+from app.models.fetch_mode import FetchMode
+from app.models.impact_class import ImpactClass
+from app.models.output_format import OutputFormat
+from app.models.output_frame import OutputFrame
+from app.models.shard_by import ShardBy
+from app.models.time_period import TimePeriod
+
+# Initialize the logger for this module
+logger = logging.getLogger(__name__)
+
+
+class TaskConfig:
+    """
+    Reads task definitions in the app/data/tasks.json format and turns them
+    into CommandLineArgs, for the scheduler and the batch runner alike.
+    """
+
+    DEFAULT_TASKS_FILE = 'app/data/tasks.json'
+
+    @staticmethod
+    def load_tasks(task_file=DEFAULT_TASKS_FILE):
+        """
+        Load the task definitions from a JSON file.
+
+        Parameters:
+        task_file (str): Path to the task configuration file.
+
+        Returns:
+        dict: Task configurations keyed by task name, in file order.
+        """
+        with open(task_file, 'r', encoding='utf-8') as f:
+            task_data = json.load(f)
+        return {task['task_name']: task for task in task_data['tasks']}
+
+    @staticmethod
+    def from_command_line_args(args, task_name='cli'):
+        """
+        Describe command line arguments as a task configuration, e.g. to send
+        them to a worker. Paths are made absolute so they survive a change of
+        working directory.
+
+        Parameters:
+        args (CommandLineArgs): The arguments.
+        task_name (str): Name of the task.
+
+        Returns:
+        dict: The task configuration, JSON serializable.
+        """
+        def absolute(path):
+            return os.path.abspath(path) if path else None
+
+        return {
+            'task_name': task_name,
+            'impact_classes': ','.join(ImpactClass.to_text(ic) for ic in args.impact_classes or []),
+            'currencies': ','.join(Currencies.to_text(curr) for curr in args.currencies or []),
+            'time_period': TimePeriod.to_text(args.time_period or TimePeriod.TODAY),
+            'output_folder': absolute(args.output_folder),
+            'nnfx': bool(args.nnfx),
+            'custom_nnfx_filters': absolute(args.custom_nnfx_filters),
+            'custom_calendar_template': absolute(args.custom_calendar_template),
+            'start_date': args.start_date,
+            'end_date': args.end_date,
+            'fetch_engine': FetchEngine.to_text(args.fetch_engine),
+            'shard_by': ShardBy.to_text(args.shard_by),
+            'fetch_mode': FetchMode.to_text(args.fetch_mode),
+            'fixtures_dir': absolute(args.fixtures_dir),
+            'full_payload': bool(args.full_payload),
+            'derive_periods': ','.join(TimePeriod.to_text(period) for period in args.derived_periods),
+            'frames': ','.join(OutputFrame.to_text(frame) for frame in args.frames),
+            'formats': ','.join(OutputFormat.to_text(fmt) for fmt in args.formats),
+        }
+
+    @staticmethod
+    def _split(value):
+        return [item.strip() for item in (value or '').split(',') if item.strip()]
+
+    @staticmethod
+    def to_command_line_args(task_config):
+        """
+        Build the command line arguments of a task.
+
+        Parameters:
+        task_config (dict): A task's configuration.
+
+        Returns:
+        CommandLineArgs: The arguments, or None if the time period is invalid.
+
+        Raises:
+        ValueError: If a custom period is missing its dates or a value is invalid.
+        """
+        # Get the time period for the task, or log an error if invalid
+        time_period = task_config.get('time_period')
+        if time_period:
+            time_period = TimePeriod.from_text(time_period.strip())
+        if not time_period:
+            logger.error("Invalid time period: %s. Skipping task.", task_config.get('time_period'))
+            return None
+
+        start_date = task_config.get('start_date') or None
+        end_date = task_config.get('end_date') or None
+        if time_period == TimePeriod.CUSTOM and (not start_date or not end_date):
+            raise ValueError(
+                "Both start-date and end-date must be provided for custom time period")
+
+        # Use environment variable OUTPUT_FOLDER if output_folder is null in task config
+        output_folder = task_config.get('output_folder') or os.getenv('OUTPUT_FOLDER', './data_files')
+        if not task_config.get('output_folder'):
+            logger.info("Using default output folder: %s", output_folder)
+
+        return CommandLineArgs(
+            impact_classes=[ImpactClass.from_text(ic) for ic in TaskConfig._split(
+                task_config.get('impact_classes'))],
+            currencies=[Currencies.from_text(curr) for curr in TaskConfig._split(
+                task_config.get('currencies'))],
+            time_period=time_period,
+            output_folder=output_folder,
+            nnfx=bool(task_config.get('nnfx', False)),
+            custom_nnfx_filters=task_config.get('custom_nnfx_filters') or None,
+            custom_calendar_template=task_config.get('custom_calendar_template') or None,
+            start_date=start_date,
+            end_date=end_date,
+            fetch_engine=FetchEngine.from_text(task_config.get('fetch_engine') or 'playwright'),
+            shard_by=ShardBy.from_text(task_config.get('shard_by') or 'none'),
+            fetch_mode=FetchMode.from_text(task_config.get('fetch_mode') or 'live'),
+            fixtures_dir=task_config.get('fixtures_dir') or './fixtures',
+            full_payload=bool(task_config.get('full_payload', False)),
+            derived_periods=[TimePeriod.from_text(period) for period in TaskConfig._split(
+                task_config.get('derive_periods'))],
+            frames=[OutputFrame.from_text(frame) for frame in TaskConfig._split(task_config.get('frames'))],
+            formats=[OutputFormat.from_text(fmt) for fmt in TaskConfig._split(task_config.get('formats'))],
+        )
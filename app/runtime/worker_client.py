@@ -0,0 +1,129 @@
+import json
+import logging
+import os
+import socket
+import tempfile
+
+from app.config import Config
+from app.runtime.task_config import TaskConfig
+
+# Initialize the logger for this module
+logger = logging.getLogger(__name__)
+
+
+class WorkerClient:
+    """
+    Thin client of the worker daemon (see WorkerServer).
+
+    Sends one job over the worker's Unix domain socket and waits for its
+    result. When no worker is listening the caller runs the job itself.
+    """
+
+    CONNECT_TIMEOUT_SECONDS = 1.0
+
+    def __init__(self, socket_path=None):
+        self.socket_path = socket_path or WorkerClient.default_socket_path()
+
+    @staticmethod
+    def default_socket_dir():
+        """
+        Returns:
+        str: The private directory of this user's worker socket: news_factory
+            in XDG_RUNTIME_DIR, or news_factory-<uid> in the temp directory.
+        """
+        runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+        if runtime_dir:
+            return os.path.join(runtime_dir, 'news_factory')
+        return os.path.join(tempfile.gettempdir(), f'news_factory-{os.getuid()}')
+
+    @staticmethod
+    def default_socket_path():
+        """
+        Returns:
+        str: WORKER_SOCKET, or worker.sock in the default socket directory.
+        """
+        return Config.get(Config.WORKER_SOCKET_KEY) or os.path.join(
+            WorkerClient.default_socket_dir(), 'worker.sock')
+
+    def _connect(self):
+        """
+        Connect to the worker, if one owned by this user is listening.
+
+        Returns:
+        socket.socket: The connection, or None if there is no worker to forward to.
+        """
+        if not hasattr(socket, 'AF_UNIX'):
+            return None
+        try:
+            owner = os.stat(self.socket_path).st_uid
+        except OSError:
+            return None
+        # Jobs write files with the worker's permissions: never hand them to another user
+        if owner != os.getuid():
+            logger.warning("Worker socket %s is owned by another user (uid %d). Not forwarding the job.",
+                           self.socket_path, owner)
+            return None
+
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.settimeout(self.CONNECT_TIMEOUT_SECONDS)
+        try:
+            connection.connect(self.socket_path)
+        except OSError:
+            connection.close()
+            return None
+        return connection
+
+    def request(self, message):
+        """
+        Send one request to the worker and wait for its reply.
+
+        Parameters:
+        message (dict): The request, e.g. {'action': 'ping'}.
+
+        Returns:
+        dict: The reply, or None if no worker is listening on the socket.
+
+        Raises:
+        OSError: If the connection fails after the request was sent.
+        ValueError: If the reply is not valid JSON.
+        """
+        connection = self._connect()
+        if connection is None:
+            return None
+        with connection:
+            # Jobs may take minutes; only the connect is bounded
+            connection.settimeout(None)
+            connection.sendall(json.dumps(message).encode('utf-8') + b'\n')
+            reply = connection.makefile('rb').readline()
+        if not reply:
+            raise ConnectionError(f'Worker at {self.socket_path} closed the connection without a reply')
+        return json.loads(reply)
+
+    def run(self, args):
+        """
+        Run a job on the worker.
+
+        Parameters:
+        args (CommandLineArgs): The job.
+
+        Returns:
+        int: Exit status of the job (0 on success), or None if no worker could
+            be reached and the caller should run the job itself.
+        """
+        try:
+            reply = self.request({'action': 'run', 'task': TaskConfig.from_command_line_args(args)})
+        except (OSError, ValueError) as e:
+            # The worker may have started the job already; running it again could race on the outputs
+            logger.error("Lost the worker at %s after sending the job (%s). Not running it again in process.",
+                         self.socket_path, e)
+            return 1
+        if reply is None:
+            return None
+
+        if reply.get('status') == 'ok':
+            logger.info("Worker finished the job in %.0f ms: %d days, %d JSON files, %d HTML files.",
+                        reply.get('elapsed_ms', 0), reply.get('days', 0),
+                        reply.get('json_files', 0), reply.get('html_files', 0))
+            return 0
+        logger.error("Worker failed the job: %s", reply.get('error'))
+        return 1
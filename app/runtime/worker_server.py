@@ -0,0 +1,180 @@
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import socket
+import time
+
+from app.config import Config
+from app.host import Host
+from app.models.calendar_fetch_error import CalendarFetchError
+from app.runtime.task_config import TaskConfig
+from app.runtime.worker_client import WorkerClient
+from app.services import AnalysisPoolService, BrowserPoolService, CalendarCacheService
+
+# Initialize the logger for this module
+logger = logging.getLogger(__name__)
+
+
+class WorkerServer:
+    """
+    Long-lived worker that keeps the imports, the resource cache and a browser
+    warm, and runs jobs sent by WorkerClient over a Unix domain socket.
+
+    Each connection carries one JSON line, {"action": "run", "task": {...}}
+    with a task in the tasks.json format, or {"action": "ping"}, and gets one
+    JSON line back.
+    """
+
+    DEFAULT_CONCURRENCY = 2
+
+    def __init__(self, socket_path=None, concurrency=None):
+        self.socket_path = socket_path or WorkerClient.default_socket_path()
+        self.concurrency = max(1, concurrency or Config.get_int(
+            Config.WORKER_CONCURRENCY_KEY, self.DEFAULT_CONCURRENCY))
+        self.jobs_served = 0
+        self._server = None
+        self._job_slots = None
+
+    def _remove_stale_socket(self):
+        """
+        Remove a socket file left behind by a worker that is no longer running.
+
+        Raises:
+        RuntimeError: If another worker is listening on the socket.
+        """
+        if not os.path.exists(self.socket_path):
+            return
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(self.socket_path)
+            except (ConnectionRefusedError, FileNotFoundError):
+                os.remove(self.socket_path)
+                return
+        raise RuntimeError(f'Another worker is already listening on {self.socket_path}')
+
+    def _prepare_socket_dir(self):
+        """
+        Create the directory of the socket. The default directory is private
+        to this user; a directory given with WORKER_SOCKET is left as it is.
+
+        Raises:
+        RuntimeError: If the default directory belongs to another user.
+        """
+        socket_dir = os.path.dirname(os.path.abspath(self.socket_path))
+        os.makedirs(socket_dir, mode=0o700, exist_ok=True)
+        if socket_dir != os.path.abspath(WorkerClient.default_socket_dir()):
+            return
+        if os.stat(socket_dir).st_uid != os.getuid():
+            raise RuntimeError(f'Worker socket directory {socket_dir} is owned by another user')
+        os.chmod(socket_dir, 0o700)
+
+    async def start(self):
+        """
+        Listen on the socket and launch the pooled browser.
+        """
+        self._prepare_socket_dir()
+        self._remove_stale_socket()
+        self._job_slots = asyncio.Semaphore(self.concurrency)
+        # Jobs write files as this user, so only this user may submit them. The
+        # umask makes the socket private from the moment it is bound.
+        previous_umask = os.umask(0o177)
+        try:
+            self._server = await asyncio.start_unix_server(self._handle_connection, path=self.socket_path)
+        finally:
+            os.umask(previous_umask)
+        await BrowserPoolService().warm_up()
+        logger.info("Worker listening on %s (concurrency: %d).", self.socket_path, self.concurrency)
+
+    async def serve_forever(self):
+        """
+        Serve jobs until cancelled, then shut down cleanly.
+        """
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            with contextlib.suppress(Exception):
+                await self._server.wait_closed()
+            self._server = None
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self.socket_path)
+        await CalendarCacheService().wait_for_refreshes()
+        await BrowserPoolService().shutdown()
+        AnalysisPoolService().shutdown()
+        logger.info("Worker stopped after %d job(s).", self.jobs_served)
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            line = await reader.readline()
+            try:
+                request = json.loads(line)
+            except ValueError:
+                reply = {'status': 'error', 'error': 'Malformed request'}
+            else:
+                reply = await self.dispatch(request)
+            writer.write(json.dumps(reply).encode('utf-8') + b'\n')
+            await writer.drain()
+        except ConnectionError as e:
+            logger.warning("Client disconnected: %s", e)
+        finally:
+            writer.close()
+            with contextlib.suppress(Exception):
+                await writer.wait_closed()
+
+    async def dispatch(self, request):
+        """
+        Answer one request.
+
+        Parameters:
+        request (dict): The decoded request.
+
+        Returns:
+        dict: The reply, with 'status' set to 'ok' or 'error'.
+        """
+        action = request.get('action')
+        if action == 'ping':
+            return {'status': 'ok', 'pid': os.getpid(), 'jobs_served': self.jobs_served}
+        if action == 'run':
+            return await self.run_job(request.get('task') or {})
+        return {'status': 'error', 'error': f"Unknown action '{action}'"}
+
+    async def run_job(self, task_config):
+        """
+        Run one job with the warm services of this process.
+
+        Parameters:
+        task_config (dict): The job, in the tasks.json format.
+
+        Returns:
+        dict: The reply, with the output counts on success.
+        """
+        async with self._job_slots:
+            started = time.perf_counter()
+            try:
+                args = TaskConfig.to_command_line_args(task_config)
+                if args is None:
+                    return {'status': 'error', 'error': 'Invalid time period'}
+                os.makedirs(args.output_folder, exist_ok=True)
+                result = await Host(args).run_async()
+            except CalendarFetchError as e:
+                logger.error("Failed to fetch calendar data from %s: %s", e.url, e)
+                return {'status': 'error', 'error': f'Failed to fetch calendar data from {e.url}: {e}'}
+            except (ValueError, OSError) as e:
+                logger.error("Job failed: %s", e)
+                return {'status': 'error', 'error': str(e)}
+            except Exception as e:  # Keep serving other jobs
+                logger.exception("Job failed: %s", e)
+                return {'status': 'error', 'error': str(e)}
+            finally:
+                self.jobs_served += 1
+
+            # The run report stays next to the outputs; the reply only carries the counts
+            result.pop('report', None)
+            return {'status': 'ok', 'elapsed_ms': (time.perf_counter() - started) * 1000, **result}
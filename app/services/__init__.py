@@ -1,12 +1,25 @@
 # app/services/__init__.py
-# Import and expose services from subpackages if needed
+# Services are imported on first use, so an entry point only loads pandas,
+# Playwright or requests when a stage that needs them runs
+from app.helpers.lazy_exports import lazy_exports
 
-from .ff_scraper_service import ForexFactoryScraperService
-from .data_service import DataService
-from .output_service import OutputService
-from .analyze_service import AnalyzeService
-from .report_service import ReportService
+_EXPORTS = {
+    'BrowserPoolService': '.browser_pool_service',
+    'HttpCalendarService': '.http_calendar_service',
+    'CalendarCacheService': '.calendar_cache_service',
+    'FixtureArchiveService': '.fixture_archive_service',
+    'SingleFlightService': '.single_flight_service',
+    'ForexFactoryScraperService': '.ff_scraper_service',
+    'DataService': '.data_service',
+    'OutputService': '.output_service',
+    'AnalysisPoolService': '.analysis_pool_service',
+    'AnalyzeService': '.analyze_service',
+    'AnalysisStateService': '.analysis_state_service',
+    'ReportService': '.report_service',
+    'PrometheusTextfileService': '.prometheus_textfile_service',
+}
 
 # Optional, for explicit API exposure
-__all__ = ['ForexFactoryScraperService',
-           'DataService', 'OutputService', 'AnalyzeService', 'ReportService']
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(globals(), _EXPORTS)
@@ -0,0 +1,110 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from app.config import Config
+from app.helpers.calendar_slicer import CalendarSlicer
+from app.models import SingletonMeta
+
+# Initialize the logger for this module
+logger = logging.getLogger(__name__)
+
+
+class AnalysisPoolService(metaclass=SingletonMeta):
+    """
+    Process-wide pool of analysis worker processes.
+
+    Large days arrays (e.g. multi-month custom ranges) are split into calendar
+    weeks whose analysis runs in parallel on separate cores, off the event
+    loop. Smaller ones are analyzed in process, where a pool would cost more
+    than it saves.
+    """
+
+    DEFAULT_THRESHOLD_EVENTS = 5000
+    DEFAULT_MAX_WORKERS = 4
+
+    def __init__(self):
+        self.threshold_events = Config.get_int(
+            Config.ANALYSIS_POOL_THRESHOLD_KEY, self.DEFAULT_THRESHOLD_EVENTS)
+        self.max_workers = Config.get_int(
+            Config.ANALYSIS_POOL_WORKERS_KEY, min(self.DEFAULT_MAX_WORKERS, os.cpu_count() or 1))
+        self._executor = None
+
+    @staticmethod
+    def count_events(days_array):
+        return sum(len(day.get('events') or []) for day in days_array)
+
+    def should_pool(self, days_array):
+        """
+        Decide whether a days array is worth analyzing in the pool.
+
+        Parameters:
+        days_array (list): The days to analyze.
+
+        Returns:
+        bool: True when the pool is enabled and the array holds at least
+            ANALYSIS_POOL_THRESHOLD events over more than one week.
+        """
+        if self.max_workers < 2 or self.threshold_events <= 0:
+            return False
+        return self.count_events(days_array) >= self.threshold_events and len(days_array) > 7
+
+    @staticmethod
+    def partition_by_week(days_array):
+        """
+        Split a days array into runs of days that fall in the same Sunday-to-Saturday week.
+
+        Days whose date cannot be determined stay with the preceding days, so
+        the partitions concatenated in order give back the original array.
+
+        Parameters:
+        days_array (list): The days, in calendar order.
+
+        Returns:
+        list: Lists of days, in order.
+        """
+        partitions = []
+        current_week = None
+        for day in days_array:
+            day_date = CalendarSlicer.day_date(day)
+            # Python weeks start on Monday; shift by a day to key weeks by their Sunday
+            week = day_date.toordinal() - (day_date.weekday() + 1) % 7 if day_date else current_week
+            if not partitions or week != current_week:
+                partitions.append([])
+                current_week = week
+            partitions[-1].append(day)
+        return partitions
+
+    def _get_executor(self):
+        if self._executor is None:
+            # Spawned workers do not inherit the parent's threads, open browser or sockets
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=multiprocessing.get_context('spawn'))
+            logger.info("Started analysis pool with %d worker process(es).", self.max_workers)
+        return self._executor
+
+    async def map(self, function, argument_lists):
+        """
+        Run a picklable function once per argument list in the pool.
+
+        Parameters:
+        function (callable): A module-level function or static method.
+        argument_lists (list): The positional arguments of each call.
+
+        Returns:
+        list: The results, in the order of argument_lists.
+        """
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        return await asyncio.gather(
+            *(loop.run_in_executor(executor, function, *arguments) for arguments in argument_lists))
+
+    def shutdown(self):
+        """
+        Stop the worker processes, if any were started.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
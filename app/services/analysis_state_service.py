@@ -0,0 +1,150 @@
+import logging
+from collections import OrderedDict
+
+from app.config import Config
+from app.models import SingletonMeta
+
+# Initialize the logger for this module
+logger = logging.getLogger(__name__)
+
+
+class AnalysisStateService(metaclass=SingletonMeta):
+    """
+    Process-wide state of the previous run of each output, keyed by output
+    folder and time period.
+
+    Each run compares its days with the previous run's: only the days that
+    changed are re-analyzed, and the events of those days are compared to
+    build the change set. A one-shot run starts without state; the scheduler,
+    the worker and batch runs keep it between refreshes.
+    """
+
+    DEFAULT_MAX_ENTRIES = 32
+
+    def __init__(self):
+        self.enabled = Config.get_bool(Config.INCREMENTAL_ANALYSIS_KEY, True)
+        self.max_entries = max(1, Config.get_int(
+            Config.ANALYSIS_STATE_MAX_ENTRIES_KEY, self.DEFAULT_MAX_ENTRIES))
+        self._states = OrderedDict()
+
+    @staticmethod
+    def day_key(day):
+        """
+        Identify a day across runs: by its Unix timestamp, or by its date label.
+        """
+        dateline = day.get('dateline')
+        return dateline if dateline is not None else day.get('date')
+
+    @staticmethod
+    def event_key(event):
+        """
+        Identify an event across runs: by its id, or by its time, currency and
+        name when the payload has no id.
+        """
+        event_id = event.get('id')
+        if event_id is not None:
+            return str(event_id)
+        return f"{event.get('dateline')}|{event.get('currency')}|{event.get('name')}"
+
+    def get(self, key):
+        """
+        Parameters:
+        key (tuple): (output folder, time period file name ending).
+
+        Returns:
+        AnalysisState: The state of the previous run of the output, or None.
+        """
+        state = self._states.get(key)
+        if state is not None:
+            self._states.move_to_end(key)
+        return state
+
+    def put(self, key, state):
+        """
+        Keep a run's state for the next run of the same output, dropping the
+        least recently used states beyond ANALYSIS_STATE_MAX_ENTRIES.
+
+        Parameters:
+        key (tuple): (output folder, time period file name ending).
+        state (AnalysisState): The run's state.
+        """
+        self._states[key] = state
+        self._states.move_to_end(key)
+        while len(self._states) > self.max_entries:
+            self._states.popitem(last=False)
+
+    @staticmethod
+    def match_days(previous_days, days_array):
+        """
+        Find the days that did not change since the previous run.
+
+        The previous run's days act as their own fingerprints: a day is
+        unchanged when the previous run had a day with the same day_key and
+        equal content, which is cheaper to compare than to hash.
+
+        Parameters:
+        previous_days (list): The previous run's days.
+        days_array (list): The days of this run.
+
+        Returns:
+        dict: Position in days_array -> position in previous_days, for the unchanged days.
+        """
+        previous_positions = {}
+        for position, day in enumerate(previous_days):
+            previous_positions.setdefault(AnalysisStateService.day_key(day), position)
+
+        unchanged = {}
+        for position, day in enumerate(days_array):
+            previous_position = previous_positions.get(AnalysisStateService.day_key(day))
+            if previous_position is not None and previous_days[previous_position] == day:
+                unchanged[position] = previous_position
+        return unchanged
+
+    @staticmethod
+    def change_set(previous_days, days_array, unchanged):
+        """
+        Compare the events of the days that changed since the previous run.
+
+        Events of unchanged days are not looked at. An event is matched by
+        event_key, so a rescheduled event moving to another day shows up as updated.
+
+        Parameters:
+        previous_days (list): The previous run's days.
+        days_array (list): The days of this run.
+        unchanged (dict): The unchanged days, see match_days.
+
+        Returns:
+        dict: 'days_changed', and 'added' and 'removed' events, and 'updated'
+            events with the 'old' and 'new' value of each changed field.
+        """
+        unchanged_previous = set(unchanged.values())
+        old_events = {}
+        for position, day in enumerate(previous_days):
+            if position not in unchanged_previous:
+                for event in day.get('events') or []:
+                    old_events[AnalysisStateService.event_key(event)] = event
+
+        new_events = {}
+        for position, day in enumerate(days_array):
+            if position not in unchanged:
+                for event in day.get('events') or []:
+                    new_events[AnalysisStateService.event_key(event)] = event
+
+        updated = []
+        for key, event in new_events.items():
+            old_event = old_events.get(key)
+            if old_event is None or old_event == event:
+                continue
+            changes = {field: {'old': old_event.get(field), 'new': event.get(field)}
+                       for field in sorted(old_event.keys() | event.keys())
+                       if old_event.get(field) != event.get(field)}
+            updated.append({'id': event.get('id'), 'name': event.get('name'),
+                            'currency': event.get('currency'), 'dateline': event.get('dateline'),
+                            'changes': changes})
+
+        return {
+            'days_changed': len(days_array) - len(unchanged),
+            'added': [event for key, event in new_events.items() if key not in old_events],
+            'removed': [event for key, event in old_events.items() if key not in new_events],
+            'updated': updated,
+        }
@@ -1,120 +1,459 @@
+import logging
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 
+import numpy as np
 import pandas as pd
 
-from app.config.config import Config
-from app.services import DataService
+from app.config.run_settings import RunSettings
+from app.helpers import RunProfiler
+from app.helpers.constants import CALENDAR_TIMEZONE
+from app.helpers.keyword_matcher import KeywordMatcher
+from app.models.analysis_state import AnalysisState
+from app.models.calendar_fields import CalendarFields
+from app.models.output_frame import OutputFrame
+from app.services import AnalysisPoolService, DataService
+
+# Initialize the logger for this module
+logger = logging.getLogger(__name__)
 
 
 class AnalyzeService:
 
-    SELECTED_FIELDS = [
-        'meta_date', 'date', 'country', 'currency', 'impactClass',
-        'impactTitle', 'name', 'trimmedPrefixedName', 'dateline', 'forecast', 'previous',
-        'timeLabel', 'timeMasked'
-    ]
+    SELECTED_FIELDS = CalendarFields.SELECTED_FIELDS
+    EVENT_FIELDS = CalendarFields.ANALYZED_FIELDS
+    CATEGORICAL_FIELDS = ['country', 'currency', 'impactClass', 'impactTitle']
 
     @staticmethod
     def clean_data(data):
         """
             Cleans the provided DataFrame by selecting specific fields to display.
 
+            The result is compact: low-cardinality columns are categoricals and
+            event times stay in the 'timestamp' and 'timestamp_local' datetime64
+            columns. to_display_frame adds the date and time display columns
+            when the frame is written out.
+
             Parameters:
             data (pd.DataFrame): The input DataFrame to be cleaned.
 
             Returns:
             pd.DataFrame: A cleaned DataFrame containing only the selected fields.
             """
-        # right now we just select columns
-        selected_fields_data = data[AnalyzeService.SELECTED_FIELDS]
+        # Avoiding the SettingWithCopyWarning by creating a new DataFrame for the operation
+        selected_df_copy = data[AnalyzeService.SELECTED_FIELDS].copy()
 
-        # Detect the local time zone
-        # local_timezone = pytz.timezone()  # Example timezone, replace with detection logic if needed
-        local_timezone = datetime.now().astimezone().tzinfo
+        # A handful of distinct values each, repeated on every row
+        for column in AnalyzeService.CATEGORICAL_FIELDS:
+            selected_df_copy[column] = selected_df_copy[column].astype('category')
 
-        # Avoiding the SettingWithCopyWarning by creating a new DataFrame for the operation
-        selected_df_copy = selected_fields_data.copy()
+        # Detect the local time zone
+        local_timezone = AnalyzeService.local_timezone()
 
-        # Create a new column 'timestamp' from the 'dateline' column, which contains Unix timestamps
+        # Create a new column 'timestamp' from the 'dateline' column, which contains Unix timestamps.
+        # Converting a datetime64 column between time zones only changes its metadata.
         selected_df_copy['timestamp'] = pd.to_datetime(
-            selected_df_copy['dateline'], unit='s', utc=True).dt.tz_convert('US/Eastern')
+            selected_df_copy['dateline'], unit='s', utc=True).dt.tz_convert(CALENDAR_TIMEZONE)
         selected_df_copy['timestamp_local'] = selected_df_copy['timestamp'].dt.tz_convert(
             local_timezone)
-        # Create 'event_date' and 'event_time' fields
-        selected_df_copy['event_date'] = selected_df_copy['timestamp'].dt.strftime(
-            '%Y-%m-%d')
-        selected_df_copy['event_time'] = selected_df_copy['timestamp'].dt.time
 
-        # Create 'event_date_local' and 'event_time_local' fields from the 'timestamp'
-        selected_df_copy['event_date_local'] = selected_df_copy['timestamp_local'].dt.strftime(
-            '%Y-%m-%d')
-        selected_df_copy['event_time_local'] = selected_df_copy['timestamp_local'].dt.time
+        # Every event of a day repeats the day's date label, so parse each label once
+        date_codes, date_labels = pd.factorize(selected_df_copy['date'])
+        selected_df_copy['date'] = pd.to_datetime(date_labels).take(
+            date_codes, allow_fill=True, fill_value=pd.NaT)
+
+        return AnalyzeService.sort_events(selected_df_copy)
+
+    @staticmethod
+    def local_timezone():
+        """
+        Returns:
+        datetime.timezone: The host's current UTC offset, which the
+            'timestamp_local' column is expressed in.
+        """
+        return datetime.now().astimezone().tzinfo
+
+    @staticmethod
+    def sort_events(df):
+        """
+        Sort events by their Unix timestamp, keeping the current order of
+        events at the same time. Events without a timestamp go last.
+
+        Parameters:
+        df (pd.DataFrame): A cleaned frame, with 'dateline'.
+
+        Returns:
+        pd.DataFrame: The sorted frame.
+        """
+        datelines = df['dateline'].to_numpy(dtype='float64', na_value=np.nan)
+        # NaN sorts after every number; a stable sort breaks ties by the current position
+        return df.iloc[np.argsort(datelines, kind='stable')]
+
+    @staticmethod
+    def _wall_clock_parts(timestamps):
+        """
+        Split time-zone aware timestamps into their wall-clock date strings and
+        times of day. Each distinct day and time of day is formatted once.
+
+        Parameters:
+        timestamps (pd.Series): datetime64 values with a time zone.
+
+        Returns:
+        tuple: (np.ndarray of 'YYYY-MM-DD' strings, np.ndarray of datetime.time),
+            NaN and NaT where the timestamp is missing.
+        """
+        wall_clock = timestamps.dt.tz_localize(None)
+        days = wall_clock.dt.normalize()
+        day_codes, unique_days = pd.factorize(days)
+        time_codes, unique_times = pd.factorize(wall_clock - days)
+        # Missing timestamps get code -1, which picks the missing value appended last
+        dates = np.append(unique_days.strftime('%Y-%m-%d').to_numpy(dtype=object), np.nan)[day_codes]
+        times = np.append((pd.Timestamp(0) + unique_times).time, pd.NaT)[time_codes]
+        return dates, times
+
+    @staticmethod
+    def to_display_frame(df):
+        """
+        Expand a compact frame into the form written to JSON and HTML: the
+        categoricals as plain values, and the 'event_date', 'event_time',
+        'event_date_local' and 'event_time_local' columns after 'timestamp_local'.
 
-        # Use .loc to safely set the 'date' column to datetime format
-        selected_df_copy.loc[:, 'date'] = pd.to_datetime(
-            selected_df_copy['date'])
+        Parameters:
+        df (pd.DataFrame): An analyzed frame. Frames without 'timestamp_local',
+            such as the normalized data, are returned unchanged.
 
-        # Sort the DataFrame by 'date' and 'currency'
-        sorted_df = selected_df_copy.sort_values(
-            by=['event_date_local', 'event_time_local'])
+        Returns:
+        pd.DataFrame: The display frame.
+        """
+        if 'timestamp_local' not in df.columns:
+            return df
 
-        return sorted_df
+        columns = {}
+        for column in df.columns:
+            series = df[column]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                series = series.astype(object)
+            columns[column] = series
+            if column == 'timestamp_local':
+                columns['event_date'], columns['event_time'] = \
+                    AnalyzeService._wall_clock_parts(df['timestamp'])
+                columns['event_date_local'], columns['event_time_local'] = \
+                    AnalyzeService._wall_clock_parts(df['timestamp_local'])
+        return pd.DataFrame(columns, index=df.index)
 
     @staticmethod
-    async def analyze_data(days_array):
+    async def analyze_data(days_array, settings=None, profiler=None, frames=None):
         """
         Analyzes the provided data by normalizing, cleaning, and optionally filtering it
         based on configuration settings.
 
+        Only the requested frames, and the ones they are derived from, are
+        computed. Large days arrays are analyzed week by week in the analysis
+        process pool (see AnalysisPoolService) and the partial frames merged in order.
+
         Parameters:
         days_array (list): The raw data to be analyzed.
+        settings (RunSettings, optional): The run's filters. Defaults to the
+            environment's filters.
+        profiler (RunProfiler, optional): Receives a span per analysis stage.
+        frames (set, optional): The OutputFrames to return. Defaults to all of them.
 
         Returns:
-        pd.DataFrame: The analyzed data.
+        dict: The analyzed frames keyed by name, e.g. 'cleaned_data'.
         """
-        config = Config()
+        settings = settings or RunSettings.from_args()
+        profiler = profiler or RunProfiler()
+        frames = frozenset(frames or OutputFrame)
 
-        # Normalize events data
-        normalized_df = DataService.normalize_events_data(days_array)
+        pool = AnalysisPoolService()
+        if not pool.should_pool(days_array):
+            return AnalyzeService.analyze_frames(days_array, settings, profiler, frames=frames)
 
-        if normalized_df.empty:
-            return {'normalized_data': normalized_df}
+        partitions = AnalysisPoolService.partition_by_week(days_array)
+        argument_lists = []
+        start_index = 0
+        for partition in partitions:
+            argument_lists.append((partition, settings, start_index, frames))
+            start_index += AnalysisPoolService.count_events(partition)
 
-        # Clean the data frame
-        cleaned_df = AnalyzeService.clean_data(normalized_df)
+        try:
+            with profiler.span('analysis_pool', label=f'{len(partitions)} partitions') as span:
+                partition_results = await pool.map(AnalyzeService._analyze_partition, argument_lists)
+                span.rows = start_index
+        except BrokenProcessPool as e:
+            logger.warning("Analysis pool failed (%s). Analyzing in process.", e)
+            pool.shutdown()
+            return AnalyzeService.analyze_frames(days_array, settings, profiler, frames=frames)
+
+        for number, (_, partition_spans) in enumerate(partition_results, start=1):
+            for partition_span in partition_spans:
+                partition_label = f'partition {number}/{len(partitions)}'
+                partition_span.label = (f'{partition_span.label}, {partition_label}'
+                                        if partition_span.label else partition_label)
+                profiler.spans.append(partition_span)
+
+        return AnalyzeService.merge_partitions([results for results, _ in partition_results])
+
+    @staticmethod
+    def analysis_key(settings, frames):
+        """
+        Identify what analyzed frames depend on besides the days: the filters,
+        the requested frames and the host's UTC offset, which changes with
+        daylight saving time while a scheduler or worker keeps running.
+
+        Returns:
+        tuple: The key, comparable between runs.
+        """
+        return (
+            tuple(settings.get_impact_filter_list() or ()),
+            tuple(settings.get_currency_filter_list() or ()),
+            KeywordMatcher.content_hash(dict(settings.nnfx_filters)) if settings.nnfx else None,
+            tuple(sorted(frame.value for frame in frames)),
+            AnalyzeService.local_timezone().utcoffset(None),
+        )
+
+    @staticmethod
+    async def analyze_incremental(days_array, previous=None, unchanged=None, settings=None,
+                                  profiler=None, frames=None):
+        """
+        Analyze a days array, reusing the rows of the days that did not change
+        since the previous run of the same output.
+
+        Only the changed days are analyzed (see analyze_data). Their rows are
+        spliced with the previous run's rows of the unchanged days, giving the
+        frames analyze_data returns for the whole days array.
+
+        Parameters:
+        days_array (list): The raw data to be analyzed.
+        previous (AnalysisState, optional): The previous run's state.
+        unchanged (dict, optional): Position in days_array -> position in
+            previous.days of the unchanged days, see AnalysisStateService.match_days.
+        settings (RunSettings, optional): The run's filters.
+        profiler (RunProfiler, optional): Receives a span per analysis stage.
+        frames (set, optional): The OutputFrames to return. Defaults to all of them.
+
+        Returns:
+        AnalysisState: This run's state, whose results are the analyzed frames.
+        """
+        settings = settings or RunSettings.from_args()
+        profiler = profiler or RunProfiler()
+        frames = frozenset(frames or OutputFrame)
+        analysis_key = AnalyzeService.analysis_key(settings, frames)
 
-        if cleaned_df.empty:
-            return {
-                'normalized_data': normalized_df,
-                'cleaned_data': cleaned_df
-            }
+        # The previous frames were built with other filters or frames
+        if previous is None or previous.analysis_key != analysis_key or not unchanged:
+            return AnalysisState(analysis_key, days_array, await AnalyzeService.analyze_data(
+                days_array, settings=settings, profiler=profiler, frames=frames))
 
-        results = {
-            'normalized_data': normalized_df,
-            'cleaned_data': cleaned_df
-        }
+        if len(days_array) == len(previous.days) and all(
+                unchanged.get(position) == position for position in range(len(days_array))):
+            return AnalysisState(analysis_key, days_array, previous.results)
+
+        changed = [position for position in range(len(days_array)) if position not in unchanged]
+        changed_days = [days_array[position] for position in changed]
+        changed_results = await AnalyzeService.analyze_data(
+            changed_days, settings=settings, profiler=profiler, frames=frames) if changed_days else {}
+
+        with profiler.span('splice', label=f'{len(changed)}/{len(days_array)} days analyzed') as span:
+            starts = AnalyzeService._day_starts(days_array)
+            previous_starts = AnalyzeService._day_starts(previous.days)
+            # How far each day's rows move; NaN drops the rows of days that changed
+            previous_shifts = np.full(len(previous.days), np.nan)
+            for position, previous_position in unchanged.items():
+                previous_shifts[previous_position] = starts[position] - previous_starts[previous_position]
+            changed_shifts = starts[changed] - AnalyzeService._day_starts(changed_days)
+
+            results = {}
+            for frame in OutputFrame:
+                parts = []
+                if frame.value in previous.results:
+                    parts.append((previous.results[frame.value], previous.days, previous_shifts))
+                if frame.value in changed_results:
+                    parts.append((changed_results[frame.value], changed_days, changed_shifts))
+                if parts:
+                    results[frame.value] = AnalyzeService._splice(frame, parts)
+            span.rows = sum(len(day.get('events') or []) for day in days_array)
+
+        return AnalysisState(analysis_key, days_array, results)
+
+    @staticmethod
+    def _day_starts(days_array):
+        """
+        Returns:
+        np.ndarray: The event index of each day's first event.
+        """
+        counts = np.array([len(day.get('events') or []) for day in days_array], dtype='int64')
+        return np.cumsum(counts) - counts
+
+    @staticmethod
+    def _splice(frame, parts):
+        """
+        Splice the rows of analyzed frames into the frame a whole analysis
+        returns, in one take.
+
+        Parameters:
+        frame (OutputFrame): The frame being spliced.
+        parts (list): (frame, its days array, shift of each day's rows) tuples.
+            Rows of days whose shift is NaN are dropped.
+
+        Returns:
+        pd.DataFrame: The spliced frame, labelled by event index.
+        """
+        cleaned = frame in (OutputFrame.CLEANED, OutputFrame.FILTERED, OutputFrame.NNFX_FILTERED)
+        local_timezone = AnalyzeService.local_timezone()
+        frames = []
+        labels = []
+        for df, days_array, shifts in parts:
+            if df.empty:
+                continue
+            if cleaned and df['timestamp_local'].dt.tz != local_timezone:
+                # Rows cleaned at another UTC offset would concatenate to plain objects
+                df = df.assign(timestamp_local=df['timestamp_local'].dt.tz_convert(local_timezone))
+            # Rows are labelled with their event index, so each day owns a range of labels
+            old_labels = df.index.to_numpy()
+            ends = AnalyzeService._day_starts(days_array) + [len(day.get('events') or []) for day in days_array]
+            frames.append(df)
+            labels.append(old_labels + shifts[np.searchsorted(ends, old_labels, side='right')])
+        if not frames:
+            return parts[0][0]
+
+        df = pd.concat(frames) if len(frames) > 1 else frames[0]
+        labels = np.concatenate(labels)
+        kept = np.flatnonzero(~np.isnan(labels))
+        if cleaned:
+            # Event order within the same dateline, like the stable sort of sort_events
+            datelines = df['dateline'].to_numpy(dtype='float64', na_value=np.nan)[kept]
+            order = kept[np.lexsort((labels[kept], datelines))]
+        else:
+            order = kept[np.argsort(labels[kept], kind='stable')]
+        df = df.iloc[order].set_axis(labels[order].astype('int64'), copy=False)
+
+        if cleaned:
+            # Frames with different categories concatenate to plain objects
+            for column in AnalyzeService.CATEGORICAL_FIELDS:
+                if not isinstance(df[column].dtype, pd.CategoricalDtype):
+                    df[column] = df[column].astype('category')
+        return df
+
+    @staticmethod
+    def _analyze_partition(days_array, settings, start_index, frames):
+        """
+        Analyze one partition in a pool worker.
+
+        Returns:
+        tuple: (the partition's frames, its StageSpans)
+        """
+        profiler = RunProfiler()
+        results = AnalyzeService.analyze_frames(days_array, settings, profiler, start_index, frames)
+        return results, profiler.spans
+
+    @staticmethod
+    def merge_partitions(partition_results):
+        """
+        Merge the frames of consecutive partitions into the frames an in-process
+        analysis of the whole days array returns.
+
+        Parameters:
+        partition_results (list): The frames of each partition, in calendar order.
+
+        Returns:
+        dict: The merged frames.
+        """
+        def concat(frames):
+            non_empty = [frame for frame in frames if not frame.empty]
+            return pd.concat(non_empty) if non_empty else frames[0]
+
+        results = {}
+        for frame in OutputFrame:
+            frames = [partition[frame.value] for partition in partition_results if frame.value in partition]
+            if frames:
+                results[frame.value] = concat(frames)
+
+        # Partitions are sorted on their own; a stable sort of their concatenation
+        # gives the order of a single sort over all events
+        for frame in (OutputFrame.CLEANED, OutputFrame.FILTERED, OutputFrame.NNFX_FILTERED):
+            if frame.value in results:
+                merged_df = AnalyzeService.sort_events(results[frame.value])
+                # Partitions with different categories concatenate to plain objects
+                for column in AnalyzeService.CATEGORICAL_FIELDS:
+                    merged_df[column] = merged_df[column].astype('category')
+                results[frame.value] = merged_df
+        return results
+
+    @staticmethod
+    def analyze_frames(days_array, settings, profiler, start_index=0, frames=None):
+        """
+        Normalize, clean and filter a days array (synchronous).
+
+        Parameters:
+        days_array (list): The raw data to be analyzed.
+        settings (RunSettings): The run's filters.
+        profiler (RunProfiler): Receives a span per analysis stage.
+        start_index (int): Index of the first event, so partitions analyzed
+            separately get distinct row labels.
+        frames (set, optional): The OutputFrames to return. Defaults to all of them.
+
+        Returns:
+        dict: The analyzed frames.
+        """
+        frames = frames or set(OutputFrame)
+        results = {}
+
+        # Normalize events data. The full normalization, with every nested field,
+        # is only needed for the normalized_data output; otherwise only the
+        # columns clean_data keeps are built
+        full_normalize = OutputFrame.NORMALIZED in frames
+        with profiler.span('normalize', label='json_normalize' if full_normalize else 'columnar') as span:
+            if full_normalize:
+                normalized_df = DataService.normalize_events_data(days_array)
+            else:
+                normalized_df = DataService.build_events_frame(days_array, AnalyzeService.EVENT_FIELDS)
+            if start_index:
+                normalized_df.index += start_index
+            span.rows = len(normalized_df)
+
+        if OutputFrame.NORMALIZED in frames:
+            results['normalized_data'] = normalized_df
+        if normalized_df.empty or not frames & {
+                OutputFrame.CLEANED, OutputFrame.FILTERED, OutputFrame.NNFX_FILTERED}:
+            return results
+
+        # Clean the data frame
+        with profiler.span('clean') as span:
+            cleaned_df = AnalyzeService.clean_data(normalized_df)
+            span.rows = len(cleaned_df)
+        # Release the widest frame early when it is not an output
+        del normalized_df
+
+        if OutputFrame.CLEANED in frames:
+            results['cleaned_data'] = cleaned_df
+        if cleaned_df.empty or not frames & {OutputFrame.FILTERED, OutputFrame.NNFX_FILTERED}:
+            return results
 
         # Filter the data by impact class and currency
-        impact_filters = config.get_impact_filter_list()
-        currency_filters = config.get_currency_filter_list()
+        impact_filters = settings.get_impact_filter_list()
+        currency_filters = settings.get_currency_filter_list()
         if impact_filters and currency_filters:
-            impact_currency_criteria = DataService.criteria_by_impacts_and_currencies(
-                impact_filters, currency_filters)
-            filtered_df = DataService.filter_data(
-                cleaned_df, impact_currency_criteria)
-            results['filtered_data'] = filtered_df
+            with profiler.span('filter') as span:
+                impact_currency_criteria = DataService.criteria_by_impacts_and_currencies(
+                    impact_filters, currency_filters)
+                filtered_df = DataService.filter_data(
+                    cleaned_df, impact_currency_criteria)
+                span.rows = len(filtered_df)
+            if OutputFrame.FILTERED in frames:
+                results['filtered_data'] = filtered_df
         else:
             filtered_df = cleaned_df
 
-        if filtered_df.empty:
+        if filtered_df.empty or OutputFrame.NNFX_FILTERED not in frames:
             return results
 
         # Optionally filter the data if NNFX filters are provided
-        if config.nnfx:
-            nnfx_criteria = DataService.criteria_by_currency_and_keywords(
-                config.nnfx_filters_dict)
-            nnfx_filtered_df = DataService.filter_data(
-                filtered_df, nnfx_criteria)
+        if settings.nnfx:
+            with profiler.span('nnfx_filter') as span:
+                nnfx_filtered_df = DataService.filter_by_currency_keywords(
+                    filtered_df, settings.nnfx_filters)
+                span.rows = len(nnfx_filtered_df)
             results['nnfx_filtered_data'] = nnfx_filtered_df
 
         return results
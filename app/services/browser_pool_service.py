@@ -0,0 +1,206 @@
+import asyncio
+import contextlib
+import logging
+import os
+
+from app.config import Config
+from app.models import SingletonMeta
+
+# Initialize the logger for this module
+logger = logging.getLogger(__name__)
+
+
+class _BrowserSlot:
+    """
+    A launched browser together with its shared context and usage counters.
+    """
+
+    def __init__(self, browser, context):
+        self.browser = browser
+        self.context = context
+        self.navigations = 0
+        self.active_pages = 0
+        self.retired = False
+
+
+class BrowserPoolService(metaclass=SingletonMeta):
+    """
+    Process-wide pool of headless Chromium pages.
+
+    Every Host in the process leases pages from the same browser instead of
+    launching its own. The browser is recycled after a number of navigations
+    or when the browser processes grow past an RSS ceiling.
+    """
+
+    DEFAULT_PAGE_CONCURRENCY = 2
+    DEFAULT_MAX_NAVIGATIONS = 50
+    DEFAULT_MAX_RSS_MB = 1024
+
+    def __init__(self):
+        self.page_concurrency = max(1, Config.get_int(
+            Config.BROWSER_PAGE_CONCURRENCY_KEY, self.DEFAULT_PAGE_CONCURRENCY))
+        self.max_navigations = Config.get_int(
+            Config.BROWSER_MAX_NAVIGATIONS_KEY, self.DEFAULT_MAX_NAVIGATIONS)
+        self.max_rss_mb = Config.get_int(
+            Config.BROWSER_MAX_RSS_MB_KEY, self.DEFAULT_MAX_RSS_MB)
+
+        self._playwright = None
+        self._slot = None
+        self._slots = set()
+        self._loop = None
+        self._semaphore = None
+        self._launch_lock = None
+
+    def _bind_loop(self):
+        """
+        Bind the pool to the running event loop.
+
+        Playwright objects and asyncio primitives belong to the loop that created
+        them, so a new loop (e.g. a second asyncio.run) starts from a clean pool.
+        """
+        loop = asyncio.get_running_loop()
+        if loop is self._loop:
+            return
+        if self._slots:
+            logger.warning(
+                "Browser pool was not shut down on its previous event loop; discarding %d browser(s).",
+                len(self._slots))
+        self._loop = loop
+        self._playwright = None
+        self._slot = None
+        self._slots = set()
+        self._semaphore = asyncio.Semaphore(self.page_concurrency)
+        self._launch_lock = asyncio.Lock()
+
+    async def _acquire_slot(self):
+        async with self._launch_lock:
+            if self._slot is None:
+                if self._playwright is None:
+                    # Imported here so runs that never open a page skip loading Playwright
+                    from playwright.async_api import async_playwright
+                    self._playwright = await async_playwright().start()
+                browser = await self._playwright.chromium.launch(
+                    headless=True, devtools=False, chromium_sandbox=False)
+                context = await browser.new_context(
+                    extra_http_headers=Config.EXTRA_HTTP_HEADERS)
+                self._slot = _BrowserSlot(browser, context)
+                self._slots.add(self._slot)
+                logger.info("Launched pooled Chromium browser (page concurrency: %d).",
+                            self.page_concurrency)
+            return self._slot
+
+    @contextlib.asynccontextmanager
+    async def page(self):
+        """
+        Lease a page from the pooled browser.
+
+        Usage:
+            async with BrowserPoolService().page() as page:
+                await page.goto(url)
+        """
+        self._bind_loop()
+        async with self._semaphore:
+            slot = await self._acquire_slot()
+            slot.active_pages += 1
+            page = None
+            try:
+                page = await slot.context.new_page()
+
+                def count_navigation(frame):
+                    if frame.parent_frame is None:
+                        slot.navigations += 1
+
+                page.on("framenavigated", count_navigation)
+                yield page
+            finally:
+                slot.active_pages -= 1
+                if page is not None:
+                    with contextlib.suppress(Exception):
+                        await page.close()
+                await self._release_slot(slot)
+
+    async def warm_up(self):
+        """
+        Launch the pooled browser ahead of the first page lease.
+
+        Returns:
+        bool: True if a browser is running afterwards.
+        """
+        self._bind_loop()
+        try:
+            await self._acquire_slot()
+            return True
+        except Exception as e:
+            logger.warning("Could not launch the pooled browser ahead of time: %s", e)
+            return False
+
+    async def _release_slot(self, slot):
+        if not slot.retired:
+            rss_mb = self._browser_rss_mb() if self.max_rss_mb > 0 else None
+            if self.max_navigations > 0 and slot.navigations >= self.max_navigations:
+                logger.info("Recycling browser after %d navigations.", slot.navigations)
+                slot.retired = True
+            elif rss_mb is not None and rss_mb >= self.max_rss_mb:
+                logger.info("Recycling browser at %.1f MB RSS (ceiling %d MB).",
+                            rss_mb, self.max_rss_mb)
+                slot.retired = True
+            if slot.retired and self._slot is slot:
+                self._slot = None
+
+        if slot.retired and slot.active_pages == 0:
+            await self._close_slot(slot)
+
+    async def _close_slot(self, slot):
+        self._slots.discard(slot)
+        with contextlib.suppress(Exception):
+            await slot.context.close()
+        with contextlib.suppress(Exception):
+            await slot.browser.close()
+
+    async def shutdown(self):
+        """
+        Close every pooled browser and stop Playwright.
+        """
+        if self._loop is None or self._loop is not asyncio.get_running_loop():
+            return
+        for slot in list(self._slots):
+            await self._close_slot(slot)
+        self._slot = None
+        if self._playwright is not None:
+            with contextlib.suppress(Exception):
+                await self._playwright.stop()
+            self._playwright = None
+            logger.info("Browser pool shut down.")
+
+    @staticmethod
+    def _browser_rss_mb():
+        """
+        Sum the resident memory of every descendant process (the Playwright
+        driver and the browsers it spawned).
+
+        Returns:
+        float: RSS in megabytes, or None when /proc is not available.
+        """
+        if not os.path.isdir('/proc'):
+            return None
+        children = {}
+        rss_pages = {}
+        for pid in os.listdir('/proc'):
+            if not pid.isdigit():
+                continue
+            try:
+                with open(f'/proc/{pid}/stat', 'r', encoding='utf-8') as stat_file:
+                    # The command name may contain spaces, so split after its closing paren
+                    fields = stat_file.read().rsplit(')', 1)[1].split()
+            except (OSError, IndexError):
+                continue
+            children.setdefault(int(fields[1]), []).append(int(pid))
+            rss_pages[int(pid)] = int(fields[21])
+
+        total_pages = 0
+        pending = list(children.get(os.getpid(), []))
+        while pending:
+            pid = pending.pop()
+            total_pages += rss_pages.get(pid, 0)
+            pending.extend(children.get(pid, []))
+        return total_pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
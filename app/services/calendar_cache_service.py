@@ -0,0 +1,185 @@
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+from urllib.parse import urlparse
+from zoneinfo import ZoneInfo
+
+import aiofiles
+
+from app.config import Config
+from app.helpers.constants import CALENDAR_TIMEZONE
+from app.models import SingletonMeta
+
+# Initialize the logger for this module
+logger = logging.getLogger(__name__)
+
+
+class CalendarCacheService(metaclass=SingletonMeta):
+    """
+    Persistent cache of raw days arrays, keyed by the resolved date range.
+
+    Entries fetched after their range ended, in the calendar's timezone, never
+    expire. Other entries expire after CALENDAR_CACHE_TTL_SECONDS, optionally
+    serving the stale copy while a background fetch refreshes it.
+    """
+
+    DEFAULT_TTL_SECONDS = 300
+
+    HIT = 'hit'
+    STALE = 'stale'
+    MISS = 'miss'
+
+    def __init__(self):
+        self.cache_dir = Config.get(Config.CALENDAR_CACHE_DIR_KEY)
+        self.enabled = bool(self.cache_dir)
+        self.ttl_seconds = Config.get_int(
+            Config.CALENDAR_CACHE_TTL_SECONDS_KEY, self.DEFAULT_TTL_SECONDS)
+        self.stale_while_revalidate = Config.get_bool(
+            Config.CALENDAR_CACHE_STALE_WHILE_REVALIDATE_KEY, False)
+        self.metrics = {self.HIT: 0, self.STALE: 0, self.MISS: 0, 'refreshes': 0}
+
+        self._loop = None
+        self._locks = {}
+        self._refreshes = set()
+
+    def _bind_loop(self):
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._locks = {}
+            self._refreshes = set()
+
+    @staticmethod
+    def make_key(url, start, end, variant=None):
+        """
+        Build the cache key for a resolved date range on the calendar site.
+
+        Parameters:
+        url (str): Any calendar URL of the site, used to keep sites apart.
+        start (date): First day of the range.
+        end (date): Last day of the range.
+        variant (str, optional): Distinguishes payload shapes of the same range.
+
+        Returns:
+        str: The cache key, safe to use as a file name.
+        """
+        host = (urlparse(url).hostname or 'calendar').replace(':', '_')
+        key = f'{host}_{start:%Y-%m-%d}_{end:%Y-%m-%d}'
+        return f'{key}_{variant}' if variant else key
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f'{key}.json')
+
+    @staticmethod
+    def _range_closed_at(end):
+        """
+        Unix timestamp of the midnight that ends the range in the calendar's timezone.
+        """
+        return datetime.combine(end + timedelta(days=1), datetime.min.time(),
+                                ZoneInfo(CALENDAR_TIMEZONE)).timestamp()
+
+    def _ttl_for(self, end, fetched_at):
+        """
+        An entry fetched after its range ended holds the final data of a past
+        range, so it never expires. An entry fetched while the range was still
+        open, even if the range has ended since, expires after the TTL.
+        """
+        if fetched_at >= self._range_closed_at(end):
+            return None
+        return self.ttl_seconds
+
+    async def _read(self, key):
+        try:
+            async with aiofiles.open(self._path(key), 'r', encoding='utf-8') as cache_file:
+                return json.loads(await cache_file.read())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable cache entry %s: %s", key, e)
+            return None
+
+    async def _write(self, key, start, end, days_array):
+        """
+        Write an entry atomically so concurrent readers never see a partial file.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        entry = {
+            'fetched_at': time.time(),
+            'start': start.isoformat(),
+            'end': end.isoformat(),
+            'days': days_array,
+        }
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=f'.{key}.', suffix='.tmp')
+        os.close(fd)
+        try:
+            async with aiofiles.open(temp_path, 'w', encoding='utf-8') as cache_file:
+                await cache_file.write(json.dumps(entry))
+            os.replace(temp_path, self._path(key))
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    async def _fetch_and_store(self, key, start, end, fetch):
+        days_array = await fetch()
+        if days_array:
+            try:
+                await self._write(key, start, end, days_array)
+            except Exception as e:
+                logger.error("Failed to write cache entry %s: %s", key, e)
+        return days_array
+
+    async def _refresh(self, key, start, end, fetch):
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            try:
+                await self._fetch_and_store(key, start, end, fetch)
+                self.metrics['refreshes'] += 1
+            except Exception as e:
+                logger.error("Background refresh of %s failed: %s", key, e)
+
+    async def get_or_fetch(self, key, start, end, fetch):
+        """
+        Return the cached days array for a range, fetching and storing it when needed.
+
+        Parameters:
+        key (str): The cache key, see make_key.
+        start (date): First day of the range.
+        end (date): Last day of the range.
+        fetch (callable): Coroutine function returning a fresh days array.
+
+        Returns:
+        tuple: (days_array, status) where status is 'hit', 'stale' or 'miss'.
+        """
+        if not self.enabled:
+            return await fetch(), self.MISS
+
+        self._bind_loop()
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            entry = await self._read(key)
+            if entry is not None:
+                fetched_at = entry.get('fetched_at', 0)
+                ttl = self._ttl_for(end, fetched_at)
+                age = time.time() - fetched_at
+                if ttl is None or age <= ttl:
+                    self.metrics[self.HIT] += 1
+                    return entry['days'], self.HIT
+                if self.stale_while_revalidate:
+                    self.metrics[self.STALE] += 1
+                    refresh = asyncio.create_task(self._refresh(key, start, end, fetch))
+                    self._refreshes.add(refresh)
+                    refresh.add_done_callback(self._refreshes.discard)
+                    return entry['days'], self.STALE
+
+            self.metrics[self.MISS] += 1
+            return await self._fetch_and_store(key, start, end, fetch), self.MISS
+
+    async def wait_for_refreshes(self):
+        """
+        Wait for background stale-while-revalidate refreshes started on this loop.
+        """
+        if self._loop is not None and self._loop is asyncio.get_running_loop() and self._refreshes:
+            await asyncio.gather(*list(self._refreshes), return_exceptions=True)
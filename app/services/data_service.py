@@ -1,5 +1,10 @@
+import math
+
 import pandas as pd
 
+from app.helpers.keyword_matcher import KeywordMatcher
+from app.models.calendar_fields import CalendarFields
+
 
 class DataService:
     @staticmethod
@@ -33,6 +38,41 @@ class DataService:
                                'date'], meta_prefix='meta_')
         return df
 
+    @staticmethod
+    def build_events_frame(days_array, fields=None):
+        """
+        Build the events DataFrame for selected fields only, without the full
+        normalization. Walks the days array once and fills one pre-sized list
+        per column.
+
+        Gives the same columns, values and dtypes as normalize_events_data
+        followed by selecting 'meta_date' and the fields; fields missing from an
+        event are NaN.
+
+        Parameters:
+        days_array (list): List of days, each with its 'events'.
+        fields (list, optional): Event fields to keep. Defaults to CalendarFields.EVENT_FIELDS.
+
+        Returns:
+        pd.DataFrame: One row per event with 'meta_date' and the fields as columns.
+        """
+        fields = fields or CalendarFields.EVENT_FIELDS
+        event_count = sum(len(day.get('events') or []) for day in days_array)
+        columns = {field: [math.nan] * event_count for field in fields}
+        meta_dates = [math.nan] * event_count
+
+        row = 0
+        for day in days_array:
+            meta_date = day.get('date', math.nan)
+            for event in day.get('events') or []:
+                meta_dates[row] = meta_date
+                for field, column in columns.items():
+                    if field in event:
+                        column[row] = event[field]
+                row += 1
+
+        return pd.DataFrame({'meta_date': meta_dates, **columns})
+
     # Define the function to filter data based on impacts and/or currencies
     @staticmethod
     def criteria_by_impacts_and_currenciess(df, impacts=None, currencies=None):
@@ -77,6 +117,26 @@ class DataService:
 
         return criteria
 
+    @staticmethod
+    def filter_by_currency_keywords(data, filters):
+        """
+        Keep the events whose name contains one of the keywords listed for their currency.
+
+        Parameters:
+        data (pd.DataFrame): The events, with 'currency' and 'name' columns.
+        filters (Mapping): Currencies as keys and lists of keywords as values.
+            Keywords are matched literally and case-insensitively.
+
+        Returns:
+        pd.DataFrame: The matching events, with the keyword that matched in a
+            'matched_keyword' column.
+        """
+        matched = KeywordMatcher.for_filters(filters).match(data)
+        mask = matched.notna()
+        filtered_df = data[mask].copy()
+        filtered_df['matched_keyword'] = matched[mask]
+        return filtered_df
+
     @staticmethod
     def criteria_by_currency_and_keywords(filters):
         """
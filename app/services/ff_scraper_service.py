@@ -1,57 +1,400 @@
 import asyncio
+import json
 import logging
-
-from playwright.async_api import TimeoutError as PlaywrightTimeoutError
-from playwright.async_api import async_playwright
+import os
+import time
+from urllib.parse import urlparse
 
 from app.config import Config
+from app.helpers import CalendarMarkupError, LatencyHistory
+from app.models.calendar_fetch_error import CalendarFetchError
+from app.models.calendar_fields import CalendarFields
+from app.models.fetch_engine import FetchEngine
+from app.models.fetch_metrics import FetchMetrics
+from app.models.fetch_mode import FetchMode
+from app.services.browser_pool_service import BrowserPoolService
+from app.services.fixture_archive_service import FixtureArchiveService
+from app.services.http_calendar_service import HttpCalendarService
+from app.services.single_flight_service import SingleFlightService
 
 
 class ForexFactoryScraperService:
 
-    def __init__(self, url):
+    DEFAULT_BLOCKED_RESOURCE_TYPES = ['image', 'font', 'stylesheet', 'media']
+    DEFAULT_DATA_READY_TIMEOUT_MS = 30000
+    DEFAULT_FETCH_DEADLINE_SECONDS = 90
+    DEFAULT_HEDGE_PERCENTILE = 95
+    DEFAULT_HEDGE_DELAY_MS = 15000
+    HEDGE_MIN_SAMPLES = 5
+    DATA_READY_PREDICATE = '''() => typeof window.calendarComponentStates !== 'undefined'
+        && typeof window.calendarComponentStates[1] !== 'undefined' '''
+
+    # Project the days in the page and hand them over as a single JSON string,
+    # which crosses the CDP bridge far cheaper than a deep object graph
+    EXTRACT_DAYS_SCRIPT = '''([dayFields, eventFields, fullPayload]) => {
+        if (typeof window.calendarComponentStates === 'undefined') { return null }
+        const days = window.calendarComponentStates[1]?.days || [];
+        if (fullPayload) { return JSON.stringify(days) }
+        const pick = (source, fields) => {
+            const picked = {};
+            for (const field of fields) {
+                if (field in source) { picked[field] = source[field] }
+            }
+            return picked;
+        };
+        return JSON.stringify(days.map(day => {
+            const projected = pick(day, dayFields);
+            projected.events = (day.events || []).map(event => pick(event, eventFields));
+            return projected;
+        }));
+    }'''
+
+    # Latencies of recent successful live fetches per engine, shared by every scraper
+    _latency_history = {}
+
+    def __init__(self, url, engine=FetchEngine.PLAYWRIGHT, fetch_mode=FetchMode.LIVE, fixtures_dir=None,
+                 full_payload=False):
         self.url = url
+        self.engine = engine or FetchEngine.PLAYWRIGHT
+        self.full_payload = full_payload
+        self.fetch_mode = fetch_mode or FetchMode.LIVE
+        self.archive = FixtureArchiveService(fixtures_dir) if fixtures_dir else None
+        if self.fetch_mode != FetchMode.LIVE and self.archive is None:
+            raise ValueError(
+                f"A fixtures directory is required for fetch mode '{FetchMode.to_text(self.fetch_mode)}'")
+        self.last_fetch_metrics = None
         self.logger = logging.getLogger(__name__)
         self.logger.debug(self.url)
 
+        self.blocked_resource_types = set(Config.get_list(
+            Config.BLOCKED_RESOURCE_TYPES_KEY, self.DEFAULT_BLOCKED_RESOURCE_TYPES))
+        self.block_third_party = Config.get_bool(Config.BLOCK_THIRD_PARTY_KEY, True)
+        self.data_ready_timeout_ms = Config.get_int(
+            Config.DATA_READY_TIMEOUT_MS_KEY, self.DEFAULT_DATA_READY_TIMEOUT_MS)
+        self.deadline_seconds = Config.get_int(
+            Config.FETCH_DEADLINE_SECONDS_KEY, self.DEFAULT_FETCH_DEADLINE_SECONDS)
+        self.hedge_enabled = Config.get_bool(Config.FETCH_HEDGE_ENABLED_KEY, True)
+        self.hedge_percentile = Config.get_int(
+            Config.FETCH_HEDGE_PERCENTILE_KEY, self.DEFAULT_HEDGE_PERCENTILE)
+        self.hedge_delay_ms = Config.get_int(
+            Config.FETCH_HEDGE_DELAY_MS_KEY, self.DEFAULT_HEDGE_DELAY_MS)
+
     def get_calendar(self):
-        return asyncio.run(self.get_calendar_async())
+        async def fetch_and_shutdown():
+            try:
+                return await self.get_calendar_async()
+            finally:
+                await BrowserPoolService().shutdown()
+
+        return asyncio.run(fetch_and_shutdown())
 
     async def get_calendar_async(self):
-        return await self._fetch_calendar(self.url)
+        days_array, self.last_fetch_metrics = await self._fetch_days(self.url)
+        return days_array
+
+    async def get_calendar_sharded_async(self, shard_urls, concurrency=1, retries=0):
+        """
+        Fetch several calendar URLs concurrently and merge them into one days array.
+
+        A shard that comes back empty or fails is retried on its own; the other
+        shards are not refetched.
+
+        Parameters:
+        shard_urls (list): Calendar URLs, one per shard, in chronological order.
+        concurrency (int): Maximum number of shards fetched at the same time.
+        retries (int): Extra attempts per shard before giving up.
+
+        Returns:
+        list: The merged days array, ordered by day and de-duplicated.
+
+        Raises:
+        CalendarFetchError: If a shard still has no data after all retries.
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        started = time.perf_counter()
+
+        async def fetch_shard(shard_url):
+            attempts = retries + 1
+            for attempt in range(1, attempts + 1):
+                try:
+                    async with semaphore:
+                        return await self._fetch_days(shard_url)
+                except CalendarFetchError as e:
+                    self.logger.warning("Shard %s failed (attempt %d/%d): %s",
+                                        shard_url, attempt, attempts, e)
+            raise CalendarFetchError(
+                f'No calendar data after {attempts} attempts', url=shard_url)
+
+        results = await asyncio.gather(*(fetch_shard(shard_url) for shard_url in shard_urls))
+
+        merged_metrics = FetchMetrics(
+            url=self.url, engine=FetchEngine.to_text(self.engine))
+        merged_metrics.attempts = 0
+        for _, metrics in results:
+            merged_metrics.bytes_transferred += metrics.bytes_transferred
+            merged_metrics.blocked_requests += metrics.blocked_requests
+            merged_metrics.attempts += metrics.attempts
+            merged_metrics.hedge_wins += metrics.hedge_wins
+            if metrics.time_to_first_byte_ms is not None:
+                merged_metrics.time_to_first_byte_ms = max(
+                    merged_metrics.time_to_first_byte_ms or 0, metrics.time_to_first_byte_ms)
+        merged_metrics.time_to_data_ms = (time.perf_counter() - started) * 1000
+        self.last_fetch_metrics = merged_metrics
+
+        return self.merge_days([days_array for days_array, _ in results])
+
+    @staticmethod
+    def merge_days(days_arrays):
+        """
+        Merge days arrays from several shards into one, keeping the first copy of each day.
+
+        Parameters:
+        days_arrays (list): Days arrays in chronological shard order.
+
+        Returns:
+        list: The merged days array, sorted by dateline when every day has one.
+        """
+        merged = {}
+        for days_array in days_arrays:
+            for day in days_array:
+                day_key = day.get('dateline') or day.get('date')
+                if day_key not in merged:
+                    merged[day_key] = day
+
+        days = list(merged.values())
+        if all(isinstance(day.get('dateline'), (int, float)) for day in days):
+            days.sort(key=lambda day: day['dateline'])
+        return days
+
+    async def _fetch_days(self, url):
+        """
+        Fetch one calendar URL, sharing the fetch with any concurrent caller
+        that asks for the same URL, engine, fixtures and payload shape.
+
+        Returns:
+        tuple: (days_array, FetchMetrics)
+        """
+        # The fixtures only matter when recording or replaying
+        fixtures_dir = (os.path.abspath(self.archive.fixtures_dir)
+                        if self.fetch_mode != FetchMode.LIVE else None)
+        flight_key = (url, self.engine, self.fetch_mode, fixtures_dir, self.full_payload)
+        return await SingleFlightService().do(flight_key, lambda: self._fetch_days_uncoalesced(url))
+
+    async def _fetch_days_uncoalesced(self, url):
+        """
+        Fetch one calendar URL with the configured engine, or replay it from
+        the fixture archive. In record mode the result is archived as well.
+
+        Returns:
+        tuple: (days_array, FetchMetrics)
+
+        Raises:
+        CalendarFetchError: If no calendar data arrives before the deadline.
+        """
+        if self.fetch_mode == FetchMode.REPLAY:
+            return await self._replay_days(url)
+
+        days_array, metrics = await self._fetch_hedged(url)
+
+        if self.fetch_mode == FetchMode.RECORD:
+            await self.archive.save_days_async(url, days_array)
+        return days_array, metrics
+
+    def _hedge_delay_seconds(self):
+        """
+        How long the first attempt may run before a hedged attempt is started:
+        the configured percentile of recent latencies, or FETCH_HEDGE_DELAY_MS
+        until enough fetches have been seen.
+        """
+        history = self._latency_history.get(self.engine)
+        if history is not None and len(history) >= self.HEDGE_MIN_SAMPLES:
+            return history.percentile(self.hedge_percentile) / 1000
+        return self.hedge_delay_ms / 1000
+
+    async def _fetch_hedged(self, url):
+        """
+        Fetch one calendar URL within the fetch deadline.
+
+        When the first attempt is slower than the hedge delay, or fails early,
+        a second attempt is started on a fresh page and the first one to return
+        data wins. The other attempt is cancelled.
+
+        Returns:
+        tuple: (days_array, FetchMetrics) of the winning attempt.
+
+        Raises:
+        CalendarFetchError: If no attempt returns data before the deadline.
+        """
+        started = time.perf_counter()
+        deadline = started + self.deadline_seconds
+        hedge_at = started + self._hedge_delay_seconds()
+        max_attempts = 2 if self.hedge_enabled else 1
+
+        attempts = [asyncio.create_task(self._fetch_attempt(url))]
+        pending = set(attempts)
+        last_error = None
+        try:
+            while True:
+                now = time.perf_counter()
+                if now >= deadline:
+                    raise CalendarFetchError(
+                        f'No calendar data within the {self.deadline_seconds}s fetch deadline', url=url)
+
+                can_hedge = len(attempts) < max_attempts
+                if can_hedge and (not pending or now >= hedge_at):
+                    self.logger.warning("Calendar fetch of %s is slow or failed after %.0f ms. Starting a hedged attempt.",
+                                        url, (now - started) * 1000)
+                    attempts.append(asyncio.create_task(self._fetch_attempt(url)))
+                    pending.add(attempts[-1])
+                    continue
+                if not pending:
+                    raise last_error
+
+                wait_until = min(deadline, hedge_at) if can_hedge else deadline
+                done, pending = await asyncio.wait(
+                    pending, timeout=max(0, wait_until - now), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    try:
+                        days_array, metrics, latency_ms = task.result()
+                    except CalendarFetchError as e:
+                        self.logger.warning("Calendar fetch attempt failed: %s", e)
+                        last_error = e
+                        continue
+
+                    self._latency_history.setdefault(self.engine, LatencyHistory()).add(latency_ms)
+                    metrics.attempts = len(attempts)
+                    metrics.hedge_wins = 1 if task is not attempts[0] else 0
+                    return days_array, metrics
+        finally:
+            for task in attempts:
+                task.cancel()
+            await asyncio.gather(*attempts, return_exceptions=True)
+
+    async def _fetch_attempt(self, url):
+        """
+        Make one live attempt at a calendar URL with the configured engine.
+
+        Returns:
+        tuple: (days_array, FetchMetrics, latency in milliseconds)
+
+        Raises:
+        CalendarFetchError: If the attempt fails or the calendar has no days.
+        """
+        started = time.perf_counter()
+        days_array, metrics = None, None
+        if self.engine == FetchEngine.HTTP:
+            from requests import RequestException
+            metrics = FetchMetrics(url=url, engine=FetchEngine.to_text(FetchEngine.HTTP))
+            try:
+                days_array = await HttpCalendarService().fetch_days_async(
+                    url, metrics,
+                    on_page=self.archive.save_page_async if self.fetch_mode == FetchMode.RECORD else None)
+                if not self.full_payload:
+                    days_array = CalendarFields.project_days(days_array)
+            except (RequestException, CalendarMarkupError) as e:
+                self.logger.warning(
+                    "HTTP fetch failed (%s). Falling back to Playwright.", e)
+        if days_array is None:
+            days_array, metrics = await self._fetch_calendar(url)
+
+        if not days_array:
+            raise CalendarFetchError('The calendar page contained no days', url=url)
+        return days_array, metrics, (time.perf_counter() - started) * 1000
+
+    async def _replay_days(self, url):
+        """
+        Serve a recorded days array without touching the network.
+
+        Raises:
+        CalendarFetchError: If no fixture was recorded for the URL.
+        """
+        metrics = FetchMetrics(url=url, engine=FetchMode.to_text(FetchMode.REPLAY))
+        started = time.perf_counter()
+        days_array = await self.archive.load_days_async(url)
+        if days_array is None:
+            raise CalendarFetchError(
+                f'No recorded fixture at {self.archive.days_path(url)}', url=url)
+        metrics.time_to_data_ms = (time.perf_counter() - started) * 1000
+        return days_array, metrics
+
+    @staticmethod
+    def _is_first_party(request_url, site_domain):
+        host = urlparse(request_url).hostname or ''
+        return host == site_domain or host.endswith('.' + site_domain)
+
+    async def _route_request(self, route, site_domain, metrics):
+        """
+        Abort requests the calendar data does not depend on.
+
+        The calendar state is assigned by an inline script in the document, so
+        images, fonts, stylesheets, media and third-party hosts can be dropped.
+        """
+        request = route.request
+        if request.is_navigation_request() and request.frame.parent_frame is None:
+            await route.continue_()
+            return
+        if request.resource_type in self.blocked_resource_types or (
+                self.block_third_party and not self._is_first_party(request.url, site_domain)):
+            metrics.blocked_requests += 1
+            await route.abort()
+            return
+        await route.continue_()
 
     async def _fetch_calendar(self, url):
+        """
+        Fetch one calendar URL in a pooled browser page.
+
+        Returns:
+        tuple: (days_array, FetchMetrics)
+
+        Raises:
+        CalendarFetchError: If the page fails to load or never publishes the calendar state.
+        """
+        # Imported here so runs on the HTTP engine skip loading Playwright
+        from playwright.async_api import Error as PlaywrightError
+        from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
         days_array = []
+        metrics = FetchMetrics(url=url, engine=FetchEngine.to_text(FetchEngine.PLAYWRIGHT))
+        site_domain = (urlparse(url).hostname or '').removeprefix('www.')
+
+        async def count_bytes(request):
+            try:
+                sizes = await request.sizes()
+                metrics.bytes_transferred += sizes['responseHeadersSize'] + sizes['responseBodySize']
+            except Exception:
+                pass
+
         try:
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(
-                    headless=True, devtools=False, chromium_sandbox=False)
-                context = await browser.new_context()
-                page = await context.new_page()
+            async with BrowserPoolService().page() as page:
+                await page.route(
+                    "**/*", lambda route: self._route_request(route, site_domain, metrics))
+                page.on("requestfinished", count_bytes)
 
-                await page.set_extra_http_headers(Config.EXTRA_HTTP_HEADERS)
-                await page.goto(url, wait_until="domcontentloaded")
+                started = time.perf_counter()
+                # "commit" resolves as soon as the response starts arriving
+                await page.goto(url, wait_until="commit")
+                metrics.time_to_first_byte_ms = (time.perf_counter() - started) * 1000
 
-                # Add your scraping logic here using selectors or other methods
-                try:
-                    # Extract the calendar days state and array if they exist
-                    data = await page.evaluate('''() => {
-                        if (typeof window.calendarComponentStates === 'undefined') { return null }
-                        const states = window.calendarComponentStates;
-                        const daysArray = states[1]?.days || [];
-                        return { states, daysArray };
-                    }''')
-
-                    if data and 'daysArray' in data:
-                        days_array = data.get('daysArray')
-
-                except PlaywrightTimeoutError as e:
-                    dd = f'Failed to load the calendar: {str(e)}'
-                    logging.error(dd)
-
-                # await page.wait_for_timeout(30000)  # in milliseconds
-        except Exception as e:
-            dd = f'An error occurred: {str(e)}'
-            self.logger.error(dd)
+                # Wait for the inline script to publish the calendar state
+                await page.wait_for_function(
+                    self.DATA_READY_PREDICATE, timeout=self.data_ready_timeout_ms)
+                metrics.time_to_data_ms = (time.perf_counter() - started) * 1000
 
-        return days_array
+                # Extract the calendar days array if it exists
+                payload = await page.evaluate(
+                    self.EXTRACT_DAYS_SCRIPT,
+                    [CalendarFields.DAY_FIELDS, CalendarFields.EVENT_FIELDS, self.full_payload])
+
+                if payload:
+                    days_array = json.loads(payload)
+
+                if self.fetch_mode == FetchMode.RECORD:
+                    await self.archive.save_page_async(url, await page.content())
+
+        except PlaywrightTimeoutError as e:
+            raise CalendarFetchError(f'Failed to load the calendar: {e}', url=url) from e
+        except PlaywrightError as e:
+            raise CalendarFetchError(f'Browser error: {e}', url=url) from e
+
+        return days_array, metrics
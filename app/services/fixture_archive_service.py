@@ -0,0 +1,103 @@
+import json
+import logging
+import os
+import re
+from urllib.parse import urlsplit
+
+import aiofiles
+
+# Initialize the logger for this module
+logger = logging.getLogger(__name__)
+
+
+class FixtureArchiveService:
+    """
+    Directory of recorded calendar pages and their extracted days arrays.
+
+    Fixtures are keyed by the URL path and query only, so pages recorded from
+    the live site can be replayed against any BASE_URL, including the local
+    stand-in server.
+    """
+
+    def __init__(self, fixtures_dir):
+        self.fixtures_dir = fixtures_dir
+
+    @staticmethod
+    def key_for(url):
+        """
+        Build the fixture key for a calendar URL or path.
+
+        Parameters:
+        url (str): Full URL or path with query, e.g. '/calendar?week=this'.
+
+        Returns:
+        str: A file-name safe key, e.g. 'calendar_week=this'.
+        """
+        parts = urlsplit(url)
+        raw_key = parts.path.strip('/') or 'index'
+        if parts.query:
+            raw_key = f'{raw_key}_{parts.query}'
+        return re.sub(r'[^A-Za-z0-9._=-]+', '_', raw_key)
+
+    def page_path(self, url):
+        return os.path.join(self.fixtures_dir, f'{self.key_for(url)}.html')
+
+    def days_path(self, url):
+        return os.path.join(self.fixtures_dir, f'{self.key_for(url)}.json')
+
+    async def _write(self, file_path, content):
+        os.makedirs(self.fixtures_dir, exist_ok=True)
+        async with aiofiles.open(file_path, 'w', encoding='utf-8') as fixture_file:
+            await fixture_file.write(content)
+        logger.info("Recorded fixture %s", file_path)
+
+    async def save_page_async(self, url, html):
+        """
+        Record the calendar page HTML for a URL.
+        """
+        await self._write(self.page_path(url), html)
+
+    async def save_days_async(self, url, days_array):
+        """
+        Record the extracted days array for a URL.
+        """
+        await self._write(self.days_path(url), json.dumps(days_array, indent=4))
+
+    def load_page(self, url):
+        """
+        Load the recorded page HTML for a URL (synchronous).
+
+        Returns:
+        str: The page HTML, or None if it was not recorded.
+        """
+        try:
+            with open(self.page_path(url), 'r', encoding='utf-8') as fixture_file:
+                return fixture_file.read()
+        except FileNotFoundError:
+            return None
+
+    def load_days(self, url):
+        """
+        Load the recorded days array for a URL (synchronous).
+
+        Returns:
+        list: The days array, or None if it was not recorded.
+        """
+        try:
+            with open(self.days_path(url), 'r', encoding='utf-8') as fixture_file:
+                return json.load(fixture_file)
+        except FileNotFoundError:
+            return None
+
+    async def load_days_async(self, url):
+        """
+        Load the recorded days array for a URL.
+
+        Returns:
+        list: The days array, or None if it was not recorded.
+        """
+        try:
+            async with aiofiles.open(self.days_path(url), 'r', encoding='utf-8') as fixture_file:
+                return json.loads(await fixture_file.read())
+        except FileNotFoundError:
+            return None
@@ -0,0 +1,96 @@
+import asyncio
+import logging
+import time
+
+from app.config import Config
+from app.helpers import CalendarStateParser
+from app.models import SingletonMeta
+
+# Initialize the logger for this module
+logger = logging.getLogger(__name__)
+
+
+class HttpCalendarService(metaclass=SingletonMeta):
+    """
+    Browserless calendar fetcher.
+
+    Downloads the calendar HTML over a pooled HTTP session and parses the
+    days array straight out of the inline calendarComponentStates script.
+    """
+
+    DEFAULT_POOL_SIZE = 4
+    DEFAULT_TIMEOUT_SECONDS = 30
+
+    def __init__(self):
+        # Imported here so runs on the Playwright engine skip loading requests
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        pool_size = max(1, Config.get_int(Config.HTTP_POOL_SIZE_KEY, self.DEFAULT_POOL_SIZE))
+        self.timeout = Config.get_int(
+            Config.HTTP_TIMEOUT_SECONDS_KEY, self.DEFAULT_TIMEOUT_SECONDS)
+
+        self.session = requests.Session()
+        self.session.headers.update(Config.EXTRA_HTTP_HEADERS)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def fetch_page(self, url):
+        """
+        Download the calendar page (synchronous).
+
+        Parameters:
+        url (str): The calendar URL.
+
+        Returns:
+        requests.Response: The successful response.
+        """
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        return response
+
+    async def fetch_page_async(self, url, metrics=None):
+        """
+        Download the calendar page and record its size and timing.
+
+        Parameters:
+        url (str): The calendar URL.
+        metrics (FetchMetrics, optional): Receives bytes transferred, time-to-first-byte
+            and time-to-data.
+
+        Returns:
+        str: The page HTML.
+        """
+        started = time.perf_counter()
+        response = await asyncio.to_thread(self.fetch_page, url)
+        if metrics is not None:
+            metrics.bytes_transferred = len(response.content)
+            # requests stops the elapsed clock once the response headers are parsed
+            metrics.time_to_first_byte_ms = response.elapsed.total_seconds() * 1000
+            metrics.time_to_data_ms = (time.perf_counter() - started) * 1000
+        return response.text
+
+    async def fetch_days_async(self, url, metrics=None, on_page=None):
+        """
+        Download the calendar page and extract its days array.
+
+        Parameters:
+        url (str): The calendar URL.
+        metrics (FetchMetrics, optional): Receives bytes transferred and time-to-data.
+        on_page (callable, optional): Coroutine function called with the URL and
+            the page HTML once its days array parsed, e.g. to record the page.
+
+        Returns:
+        list: The days array.
+
+        Raises:
+        requests.RequestException: If the page cannot be downloaded.
+        CalendarMarkupError: If the page does not contain a parsable calendar state.
+        """
+        html = await self.fetch_page_async(url, metrics)
+        days_array = CalendarStateParser.extract_days(html)
+        logger.info("Extracted %d days from calendar HTML without a browser.", len(days_array))
+        if on_page is not None:
+            await on_page(url, html)
+        return days_array
@@ -36,8 +36,9 @@ class OutputService:
         encoding (str): The encoding format.
         """
         try:
+            content = await asyncio.to_thread(json.dumps, data, indent=4)
             async with aiofiles.open(file_path, 'w', encoding=encoding) as json_file:
-                await json_file.write(json.dumps(data, indent=4))
+                await json_file.write(content)
             logger.info("Successfully wrote JSON data to %s", file_path)
         except Exception as e:
             logger.error("Error writing JSON to file: %s", e)
@@ -66,8 +67,7 @@ class OutputService:
         encoding (str): The encoding format.
         """
         try:
-            df = pd.DataFrame(json_data)
-            html_content = df.to_html()
+            html_content = await asyncio.to_thread(lambda: pd.DataFrame(json_data).to_html())
             async with aiofiles.open(file_path, 'w', encoding=encoding) as html_file:
                 await html_file.write(html_content)
             logger.info(
@@ -99,7 +99,7 @@ class OutputService:
         encoding (str): The encoding format.
         """
         try:
-            html_content = dataframe.to_html()
+            html_content = await asyncio.to_thread(dataframe.to_html)
             async with aiofiles.open(file_path, 'w', encoding=encoding) as html_file:
                 await html_file.write(html_content)
             logger.info(
@@ -107,6 +107,21 @@ class OutputService:
         except Exception as e:
             logger.error("Error generating HTML report from DataFrame: %s", e)
 
+    @staticmethod
+    def dataframe_to_json(dataframe):
+        """
+        Serialize a pandas DataFrame to a JSON array of records. CPU bound, so the
+        async writers run it in a worker thread to keep the event loop free.
+
+        Parameters:
+        dataframe (pd.DataFrame): DataFrame to be serialized.
+
+        Returns:
+        str: The JSON text.
+        """
+        data = dataframe.to_dict(orient='records')
+        return json.dumps(data, indent=4, cls=DateTimeJSONEncoder)
+
     @staticmethod
     def write_dataframe_to_json(dataframe, file_path, encoding='utf-8'):
         """
@@ -131,9 +146,9 @@ class OutputService:
         encoding (str): The encoding format.
         """
         try:
-            data = dataframe.to_dict(orient='records')
+            content = await asyncio.to_thread(OutputService.dataframe_to_json, dataframe)
             async with aiofiles.open(file_path, 'w', encoding=encoding) as json_file:
-                await json_file.write(json.dumps(data, indent=4, cls=DateTimeJSONEncoder))
+                await json_file.write(content)
             logger.info(
                 "Successfully wrote DataFrame to JSON file %s", file_path)
         except Exception as e:
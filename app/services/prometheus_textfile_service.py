@@ -0,0 +1,112 @@
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from app.config import Config
+from app.models import SingletonMeta
+
+# Initialize the logger for this module
+logger = logging.getLogger(__name__)
+
+
+class PrometheusTextfileService(metaclass=SingletonMeta):
+    """
+    Keeps the latest run report of every task and writes them as a file for
+    the node_exporter textfile collector.
+
+    Enabled only when PROMETHEUS_TEXTFILE names the .prom file to write.
+    """
+
+    STAGE_METRICS = [
+        ('wall_ms', 'news_factory_stage_wall_seconds', 'Wall time of a run stage.', 1000),
+        ('cpu_ms', 'news_factory_stage_cpu_seconds', 'Process CPU time spent in a run stage.', 1000),
+        ('rows', 'news_factory_stage_rows', 'Rows handled by a run stage.', 1),
+        ('bytes_written', 'news_factory_stage_bytes_written', 'Bytes written by a run stage.', 1),
+    ]
+
+    def __init__(self):
+        self.textfile_path = Config.get(Config.PROMETHEUS_TEXTFILE_KEY)
+        self.enabled = bool(self.textfile_path)
+        self._tasks = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _escape(value):
+        return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+    def record(self, task_name, report=None, success=True):
+        """
+        Store the outcome of a task and rewrite the textfile.
+
+        Parameters:
+        task_name (str): The task, used as the 'task' label.
+        report (dict, optional): The run report; None when the task failed early.
+        success (bool): Whether the task succeeded.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            previous = self._tasks.get(task_name, {})
+            self._tasks[task_name] = {
+                'finished_at': time.time(),
+                'success': success,
+                # Keep the last good stage timings when a run fails before producing any
+                'report': report if report is not None else previous.get('report'),
+            }
+            content = self.render()
+        self._write(content)
+
+    def render(self):
+        """
+        Returns:
+        str: The metrics in the Prometheus text exposition format.
+        """
+        lines = [
+            '# HELP news_factory_last_run_timestamp_seconds When the task last finished.',
+            '# TYPE news_factory_last_run_timestamp_seconds gauge',
+        ]
+        for task_name, state in sorted(self._tasks.items()):
+            lines.append(f'news_factory_last_run_timestamp_seconds{{task="{self._escape(task_name)}"}} '
+                         f'{state["finished_at"]:.3f}')
+        lines += [
+            '# HELP news_factory_last_run_success Whether the last run of the task succeeded.',
+            '# TYPE news_factory_last_run_success gauge',
+        ]
+        for task_name, state in sorted(self._tasks.items()):
+            lines.append(f'news_factory_last_run_success{{task="{self._escape(task_name)}"}} '
+                         f'{1 if state["success"] else 0}')
+        lines += [
+            '# HELP news_factory_run_wall_seconds Wall time of the last successful run.',
+            '# TYPE news_factory_run_wall_seconds gauge',
+        ]
+        for task_name, state in sorted(self._tasks.items()):
+            if state['report']:
+                lines.append(f'news_factory_run_wall_seconds{{task="{self._escape(task_name)}"}} '
+                             f'{state["report"]["wall_ms"] / 1000:.6f}')
+
+        for field, metric, description, divisor in self.STAGE_METRICS:
+            lines += [f'# HELP {metric} {description}', f'# TYPE {metric} gauge']
+            for task_name, state in sorted(self._tasks.items()):
+                if not state['report']:
+                    continue
+                for stage, totals in sorted(state['report']['stages'].items()):
+                    lines.append(f'{metric}{{task="{self._escape(task_name)}",stage="{self._escape(stage)}"}} '
+                                 f'{totals[field] / divisor:g}')
+        return '\n'.join(lines) + '\n'
+
+    def _write(self, content):
+        """
+        Replace the textfile atomically so the collector never reads a partial file.
+        """
+        directory = os.path.dirname(os.path.abspath(self.textfile_path))
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.news_factory.', suffix='.prom.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as textfile:
+                textfile.write(content)
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, self.textfile_path)
+        except OSError as e:
+            logger.error("Failed to write Prometheus textfile %s: %s", self.textfile_path, e)
@@ -1,9 +1,11 @@
 import asyncio
 import logging
+import os
 
 import aiofiles
 
-from app.config.config import Config
+from app.config.run_settings import RunSettings
+from app.helpers import RunProfiler
 
 # Initialize the logger for this module
 logger = logging.getLogger(__name__)
@@ -12,15 +14,19 @@ logger = logging.getLogger(__name__)
 class ReportService:
 
     @staticmethod
-    def load_template():
+    def load_template(settings=None):
         """
         Load the HTML template.
 
+        Parameters:
+        settings (RunSettings, optional): The run's settings. Defaults to the
+            template configured in the environment.
+
         Returns:
         str: The HTML template as a string.
         """
-        config = Config()
-        return config.load_template()
+        settings = settings or RunSettings.from_args()
+        return settings.calendar_template
 
     @staticmethod
     def reformat_meta_date_no_repeat(df):
@@ -99,7 +105,34 @@ class ReportService:
         return html
 
     @staticmethod
-    async def write_html_report_from_dataframe_async(dataframe, file_path, repeat_date=False, encoding='utf-8', report_name="Report"):
+    def render_html_report(dataframe, template_content, repeat_date=False, report_name="Report"):
+        """
+        Render the HTML report of a DataFrame into the template (synchronous).
+
+        The DataFrame is copied first, so other outputs may read it at the same time.
+
+        Parameters:
+        dataframe (pd.DataFrame): DataFrame to be converted to an HTML report.
+        template_content (str): The HTML template.
+        repeat_date (bool): Whether to repeat the date or not. Default is False.
+        report_name (str): The name of the report to be inserted in the HTML template.
+
+        Returns:
+        str: The HTML document.
+        """
+        dataframe = dataframe.copy()
+        if not repeat_date:
+            dataframe = ReportService.reformat_meta_date_no_repeat(dataframe)
+        dataframe = ReportService.select_and_rename_fields(dataframe)
+        table_html = ReportService.generate_html_with_colors(dataframe)
+
+        # Replace placeholders with actual content
+        return template_content.replace(
+            '{{event_title}}', report_name).replace('{{event_table}}', table_html)
+
+    @staticmethod
+    async def write_html_report_from_dataframe_async(dataframe, file_path, repeat_date=False, encoding='utf-8', report_name="Report", settings=None,
+                                                     profiler=None):
         """
         Generate an HTML report from a pandas DataFrame and save it to a file (asynchronous).
 
@@ -109,32 +142,34 @@ class ReportService:
         repeat_date (bool): Whether to repeat the date or not. Default is False.
         encoding (str): The encoding format.
         report_name (str): The name of the report to be inserted in the HTML template.
+        settings (RunSettings, optional): The run's settings that hold the template.
+        profiler (RunProfiler, optional): Receives the html_render and html_write spans.
         """
+        profiler = profiler or RunProfiler()
         if 'event_time_local' not in dataframe.columns:
             logger.warning(
                 "DataFrame does not contain 'event_time_local' column. Skipping HTML report generation.")
             return -1
 
-        if not repeat_date:
-            dataframe = ReportService.reformat_meta_date_no_repeat(dataframe)
-        dataframe = ReportService.select_and_rename_fields(dataframe)
-        table_html = ReportService.generate_html_with_colors(dataframe)
-
         # Load the HTML template
-        template_content = ReportService.load_template()
+        template_content = ReportService.load_template(settings)
 
         if not template_content:
             logger.error("Invalid template content")
             return -1
 
-        # Replace placeholders with actual content
-        html_content = template_content.replace(
-            '{{event_title}}', report_name).replace('{{event_table}}', table_html)
+        with profiler.span('html_render', label=report_name) as span:
+            span.rows = len(dataframe)
+            # Rendering walks every row, so it runs in a worker thread to keep the event loop free
+            html_content = await asyncio.to_thread(
+                ReportService.render_html_report, dataframe, template_content, repeat_date, report_name)
 
         try:
             # Open the file asynchronously and write the HTML content
-            async with aiofiles.open(file_path, 'w', encoding=encoding) as html_file:
-                await html_file.write(html_content)
+            with profiler.span('html_write', label=report_name) as span:
+                async with aiofiles.open(file_path, 'w', encoding=encoding) as html_file:
+                    await html_file.write(html_content)
+                span.bytes_written = os.path.getsize(file_path)
             logger.info(
                 "Successfully generated HTML report from DataFrame to %s", file_path)
         except Exception as e:
@@ -144,7 +179,7 @@ class ReportService:
         return 0
 
     @staticmethod
-    def write_html_report_from_dataframe(dataframe, file_path, repeat_date=False, encoding='utf-8', report_name="Report"):
+    def write_html_report_from_dataframe(dataframe, file_path, repeat_date=False, encoding='utf-8', report_name="Report", settings=None):
         """
         Generate an HTML report from a pandas DataFrame and save it to a file (synchronous).
 
@@ -154,6 +189,7 @@ class ReportService:
         repeat_date (bool): Whether to repeat the date or not. Default is False.
         encoding (str): The encoding format.
         report_name (str): The name of the report to be inserted in the HTML template.
+        settings (RunSettings, optional): The run's settings that hold the template.
         """
         asyncio.run(ReportService.write_html_report_from_dataframe_async(
-            dataframe, file_path, repeat_date, encoding, report_name))
+            dataframe, file_path, repeat_date, encoding, report_name, settings))
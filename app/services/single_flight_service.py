@@ -0,0 +1,61 @@
+import asyncio
+import logging
+
+from app.models import SingletonMeta
+
+# Initialize the logger for this module
+logger = logging.getLogger(__name__)
+
+
+class SingleFlightService(metaclass=SingletonMeta):
+    """
+    Coalesces concurrent calls that share a key into one in-flight call.
+
+    The first caller for a key starts the work; callers arriving while it is
+    still running await the same task and receive the same result object,
+    which must therefore be treated as read-only.
+    """
+
+    def __init__(self):
+        self.issued = 0
+        self.coalesced = 0
+        self._in_flight = {}
+
+    async def do(self, key, work):
+        """
+        Run work() once for all concurrent callers with the same key.
+
+        Parameters:
+        key (hashable): Identifies calls that may share a result.
+        work (callable): Coroutine function to run when no call is in flight.
+
+        Returns:
+        object: The result of the shared call.
+        """
+        # Tasks belong to one event loop, so keep flights of different loops apart
+        flight_key = (asyncio.get_running_loop(), key)
+        task = self._in_flight.get(flight_key)
+        if task is None:
+            task = asyncio.ensure_future(work())
+            self._in_flight[flight_key] = task
+            task.add_done_callback(lambda done: self._finish(flight_key, done))
+            self.issued += 1
+        else:
+            self.coalesced += 1
+            logger.info("Joining in-flight fetch for %s", key)
+
+        # Shield the shared task so one cancelled caller does not cancel the others
+        return await asyncio.shield(task)
+
+    def _finish(self, flight_key, task):
+        self._in_flight.pop(flight_key, None)
+        if not task.cancelled():
+            # Mark the exception as retrieved when every caller has gone away
+            task.exception()
+
+    def stats(self):
+        """
+        Returns:
+        dict: Number of issued and coalesced calls since the process started.
+        """
+        return {'issued': self.issued, 'coalesced': self.coalesced}
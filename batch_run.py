@@ -0,0 +1,66 @@
+import argparse
+import asyncio
+import logging
+import sys
+
+from app.runtime import TaskConfig
+
+# Setup logging configuration
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+
+async def main_async(task_configs):
+    # Imported once the tasks are loaded, as they load the services
+    from app.runtime import BatchRunner
+    from app.services import AnalysisPoolService, BrowserPoolService, CalendarCacheService
+
+    try:
+        timings = await BatchRunner(task_configs).run_async()
+    finally:
+        await CalendarCacheService().wait_for_refreshes()
+        await BrowserPoolService().shutdown()
+        AnalysisPoolService().shutdown()
+    return 0 if all(timing.succeeded for timing in timings) else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Run several tasks in one process, fetching each distinct calendar once.')
+    parser.add_argument(
+        '--tasks-file', '-f',
+        type=str,
+        help='Task definitions in the app/data/tasks.json format',
+        default=TaskConfig.DEFAULT_TASKS_FILE
+    )
+    parser.add_argument(
+        '--tasks', '-t',
+        type=str,
+        help='Comma-separated task names to run (default: every task in the file)',
+        default=''
+    )
+    args = parser.parse_args()
+
+    try:
+        tasks = TaskConfig.load_tasks(args.tasks_file)
+    except (OSError, ValueError, KeyError) as e:
+        logging.error("Failed to load tasks from %s: %s", args.tasks_file, e)
+        return 1
+
+    if args.tasks:
+        names = [name.strip() for name in args.tasks.split(',') if name.strip()]
+        unknown = [name for name in names if name not in tasks]
+        if unknown:
+            logging.error("Unknown task(s): %s", ', '.join(unknown))
+            return 1
+        task_configs = [tasks[name] for name in names]
+    else:
+        task_configs = list(tasks.values())
+
+    return asyncio.run(main_async(task_configs))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""
+Cleaning benchmark: the former clean_data versus the vectorized one.
+
+For each size, times
+- legacy: the former AnalyzeService.clean_data, which formats the event
+  dates and times row by row and sorts on those strings and time objects
+- vectorized: AnalyzeService.clean_data, which sorts on the integer
+  dateline, followed by AnalyzeService.to_display_frame, which adds the same
+  display columns when a frame is written
+
+and checks that both serialize to the same JSON output. Exits with status 1
+on a mismatch.
+
+Usage:
+    python benchmarks/clean_benchmark.py [--events 1000,10000,100000] [--repeat 5]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import datetime
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd  # noqa: E402
+
+from synthetic_calendar import generate_days  # noqa: E402
+
+from app.helpers.constants import CALENDAR_TIMEZONE  # noqa: E402
+from app.services import AnalyzeService, DataService, OutputService  # noqa: E402
+
+EVENTS_PER_DAY = 50
+
+
+def legacy_path(data):
+    selected_df_copy = data[AnalyzeService.SELECTED_FIELDS].copy()
+    local_timezone = datetime.now().astimezone().tzinfo
+
+    selected_df_copy['timestamp'] = pd.to_datetime(
+        selected_df_copy['dateline'], unit='s', utc=True).dt.tz_convert(CALENDAR_TIMEZONE)
+    selected_df_copy['timestamp_local'] = selected_df_copy['timestamp'].dt.tz_convert(
+        local_timezone)
+    selected_df_copy['event_date'] = selected_df_copy['timestamp'].dt.strftime('%Y-%m-%d')
+    selected_df_copy['event_time'] = selected_df_copy['timestamp'].dt.time
+    selected_df_copy['event_date_local'] = selected_df_copy['timestamp_local'].dt.strftime('%Y-%m-%d')
+    selected_df_copy['event_time_local'] = selected_df_copy['timestamp_local'].dt.time
+    selected_df_copy.loc[:, 'date'] = pd.to_datetime(selected_df_copy['date'])
+
+    return selected_df_copy.sort_values(by=['event_date_local', 'event_time_local'])
+
+
+def vectorized_path(data):
+    return AnalyzeService.to_display_frame(AnalyzeService.clean_data(data))
+
+
+def measure(function, data, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(data)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare the former clean_data with the vectorized one.')
+    parser.add_argument('--events', default='1000,10000,100000', help='Comma-separated event counts')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement (median is reported)')
+    args = parser.parse_args()
+
+    mismatches = 0
+    print(f"{'events':>10}{'legacy ms':>12}{'vectorized ms':>16}{'speedup':>10}")
+    for event_count in (int(count) for count in args.events.split(',')):
+        days_array = generate_days(max(1, event_count // EVENTS_PER_DAY), min(event_count, EVENTS_PER_DAY))
+        data = DataService.build_events_frame(days_array, AnalyzeService.EVENT_FIELDS)
+
+        if OutputService.dataframe_to_json(legacy_path(data)) != \
+                OutputService.dataframe_to_json(vectorized_path(data)):
+            print(f'MISMATCH at {event_count} events')
+            mismatches += 1
+
+        legacy_ms = measure(legacy_path, data, args.repeat)
+        vectorized_ms = measure(vectorized_path, data, args.repeat)
+        print(f'{event_count:>10}{legacy_ms:>12.1f}{vectorized_ms:>16.1f}{legacy_ms / vectorized_ms:>9.1f}x')
+
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
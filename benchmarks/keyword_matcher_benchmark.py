@@ -0,0 +1,84 @@
+"""
+NNFX keyword filtering benchmark: per-currency regex scans versus KeywordMatcher.
+
+For each size, times
+- per-currency regex: DataService.criteria_by_currency_and_keywords, which
+  scans the whole name column once per currency (the old path)
+- keyword matcher: DataService.filter_by_currency_keywords, one pass with the
+  compiled matcher
+
+and checks that both keep the same events. Exits with status 1 on a mismatch.
+
+Usage:
+    python benchmarks/keyword_matcher_benchmark.py [--events 10000,100000,1000000] [--repeat 3]
+        [--filters resources/nnfx_filters.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_calendar import generate_days  # noqa: E402
+
+from app.helpers.keyword_matcher import KeywordMatcher  # noqa: E402
+from app.services import DataService  # noqa: E402
+
+EVENTS_PER_DAY = 100
+
+
+def per_currency_regex(df, filters):
+    return DataService.filter_data(df, DataService.criteria_by_currency_and_keywords(filters))
+
+
+def keyword_matcher(df, filters):
+    return DataService.filter_by_currency_keywords(df, filters)
+
+
+def measure(function, df, filters, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(df, filters)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare per-currency regex scans with KeywordMatcher.')
+    parser.add_argument('--events', default='10000,100000,1000000', help='Comma-separated event counts')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement (median is reported)')
+    parser.add_argument('--filters', default=os.path.join(REPO_ROOT, 'resources', 'nnfx_filters.json'))
+    args = parser.parse_args()
+
+    with open(args.filters, 'r', encoding='utf-8') as f:
+        filters = json.load(f)
+    # Compile outside the timings, as a long-running process does once
+    KeywordMatcher.for_filters(filters)
+
+    mismatches = 0
+    print(f"{'events':>10}{'kept':>9}{'per-currency ms':>18}{'matcher ms':>13}{'speedup':>10}")
+    for event_count in (int(count) for count in args.events.split(',')):
+        days_array = generate_days(max(1, event_count // EVENTS_PER_DAY), min(event_count, EVENTS_PER_DAY))
+        df = DataService.build_events_frame(days_array)
+
+        expected = per_currency_regex(df, filters)
+        actual = keyword_matcher(df, filters)
+        if not expected.index.equals(actual.index):
+            print(f'MISMATCH at {event_count} events: {len(expected)} versus {len(actual)} events kept')
+            mismatches += 1
+
+        regex_ms = measure(per_currency_regex, df, filters, args.repeat)
+        matcher_ms = measure(keyword_matcher, df, filters, args.repeat)
+        print(f'{event_count:>10}{len(actual):>9}{regex_ms:>18.1f}{matcher_ms:>13.1f}{regex_ms / matcher_ms:>9.1f}x')
+
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
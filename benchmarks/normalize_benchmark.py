@@ -0,0 +1,76 @@
+"""
+Normalization benchmark: pd.json_normalize versus the columnar builder.
+
+For each size, times
+- json_normalize: DataService.normalize_events_data, then selecting the
+  columns AnalyzeService.clean_data keeps (the old path)
+- columnar: DataService.build_events_frame for the same columns
+
+and checks that both give the same frame. Exits with status 1 on a mismatch.
+
+Usage:
+    python benchmarks/normalize_benchmark.py [--events 1000,10000,100000] [--repeat 5]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pandas.testing  # noqa: E402
+
+from synthetic_calendar import generate_days  # noqa: E402
+
+from app.models.calendar_fields import CalendarFields  # noqa: E402
+from app.services import DataService  # noqa: E402
+
+EVENTS_PER_DAY = 50
+
+
+def json_normalize_path(days_array):
+    return DataService.normalize_events_data(days_array)[CalendarFields.SELECTED_FIELDS]
+
+
+def columnar_path(days_array):
+    return DataService.build_events_frame(days_array, CalendarFields.ANALYZED_FIELDS)
+
+
+def measure(function, days_array, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(days_array)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare pd.json_normalize with the columnar builder.')
+    parser.add_argument('--events', default='1000,10000,100000', help='Comma-separated event counts')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement (median is reported)')
+    args = parser.parse_args()
+
+    mismatches = 0
+    print(f"{'events':>10}{'json_normalize ms':>20}{'columnar ms':>14}{'speedup':>10}")
+    for event_count in (int(count) for count in args.events.split(',')):
+        days_array = generate_days(max(1, event_count // EVENTS_PER_DAY), min(event_count, EVENTS_PER_DAY))
+
+        try:
+            pandas.testing.assert_frame_equal(json_normalize_path(days_array), columnar_path(days_array))
+        except AssertionError as e:
+            print(f'MISMATCH at {event_count} events: {e}')
+            mismatches += 1
+
+        normalize_ms = measure(json_normalize_path, days_array, args.repeat)
+        columnar_ms = measure(columnar_path, days_array, args.repeat)
+        print(f'{event_count:>10}{normalize_ms:>20.1f}{columnar_ms:>14.1f}{normalize_ms / columnar_ms:>9.1f}x')
+
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
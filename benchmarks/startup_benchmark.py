@@ -0,0 +1,158 @@
+"""
+Startup benchmark for the entry points.
+
+Measures, in fresh interpreters:
+- import: time to import the entry point module (run, run_async, scheduler_script)
+- first job: wall time of a complete 'this week' job, from process start to exit
+
+Jobs run against the stand-in calendar server seeded with a synthetic week, so
+no network access is needed. Exits with status 1 when a median exceeds its
+budget, or when importing an entry point loads one of DEFERRED_MODULES.
+
+Usage:
+    python benchmarks/startup_benchmark.py [--repeat 5] [--import-budget-ms 300]
+        [--first-job-budget-ms 5000] [--engine http]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_calendar import generate_days  # noqa: E402
+
+from app.config import Config  # noqa: E402
+from app.models.time_period import TimePeriod  # noqa: E402
+from app.runtime import StandinServer  # noqa: E402
+from app.services import FixtureArchiveService  # noqa: E402
+
+# Loaded only by the stages that need them, never by importing an entry point
+DEFERRED_MODULES = ['pandas', 'playwright', 'aiofiles']
+
+IMPORT_SNIPPET = '''
+import json, sys, time
+sys.path.insert(0, {root!r})
+started = time.perf_counter()
+import {module}
+elapsed_ms = (time.perf_counter() - started) * 1000
+print(json.dumps({{'ms': elapsed_ms, 'loaded': [name for name in {deferred!r} if name in sys.modules]}}))
+'''
+
+SCHEDULER_JOB_SNIPPET = '''
+import asyncio, sys
+sys.path.insert(0, {root!r})
+import scheduler_script
+scheduler = scheduler_script.Scheduler(tasks_file={tasks_file!r}, schedule_file={schedule_file!r})
+asyncio.run(scheduler.run_task(scheduler.tasks['Benchmark Task']))
+'''
+
+
+def seed_fixtures(fixtures_dir):
+    url = Config.build_period_url(TimePeriod.THIS_WEEK)
+    asyncio.run(FixtureArchiveService(fixtures_dir).save_days_async(url, generate_days(7, 40)))
+
+
+def measure_import(module, env):
+    """
+    Returns:
+    tuple: (import time in ms, the DEFERRED_MODULES the import loaded)
+    """
+    output = subprocess.run(
+        [sys.executable, '-c', IMPORT_SNIPPET.format(root=REPO_ROOT, module=module, deferred=DEFERRED_MODULES)],
+        cwd=REPO_ROOT, env=env, check=True, capture_output=True, text=True).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    return result['ms'], result['loaded']
+
+
+def measure_command(command, env):
+    started = time.perf_counter()
+    result = subprocess.run(command, cwd=REPO_ROOT, env=env, capture_output=True, text=True)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    if result.returncode != 0:
+        raise RuntimeError(f'{command[1]} exited with {result.returncode}:\n{result.stderr[-2000:]}')
+    return elapsed_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure entry point import and first-job latency.')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement (median is reported)')
+    parser.add_argument('--import-budget-ms', type=float, default=300)
+    parser.add_argument('--first-job-budget-ms', type=float, default=5000)
+    parser.add_argument('--engine', default='http', help="Fetch engine of the jobs ('http' or 'playwright')")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='news_factory_startup_') as work_dir:
+        return run_benchmark(args, work_dir)
+
+
+def run_benchmark(args, work_dir):
+    """
+    Measure every entry point, with fixtures and outputs under work_dir.
+
+    Returns:
+    int: The exit status, 1 when a budget is exceeded.
+    """
+    fixtures_dir = os.path.join(work_dir, 'fixtures')
+    output_dir = os.path.join(work_dir, 'output')
+    seed_fixtures(fixtures_dir)
+
+    server = StandinServer(fixtures_dir).start()
+    env = dict(os.environ,
+               BASE_URL=server.base_url,
+               WORKER_CLIENT_ENABLED='false',
+               CALENDAR_CACHE_DIR='',
+               NNFX_FILTERS=os.path.join(REPO_ROOT, 'resources', 'nnfx_filters.json'),
+               CALENDAR_TEMPLATE=os.path.join(REPO_ROOT, 'resources', 'calendar_template.html'))
+
+    tasks_file = os.path.join(work_dir, 'tasks.json')
+    schedule_file = os.path.join(work_dir, 'schedules.json')
+    with open(tasks_file, 'w', encoding='utf-8') as f:
+        json.dump({'tasks': [{
+            'task_name': 'Benchmark Task', 'impact_classes': 'orange,red,gray',
+            'currencies': 'AUD,CAD,CHF,EUR,GBP,JPY,NZD,USD', 'time_period': 'this week',
+            'output_folder': output_dir, 'nnfx': True, 'fetch_engine': args.engine,
+        }]}, f)
+    with open(schedule_file, 'w', encoding='utf-8') as f:
+        json.dump({'schedules': []}, f)
+
+    cli_job = ['-t', 'this week', '-i', 'orange,red,gray', '-n', '-e', args.engine, '-o', output_dir]
+    cases = [
+        ('run.py', 'run', [sys.executable, 'run.py'] + cli_job),
+        ('run_async.py', 'run_async', [sys.executable, 'run_async.py'] + cli_job),
+        ('scheduler_script.py', 'scheduler_script', [sys.executable, '-c', SCHEDULER_JOB_SNIPPET.format(
+            root=REPO_ROOT, tasks_file=tasks_file, schedule_file=schedule_file)]),
+    ]
+
+    failures = []
+    try:
+        print(f"{'entry point':<22}{'import ms':>12}{'first job ms':>16}")
+        for name, module, command in cases:
+            imports = [measure_import(module, env) for _ in range(args.repeat)]
+            import_ms = statistics.median(elapsed_ms for elapsed_ms, _ in imports)
+            loaded = sorted({name for _, names in imports for name in names})
+            job_ms = statistics.median(measure_command(command, env) for _ in range(args.repeat))
+            print(f'{name:<22}{import_ms:>12.0f}{job_ms:>16.0f}')
+            if loaded:
+                failures.append(f"{name}: importing it loads {', '.join(loaded)}")
+            if import_ms > args.import_budget_ms:
+                failures.append(f'{name}: import {import_ms:.0f} ms > {args.import_budget_ms:.0f} ms')
+            if job_ms > args.first_job_budget_ms:
+                failures.append(f'{name}: first job {job_ms:.0f} ms > {args.first_job_budget_ms:.0f} ms')
+    finally:
+        server.stop()
+
+    for failure in failures:
+        print(f'BUDGET EXCEEDED {failure}')
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
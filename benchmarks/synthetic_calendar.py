@@ -0,0 +1,75 @@
+"""
+Synthetic calendar payloads shaped like window.calendarComponentStates[1].days,
+for benchmarks that must run without the live site.
+"""
+import random
+from datetime import datetime, timedelta, timezone
+
+CURRENCIES = ['AUD', 'CAD', 'CHF', 'EUR', 'GBP', 'JPY', 'NZD', 'USD', 'CNY']
+EVENT_NAMES = [
+    'CPI m/m', 'Core CPI m/m', 'Non-Farm Employment Change', 'Unemployment Rate',
+    'GDP q/q', 'Retail Sales m/m', 'FOMC Statement', 'Interest Rate Decision',
+    'Trade Balance', 'Bank Holiday', 'Manufacturing PMI', 'Services PMI',
+    'Employment Change', 'PPI m/m', 'Consumer Confidence', 'Building Permits',
+]
+IMPACTS = [
+    ('icon--ff-impact-yel', 'Low Impact Expected'),
+    ('icon--ff-impact-ora', 'Medium Impact Expected'),
+    ('icon--ff-impact-red', 'High Impact Expected'),
+    ('icon--ff-impact-gra', 'Non-Economic'),
+]
+
+
+def generate_days(num_days=7, events_per_day=20, start=None, seed=1):
+    """
+    Build a days array with the fields the scraper keeps (see CalendarFields).
+
+    Parameters:
+    num_days (int): Number of days.
+    events_per_day (int): Number of events per day.
+    start (datetime, optional): Midnight of the first day in US/Eastern, as UTC.
+        Defaults to the Sunday of the current week.
+    seed (int): Random seed, so runs are comparable.
+
+    Returns:
+    list: The days array.
+    """
+    rng = random.Random(seed)
+    if start is None:
+        today = datetime.now(timezone.utc).replace(hour=4, minute=0, second=0, microsecond=0)
+        start = today - timedelta(days=(today.weekday() + 1) % 7)
+
+    days = []
+    event_id = 100000
+    for day_index in range(num_days):
+        day_start = start + timedelta(days=day_index)
+        dateline = int(day_start.timestamp())
+        events = []
+        for _ in range(events_per_day):
+            event_id += 1
+            currency = rng.choice(CURRENCIES)
+            impact_class, impact_title = rng.choice(IMPACTS)
+            name = rng.choice(EVENT_NAMES)
+            events.append({
+                'id': event_id,
+                'date': day_start.strftime('%b %d, %Y'),
+                'country': currency[:2],
+                'currency': currency,
+                'impactClass': impact_class,
+                'impactTitle': impact_title,
+                'name': name,
+                'trimmedPrefixedName': f'{currency} {name}',
+                'dateline': dateline + rng.randrange(0, 86400, 900),
+                'forecast': f'{rng.uniform(-1, 5):.1f}%',
+                'previous': f'{rng.uniform(-1, 5):.1f}%',
+                'actual': '',
+                'timeLabel': '8:30am',
+                'timeMasked': False,
+            })
+        events.sort(key=lambda event: event['dateline'])
+        days.append({
+            'date': day_start.strftime('%a <span>%b %d</span>'),
+            'dateline': dateline,
+            'events': events,
+        })
+    return days
@@ -31,8 +31,9 @@ LOG_FILE="daily_run.log"
 # Function to run Python script and log output
 run_task() {
     local time_period=$1
-    echo "Running for time period: $time_period" | tee -a "$LOG_FILE"
-    python ./run_async.py --impact-classes orange,red,gray --time-period "$time_period" --nnfx --output-folder "$OUTPUT_FOLDER" >> "$LOG_FILE" 2>&1
+    local derived_periods=$2
+    echo "Running for time period: $time_period (derived: $derived_periods)" | tee -a "$LOG_FILE"
+    python ./run_async.py --impact-classes orange,red,gray --time-period "$time_period" --derive-periods "$derived_periods" --nnfx --output-folder "$OUTPUT_FOLDER" >> "$LOG_FILE" 2>&1
     
     # Check for errors
     if [ $? -ne 0 ]; then
@@ -41,10 +42,9 @@ run_task() {
     fi
 }
 
-# Run the tasks for different time periods
-run_task "today"
-run_task "this week"
-run_task "this month"
+# Fetch this month once and slice today and this week out of it.
+# A week that crosses the month boundary is fetched separately by the script.
+run_task "this month" "today,this week"
 
 # Deactivate the virtual environment
 deactivate
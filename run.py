@@ -1,7 +1,9 @@
 import logging
 import os
-from app import CommandLine
-from app.host import Host
+import sys
+from app import CommandLine, Config
+from app.models.calendar_fetch_error import CalendarFetchError
+from app.runtime import WorkerClient
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG,
@@ -11,6 +13,16 @@ logging.basicConfig(level=logging.DEBUG,
 def main():
     try:
         args = CommandLine.parse_arguments()
+
+        # Hand the job to a warm worker when one is running
+        if Config.get_bool(Config.WORKER_CLIENT_ENABLED_KEY, True):
+            exit_code = WorkerClient().run(args)
+            if exit_code is not None:
+                return exit_code
+
+        # Imported after the arguments are validated, as it loads the services
+        from app.host import Host
+
         # Create an instance of Host with parsed arguments
         instance = Host(args)
 
@@ -21,7 +33,10 @@ def main():
         instance.run()
     except ValueError as e:
         logging.error("Error: %s", e)
+    except CalendarFetchError as e:
+        logging.error("Failed to fetch calendar data from %s: %s", e.url, e)
+        return 1
 
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
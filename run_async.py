@@ -1,9 +1,11 @@
 import asyncio
 import logging
 import os
+import sys
 
-from app import CommandLine
-from app.host import Host
+from app import CommandLine, Config
+from app.models.calendar_fetch_error import CalendarFetchError
+from app.runtime import WorkerClient
 
 # Setup logging configuration
 logging.basicConfig(
@@ -15,16 +17,35 @@ logging.basicConfig(
 async def main_async():
     try:
         args = CommandLine.parse_arguments()
-        # Create an instance of Host with parsed arguments
-        instance = Host(args)
 
-        # Ensure output folder exists
-        os.makedirs(args.output_folder, exist_ok=True)
+        # Hand the job to a warm worker when one is running
+        if Config.get_bool(Config.WORKER_CLIENT_ENABLED_KEY, True):
+            exit_code = WorkerClient().run(args)
+            if exit_code is not None:
+                return exit_code
 
-        # Run the async main function with the parsed arguments
-        await instance.run_async()
+        # Imported after the arguments are validated, as they load the services
+        from app.host import Host
+        from app.services import AnalysisPoolService, BrowserPoolService, CalendarCacheService
+
+        try:
+            # Create an instance of Host with parsed arguments
+            instance = Host(args)
+
+            # Ensure output folder exists
+            os.makedirs(args.output_folder, exist_ok=True)
+
+            # Run the async main function with the parsed arguments
+            await instance.run_async()
+        finally:
+            await CalendarCacheService().wait_for_refreshes()
+            await BrowserPoolService().shutdown()
+            AnalysisPoolService().shutdown()
     except ValueError as e:
         logging.error("Error: %s", e)
+    except CalendarFetchError as e:
+        logging.error("Failed to fetch calendar data from %s: %s", e.url, e)
+        return 1
 
 if __name__ == '__main__':
-    asyncio.run(main_async())
+    sys.exit(asyncio.run(main_async()))
@@ -3,17 +3,17 @@ import json
 import logging
 import os
 import sys
+import time
 from datetime import datetime
 
 import pytz  # Optional, if you need timezone-aware dates.
+from apscheduler.events import EVENT_JOB_SUBMITTED
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
 # Import your existing classes
-from app.host import Host
-from app.models import CommandLineArgs
-from app.models.currencies import Currencies
-from app.models.impact_class import ImpactClass
-from app.models.time_period import TimePeriod
+from app.config import Config
+from app.runtime.run_queue import RunQueue
+from app.runtime.task_config import TaskConfig
 
 # Configure the logging to log INFO-level messages and above
 logging.basicConfig(level=logging.INFO)
@@ -21,6 +21,8 @@ logger = logging.getLogger(__name__)
 
 
 class Scheduler:
+    DEFAULT_CONCURRENCY = 2
+
     def __init__(
         self, tasks_file="app/data/tasks.json", schedule_file="app/data/schedules.json"
     ):
@@ -46,8 +48,15 @@ class Scheduler:
         self.tasks = self.load_tasks_from_json(self.tasks_file)
         self.schedules = self.load_schedule_from_json(self.schedule_file)
 
-        # Initialize the async lock for controlling task execution order
-        self.task_lock = asyncio.Lock()
+        # Bound how many tasks run at once and dispatch them by priority and deadline;
+        # tasks sharing an exclusive_group never overlap
+        self.concurrency = max(
+            1, Config.get_int(Config.SCHEDULER_CONCURRENCY_KEY, self.DEFAULT_CONCURRENCY))
+        self.run_queue = RunQueue(self.execute_task, self.concurrency)
+
+        # Scheduled run times of the jobs APScheduler has just submitted, by job id
+        self.scheduled_run_times = {}
+        self.scheduler.add_listener(self.on_job_submitted, EVENT_JOB_SUBMITTED)
 
     def log_environment_info(self):
         """
@@ -94,11 +103,8 @@ class Scheduler:
         - A dictionary of tasks.
         """
         try:
-            # Open the tasks.json file with utf-8 encoding
-            with open(task_file, "r", encoding="utf-8") as f:
-                task_data = json.load(f)
             # Return tasks in a dictionary where task names are the keys
-            return {task["task_name"]: task for task in task_data["tasks"]}
+            return TaskConfig.load_tasks(task_file)
         except Exception as e:
             # Log an error message if the tasks file cannot be loaded
             logger.error(f"Failed to load tasks from {task_file}: {e}")
@@ -140,102 +146,49 @@ class Scheduler:
             return []
 
     async def run_task(self, task_config):
-        async with self.task_lock:
-            """
-            Asynchronous function to run a task based on its configuration.
+        """
+        Queue a task and wait until it has run, or was dropped for missing its deadline.
 
-            Parameters:
-            - task_config: A dictionary containing the task's configuration.
-            """
-            # Get the time period for the task, or log an error if invalid
-            time_period = task_config["time_period"]
+        Parameters:
+        - task_config: A dictionary containing the task's configuration.
 
-            # Process time period
-            if time_period:
-                time_period = TimePeriod.from_text(time_period.strip())
+        Returns:
+        - The job's final status: 'done', 'failed', 'missed' or 'cancelled'.
+        """
+        job = self.run_queue.submit(task_config)
+        await job.finished.wait()
+        return job.status
 
-            if not time_period:
-                logger.error(
-                    f"Invalid time period: {task_config['time_period']}. Skipping task."
-                )
-                return
-
-            start_date = task_config.get("start_date") or None
-            end_date = task_config.get("end_date") or None
-
-            if time_period == TimePeriod.CUSTOM:
-                if not start_date or not end_date:
-                    raise ValueError(
-                        "Both start-date and end-date must be provided for custom time period"
-                    )
-                start_date = TimePeriod.validate_date_format(start_date)
-                end_date = TimePeriod.validate_date_format(end_date)
-
-            # Use environment variable OUTPUT_FOLDER if output_folder is null in task config
-            output_folder = task_config.get("output_folder") or os.getenv(
-                "OUTPUT_FOLDER", "./data_files"
-            )
+    async def execute_task(self, task_config):
+        """
+        Asynchronous function to run a task based on its configuration.
 
-            # Log the usage of the default output folder if applicable
-            if not task_config.get("output_folder"):
-                logger.info(f"Using default output folder: {output_folder}")
-
-            custom_nnfx_filters = task_config.get("custom_nnfx_filters") or None
-            custom_calendar_template = (
-                task_config.get("custom_calendar_template") or None
-            )  # Handle custom calendar template
-            start_date = (
-                task_config.get("start_date") or None
-            )  # Handle start date if provided
-            end_date = (
-                task_config.get("end_date") or None
-            )  # Handle end date if provided
-
-            impact_classes = task_config["impact_classes"]
-
-            # Process impact classes
-            if impact_classes:
-                impact_classes = [
-                    ImpactClass.from_text(ic.strip())
-                    for ic in impact_classes.split(",")
-                ]
-            else:
-                impact_classes = []
-
-            currencies = task_config["currencies"]
-
-            # Process currencies
-            if currencies:
-                currencies = [
-                    Currencies.from_text(curr.strip()) for curr in currencies.split(",")
-                ]
-            else:
-                currencies = []
-
-            # Log the start of task execution
-            logger.info(
-                f"Starting task: {task_config['task_name']} with output_folder: {output_folder}"
-            )
+        Parameters:
+        - task_config: A dictionary containing the task's configuration.
+        """
+        # Construct command-line arguments from the task configuration
+        args = TaskConfig.to_command_line_args(task_config)
+        if args is None:
+            return
 
-            # Construct command-line arguments dynamically from the task configuration
-            args = CommandLineArgs(
-                impact_classes=impact_classes,
-                currencies=currencies,
-                time_period=time_period,
-                output_folder=output_folder,
-                nnfx=task_config["nnfx"],
-                custom_nnfx_filters=custom_nnfx_filters,
-                custom_calendar_template=custom_calendar_template,
-                start_date=start_date,
-                end_date=end_date,
-            )
+        # Log the start of task execution
+        logger.info(
+            f"Starting task: {task_config['task_name']} with output_folder: {args.output_folder}"
+        )
 
-            # Create a Host object and execute the task asynchronously
-            host = Host(args)
-            await host.run_async()
+        # Create a Host object and execute the task asynchronously
+        from app.host import Host
+        from app.services import PrometheusTextfileService
+        metrics = PrometheusTextfileService()
+        try:
+            result = await Host(args).run_async()
+        except Exception:
+            metrics.record(task_config['task_name'], success=False)
+            raise
+        metrics.record(task_config['task_name'], result['report'])
 
-            # Log the completion of task execution
-            logger.info(f"Completed task: {task_config['task_name']}")
+        # Log the completion of task execution
+        logger.info(f"Completed task: {task_config['task_name']}")
 
     def schedule_tasks(self):
         """
@@ -260,16 +213,32 @@ class Scheduler:
                     f"Task {task_name} has no active cron fields after filtering. Skipping schedule."
                 )
                 continue
+            job_id = f"{task_name}#{len(self.scheduler.get_jobs())}"
             self.scheduler.add_job(
-                self.run_async_task, "cron", args=[task_config], **cron_schedule
+                self.run_async_task, "cron", args=[task_config, job_id], id=job_id, **cron_schedule
             )
             logger.info(f"Scheduled {task_name} with cron: {cron_schedule}")
 
-    async def run_async_task(self, task_config):
+    def on_job_submitted(self, event):
+        """
+        Remember when a submitted job was scheduled to run, to measure its dispatch latency.
         """
-        Asynchronously run the task in the event loop.
+        self.scheduled_run_times[event.job_id] = event.scheduled_run_times[-1]
+
+    async def run_async_task(self, task_config, job_id=None):
         """
-        await self.run_task(task_config)
+        Queue the task from its cron trigger. The run queue runs it when a slot
+        is free, so APScheduler never holds the job back as still running.
+        """
+        scheduled_at = None
+        scheduled_run_time = self.scheduled_run_times.pop(job_id, None)
+        if scheduled_run_time is not None:
+            # Express the scheduled time on the monotonic clock the run queue uses
+            scheduled_at = time.monotonic() - (datetime.now(pytz.utc) - scheduled_run_time).total_seconds()
+        try:
+            self.run_queue.submit(task_config, scheduled_at=scheduled_at)
+        except ValueError as e:
+            logger.error(f"Invalid priority or deadline for task {task_config['task_name']}: {e}")
 
     async def start_scheduler(self):
         """
@@ -282,9 +251,17 @@ class Scheduler:
             # Keep the scheduler running indefinitely by awaiting an infinite loop
             while True:
                 await asyncio.sleep(1)
-        except (KeyboardInterrupt, SystemExit):
+        except (KeyboardInterrupt, SystemExit, asyncio.CancelledError):
             # Log message when the scheduler is gracefully shutting down
             logger.info("Shutting down the scheduler...")
+        finally:
+            # Stop scheduling new jobs and close the shared browser pool
+            self.scheduler.shutdown(wait=False)
+            await self.run_queue.stop()
+            from app.services import AnalysisPoolService, BrowserPoolService, CalendarCacheService
+            await CalendarCacheService().wait_for_refreshes()
+            await BrowserPoolService().shutdown()
+            AnalysisPoolService().shutdown()
 
 
 def check_directory_permissions(directory):
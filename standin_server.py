@@ -0,0 +1,35 @@
+import argparse
+import logging
+
+from app.runtime import StandinServer
+
+# Setup logging configuration
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Serve recorded calendar fixtures on the same URLs as the calendar site.')
+    parser.add_argument(
+        '--fixtures-dir', '-d',
+        type=str,
+        help='Fixture archive written with --fetch-mode record',
+        default='./fixtures'
+    )
+    parser.add_argument('--host', type=str, help='Interface to listen on', default='127.0.0.1')
+    parser.add_argument('--port', '-p', type=int, help='Port to listen on', default=8765)
+    args = parser.parse_args()
+
+    server = StandinServer(args.fixtures_dir, host=args.host, port=args.port)
+    logging.info("Set BASE_URL=%s to scrape the recorded fixtures.", server.base_url)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logging.info("Stand-in calendar server stopped.")
+
+
+if __name__ == '__main__':
+    main()
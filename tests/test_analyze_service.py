@@ -0,0 +1,101 @@
+import asyncio
+import copy
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+import pandas as pd
+
+from app.config.run_settings import RunSettings
+from app.models.output_frame import OutputFrame
+from app.services import AnalysisStateService, AnalyzeService
+
+EDT = timezone(timedelta(hours=-4))
+EST = timezone(timedelta(hours=-5))
+FRAMES = {OutputFrame.CLEANED}
+
+
+def make_days(num_days=3, events_per_day=2):
+    """
+    Build a small days array, one event every hour from 8:00 US/Eastern.
+    """
+    start = datetime(2026, 10, 25, 4, tzinfo=timezone.utc)
+    days = []
+    for day_index in range(num_days):
+        day_start = start + timedelta(days=day_index)
+        events = []
+        for event_index in range(events_per_day):
+            events.append({
+                'id': day_index * 100 + event_index,
+                'date': day_start.strftime('%b %d, %Y'),
+                'country': 'US', 'currency': 'USD',
+                'impactClass': 'icon--ff-impact-red', 'impactTitle': 'High Impact Expected',
+                'name': f'Event {event_index}', 'trimmedPrefixedName': f'USD Event {event_index}',
+                'dateline': int(day_start.timestamp()) + (8 + event_index) * 3600,
+                'forecast': '', 'previous': '', 'actual': '',
+                'timeLabel': f'{8 + event_index}:00am', 'timeMasked': False,
+            })
+        days.append({'date': day_start.strftime('%a <span>%b %d</span>'),
+                     'dateline': int(day_start.timestamp()), 'events': events})
+    return days
+
+
+def analyze_at(timezone_at, days_array, previous=None):
+    """
+    Analyze incrementally as a host whose UTC offset is timezone_at.
+    """
+    unchanged = AnalysisStateService.match_days(previous.days, days_array) if previous else None
+    with mock.patch.object(AnalyzeService, 'local_timezone', return_value=timezone_at):
+        return asyncio.run(AnalyzeService.analyze_incremental(
+            days_array, previous, unchanged, settings=RunSettings(), frames=FRAMES))
+
+
+class IncrementalAnalysisOffsetTest(unittest.TestCase):
+    """
+    Re-analysis across a change of the host's UTC offset, e.g. at the end of
+    daylight saving time while the scheduler keeps running.
+    """
+
+    def setUp(self):
+        self.previous_days = make_days()
+        self.days = copy.deepcopy(self.previous_days)
+        self.days[1]['events'][0]['actual'] = '0.3%'
+
+    def test_offset_change_invalidates_previous_frames(self):
+        previous = analyze_at(EDT, self.previous_days)
+
+        state = analyze_at(EST, self.days, previous)
+
+        self.assertNotEqual(state.analysis_key, previous.analysis_key)
+        expected = analyze_at(EST, self.days).results['cleaned_data']
+        pd.testing.assert_frame_equal(state.results['cleaned_data'], expected)
+        display_df = AnalyzeService.to_display_frame(state.results['cleaned_data'])
+        self.assertEqual(display_df['event_time_local'].iloc[0].hour, 7)
+
+    def test_unchanged_days_reuse_frames_at_the_same_offset(self):
+        previous = analyze_at(EDT, self.previous_days)
+
+        state = analyze_at(EDT, copy.deepcopy(self.previous_days), previous)
+
+        self.assertIs(state.results, previous.results)
+
+    def test_splice_across_two_offsets(self):
+        previous = analyze_at(EDT, self.previous_days)
+        unchanged = AnalysisStateService.match_days(self.previous_days, self.days)
+
+        # The offset changes between the previous run and the cleaning of the changed day
+        with mock.patch.object(AnalyzeService, 'analysis_key', return_value=previous.analysis_key), \
+                mock.patch.object(AnalyzeService, 'local_timezone', return_value=EST):
+            state = asyncio.run(AnalyzeService.analyze_incremental(
+                self.days, previous, unchanged, settings=RunSettings(), frames=FRAMES))
+
+        cleaned_df = state.results['cleaned_data']
+        self.assertIsInstance(cleaned_df['timestamp_local'].dtype, pd.DatetimeTZDtype)
+        self.assertEqual(cleaned_df['timestamp_local'].dt.tz, EST)
+        self.assertEqual(list(cleaned_df.index), list(range(6)))
+        display_df = AnalyzeService.to_display_frame(cleaned_df)
+        self.assertEqual([value.hour for value in display_df['event_time_local']], [7, 8] * 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
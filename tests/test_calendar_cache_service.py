@@ -0,0 +1,123 @@
+import asyncio
+import json
+import os
+import tempfile
+import time
+import unittest
+from datetime import date, datetime, timedelta
+from unittest import mock
+from zoneinfo import ZoneInfo
+
+from app.helpers.constants import CALENDAR_TIMEZONE
+from app.models.singleton import SingletonMeta
+from app.services import CalendarCacheService
+
+START = date(2026, 10, 11)
+END = date(2026, 10, 17)
+TTL_SECONDS = 60
+
+
+def range_closed_at(end):
+    """
+    Unix timestamp of the midnight after the range's last day, US/Eastern.
+    """
+    return datetime.combine(end + timedelta(days=1), datetime.min.time(), ZoneInfo(CALENDAR_TIMEZONE)).timestamp()
+
+
+class CalendarCacheServiceTest(unittest.TestCase):
+
+    def setUp(self):
+        cache_dir = tempfile.TemporaryDirectory(prefix='news_factory_cache_test_')
+        self.addCleanup(cache_dir.cleanup)
+        self.cache_dir = cache_dir.name
+        patches = [
+            mock.patch.dict(os.environ, {
+                'CALENDAR_CACHE_DIR': self.cache_dir,
+                'CALENDAR_CACHE_TTL_SECONDS': str(TTL_SECONDS),
+                'CALENDAR_CACHE_STALE_WHILE_REVALIDATE': 'false'}),
+            # A fresh service, configured from the environment above
+            mock.patch.dict(SingletonMeta._instances),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        SingletonMeta._instances.pop(CalendarCacheService, None)
+        self.cache = CalendarCacheService()
+        self.key = CalendarCacheService.make_key('https://example.com/calendar', START, END)
+        self.fetches = 0
+
+    async def fetch(self):
+        self.fetches += 1
+        return [{'dateline': self.fetches, 'events': []}]
+
+    def get_or_fetch(self, start=START, end=END):
+        return asyncio.run(self.cache.get_or_fetch(self.key, start, end, self.fetch))
+
+    def write_entry(self, fetched_at, end=END):
+        with open(os.path.join(self.cache_dir, f'{self.key}.json'), 'w', encoding='utf-8') as cache_file:
+            json.dump({'fetched_at': fetched_at, 'start': START.isoformat(), 'end': end.isoformat(),
+                       'days': [{'dateline': 0, 'events': []}]}, cache_file)
+
+    def test_make_key_keeps_sites_ranges_and_variants_apart(self):
+        key = CalendarCacheService.make_key('https://www.example.com/calendar?week=this', START, END)
+
+        self.assertEqual(key, 'www.example.com_2026-10-11_2026-10-17')
+        self.assertEqual(CalendarCacheService.make_key('https://www.example.com/', START, END, 'full'),
+                         'www.example.com_2026-10-11_2026-10-17_full')
+
+    def test_miss_then_hit(self):
+        days_array, status = self.get_or_fetch()
+        cached_days, cached_status = self.get_or_fetch()
+
+        self.assertEqual((status, cached_status), (CalendarCacheService.MISS, CalendarCacheService.HIT))
+        self.assertEqual(cached_days, days_array)
+        self.assertEqual(self.fetches, 1)
+
+    def test_open_range_expires_after_the_ttl(self):
+        self.write_entry(fetched_at=time.time() - TTL_SECONDS - 1, end=date.today() + timedelta(days=7))
+
+        days_array, status = self.get_or_fetch(end=date.today() + timedelta(days=7))
+
+        self.assertEqual(status, CalendarCacheService.MISS)
+        self.assertEqual(days_array, [{'dateline': 1, 'events': []}])
+
+    def test_entry_fetched_after_its_range_ended_never_expires(self):
+        self.write_entry(fetched_at=range_closed_at(END) + 1)
+
+        with mock.patch('time.time', return_value=range_closed_at(END) + 365 * 86400):
+            days_array, status = self.get_or_fetch()
+
+        self.assertEqual(status, CalendarCacheService.HIT)
+        self.assertEqual(self.fetches, 0)
+
+    def test_entry_fetched_before_its_range_ended_expires_once_the_range_is_past(self):
+        # Fetched on the range's last evening: later revisions may still be missing
+        self.write_entry(fetched_at=range_closed_at(END) - 3600)
+
+        with mock.patch('time.time', return_value=range_closed_at(END) + 86400):
+            days_array, status = self.get_or_fetch()
+
+        self.assertEqual(status, CalendarCacheService.MISS)
+        self.assertEqual(self.fetches, 1)
+
+    def test_range_closes_at_midnight_in_the_calendar_timezone(self):
+        closed_at = range_closed_at(END)
+
+        self.assertIsNone(self.cache._ttl_for(END, closed_at))
+        self.assertEqual(self.cache._ttl_for(END, closed_at - 1), TTL_SECONDS)
+        # Midnight UTC of the next day is still the range's last evening in US/Eastern
+        utc_midnight = datetime.combine(END + timedelta(days=1), datetime.min.time(), ZoneInfo('UTC')).timestamp()
+        self.assertEqual(self.cache._ttl_for(END, utc_midnight), TTL_SECONDS)
+
+    def test_disabled_cache_always_fetches(self):
+        self.cache.enabled = False
+
+        statuses = [self.get_or_fetch()[1] for _ in range(2)]
+
+        self.assertEqual(statuses, [CalendarCacheService.MISS] * 2)
+        self.assertEqual(self.fetches, 2)
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+import os
+import time
+import unittest
+from datetime import date, datetime, timezone
+from unittest import mock
+from zoneinfo import ZoneInfo
+
+from app.helpers.calendar_slicer import CalendarSlicer
+from app.helpers.constants import CALENDAR_TIMEZONE
+from app.models.time_period import TimePeriod
+
+
+def calendar_midnight(day):
+    """
+    The dateline the site gives a day: midnight in the calendar's timezone.
+    """
+    return int(datetime(day.year, day.month, day.day, tzinfo=ZoneInfo(CALENDAR_TIMEZONE)).timestamp())
+
+
+def make_day(day):
+    return {'date': day.strftime('%a <span>%b %-d</span>'), 'dateline': calendar_midnight(day), 'events': []}
+
+
+class FrozenDatetime(datetime):
+    """
+    A datetime whose now() is fixed, in whatever timezone it is asked for.
+    """
+
+    frozen_at = None
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.frozen_at.astimezone(tz) if tz else cls.frozen_at.astimezone().replace(tzinfo=None)
+
+
+class HostTimezoneTestCase(unittest.TestCase):
+
+    def set_host_timezone(self, name):
+        """
+        Run the test as a host in another timezone, restoring the original afterwards.
+        """
+        original = os.environ.get('TZ')
+
+        def restore():
+            if original is None:
+                os.environ.pop('TZ', None)
+            else:
+                os.environ['TZ'] = original
+            time.tzset()
+
+        self.addCleanup(restore)
+        os.environ['TZ'] = name
+        time.tzset()
+
+
+class CalendarSlicerTest(HostTimezoneTestCase):
+
+    def test_dateline_is_read_in_the_calendar_timezone(self):
+        # Midnight US/Eastern is still the previous evening on the US west coast
+        self.set_host_timezone('America/Los_Angeles')
+
+        self.assertEqual(CalendarSlicer.day_date(make_day(date(2026, 10, 18))), date(2026, 10, 18))
+
+    def test_dateline_across_the_end_of_daylight_saving_time(self):
+        self.set_host_timezone('Asia/Tokyo')
+
+        for day in (date(2026, 10, 31), date(2026, 11, 1), date(2026, 11, 2)):
+            self.assertEqual(CalendarSlicer.day_date(make_day(day)), day)
+
+    def test_label_without_dateline_uses_the_year_hint(self):
+        day = {'date': 'Mon <span>Jan 4</span>', 'events': []}
+
+        self.assertEqual(CalendarSlicer.day_date(day, 2027), date(2027, 1, 4))
+        self.assertIsNone(CalendarSlicer.day_date(day))
+        self.assertIsNone(CalendarSlicer.day_date({'date': 'Mon', 'events': []}, 2027))
+
+    def test_slice_days_keeps_the_days_inside_the_range(self):
+        self.set_host_timezone('America/Los_Angeles')
+        days_array = [make_day(date(2026, 10, day)) for day in range(11, 18)]
+
+        sliced = CalendarSlicer.slice_days(days_array, date(2026, 10, 17), date(2026, 10, 17))
+
+        self.assertEqual(sliced, [days_array[-1]])
+
+    def test_slice_days_across_new_year_without_datelines(self):
+        days_array = [{'date': label, 'events': []}
+                      for label in ('Wed <span>Dec 30</span>', 'Thu <span>Dec 31</span>', 'Fri <span>Jan 1</span>')]
+
+        sliced = CalendarSlicer.slice_days(days_array, date(2026, 12, 31), date(2027, 1, 1))
+
+        self.assertEqual([day['date'] for day in sliced], ['Thu <span>Dec 31</span>', 'Fri <span>Jan 1</span>'])
+
+
+class CalendarTodayTest(HostTimezoneTestCase):
+
+    def freeze(self, frozen_at):
+        FrozenDatetime.frozen_at = frozen_at
+        patcher = mock.patch('app.models.time_period.datetime', FrozenDatetime)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_today_is_the_calendar_date_not_the_host_date(self):
+        # 02:00 UTC on Sunday is still Saturday evening in US/Eastern
+        self.set_host_timezone('UTC')
+        self.freeze(datetime(2026, 10, 18, 2, tzinfo=timezone.utc))
+
+        self.assertEqual(TimePeriod.calendar_today(), date(2026, 10, 17))
+        self.assertEqual(TimePeriod.resolve_date_range(TimePeriod.THIS_WEEK),
+                         (date(2026, 10, 11), date(2026, 10, 17)))
+
+    def test_host_ahead_of_the_calendar(self):
+        # Monday morning in Tokyo is Sunday in US/Eastern
+        self.set_host_timezone('Asia/Tokyo')
+        self.freeze(datetime(2026, 10, 19, 9, tzinfo=ZoneInfo('Asia/Tokyo')))
+
+        self.assertEqual(TimePeriod.resolve_date_range(TimePeriod.TODAY), (date(2026, 10, 18), date(2026, 10, 18)))
+        self.assertEqual(TimePeriod.resolve_date_range(TimePeriod.LAST_MONTH),
+                         (date(2026, 9, 1), date(2026, 9, 30)))
+
+    def test_weeks_and_months_around_a_reference_date(self):
+        today = date(2026, 10, 17)
+
+        resolved = {period: TimePeriod.resolve_date_range(period, today=today) for period in (
+            TimePeriod.YESTERDAY, TimePeriod.TOMORROW, TimePeriod.LAST_WEEK, TimePeriod.NEXT_WEEK,
+            TimePeriod.THIS_MONTH, TimePeriod.NEXT_MONTH)}
+
+        self.assertEqual(resolved, {
+            TimePeriod.YESTERDAY: (date(2026, 10, 16), date(2026, 10, 16)),
+            TimePeriod.TOMORROW: (date(2026, 10, 18), date(2026, 10, 18)),
+            TimePeriod.LAST_WEEK: (date(2026, 10, 4), date(2026, 10, 10)),
+            TimePeriod.NEXT_WEEK: (date(2026, 10, 18), date(2026, 10, 24)),
+            TimePeriod.THIS_MONTH: (date(2026, 10, 1), date(2026, 10, 31)),
+            TimePeriod.NEXT_MONTH: (date(2026, 11, 1), date(2026, 11, 30)),
+        })
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+
+from app.helpers.date_range_sharder import DateRangeSharder
+from app.models.shard_by import ShardBy
+from app.services import ForexFactoryScraperService
+
+
+def day(dateline, label=None):
+    return {'date': label or str(dateline), 'dateline': dateline, 'events': []}
+
+
+class DateRangeSharderTest(unittest.TestCase):
+
+    def test_weeks_run_sunday_to_saturday_and_are_clipped_to_the_range(self):
+        # 2026-10-14 is a Wednesday, 2026-10-27 a Tuesday
+        shards = DateRangeSharder.split('2026-10-14', '2026-10-27', ShardBy.WEEK)
+
+        self.assertEqual(shards, [
+            ('2026-10-14', '2026-10-17'),
+            ('2026-10-18', '2026-10-24'),
+            ('2026-10-25', '2026-10-27'),
+        ])
+
+    def test_range_starting_on_saturday_gets_a_one_day_week(self):
+        shards = DateRangeSharder.split('2026-10-17', '2026-10-18', ShardBy.WEEK)
+
+        self.assertEqual(shards, [('2026-10-17', '2026-10-17'), ('2026-10-18', '2026-10-18')])
+
+    def test_months_end_on_the_last_day_of_each_month(self):
+        shards = DateRangeSharder.split('2026-01-15', '2026-04-10', ShardBy.MONTH)
+
+        self.assertEqual(shards, [
+            ('2026-01-15', '2026-01-31'),
+            ('2026-02-01', '2026-02-28'),
+            ('2026-03-01', '2026-03-31'),
+            ('2026-04-01', '2026-04-10'),
+        ])
+
+    def test_months_cross_a_leap_day_and_a_year_end(self):
+        shards = DateRangeSharder.split('2027-12-31', '2028-03-01', ShardBy.MONTH)
+
+        self.assertEqual(shards, [
+            ('2027-12-31', '2027-12-31'),
+            ('2028-01-01', '2028-01-31'),
+            ('2028-02-01', '2028-02-29'),
+            ('2028-03-01', '2028-03-01'),
+        ])
+
+    def test_single_day_and_no_sharding_keep_the_range(self):
+        for shard_by in ShardBy:
+            self.assertEqual(DateRangeSharder.split('2026-10-17', '2026-10-17', shard_by),
+                             [('2026-10-17', '2026-10-17')])
+        self.assertEqual(DateRangeSharder.split('2026-01-01', '2026-12-31', ShardBy.NONE),
+                         [('2026-01-01', '2026-12-31')])
+
+    def test_start_after_end_is_rejected(self):
+        for shard_by in ShardBy:
+            with self.assertRaises(ValueError):
+                DateRangeSharder.split('2026-10-18', '2026-10-17', shard_by)
+
+
+class MergeDaysTest(unittest.TestCase):
+
+    def test_days_shared_by_shards_are_kept_once(self):
+        first_shard = [day(100, 'first copy'), day(200)]
+        second_shard = [day(200, 'second copy'), day(100, 'second copy'), day(300)]
+
+        merged = ForexFactoryScraperService.merge_days([first_shard, second_shard])
+
+        self.assertEqual([item['dateline'] for item in merged], [100, 200, 300])
+        self.assertEqual(merged[0]['date'], 'first copy')
+        self.assertIs(merged[1], first_shard[1])
+
+    def test_days_are_sorted_by_dateline(self):
+        merged = ForexFactoryScraperService.merge_days([[day(300)], [day(100), day(200)]])
+
+        self.assertEqual([item['dateline'] for item in merged], [100, 200, 300])
+
+    def test_days_without_dateline_are_keyed_by_date_and_keep_their_order(self):
+        merged = ForexFactoryScraperService.merge_days([
+            [{'date': 'Tue', 'events': []}, {'date': 'Mon', 'events': []}],
+            [{'date': 'Mon', 'events': [{'id': 1}]}],
+        ])
+
+        self.assertEqual([item['date'] for item in merged], ['Tue', 'Mon'])
+        self.assertEqual(merged[1]['events'], [])
+
+    def test_no_shards_merge_to_no_days(self):
+        self.assertEqual(ForexFactoryScraperService.merge_days([]), [])
+        self.assertEqual(ForexFactoryScraperService.merge_days([[], []]), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
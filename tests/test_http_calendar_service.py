@@ -0,0 +1,103 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from app.helpers import CalendarMarkupError, CalendarStateParser
+from app.models.fetch_engine import FetchEngine
+from app.models.fetch_metrics import FetchMetrics
+from app.runtime import StandinServer
+from app.services import ForexFactoryScraperService, HttpCalendarService
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+SAVED_PAGE_PATH = '/calendar?week=this'
+
+
+class HttpCalendarServiceTest(unittest.TestCase):
+    """
+    Fetches saved calendar pages from a local stand-in server.
+    """
+
+    def setUp(self):
+        self.fixtures_dir = tempfile.mkdtemp(prefix='news_factory_test_')
+        self.addCleanup(shutil.rmtree, self.fixtures_dir)
+        shutil.copy(os.path.join(FIXTURES_DIR, 'calendar_week=this.html'), self.fixtures_dir)
+        self.server = StandinServer(self.fixtures_dir).start()
+        self.addCleanup(self.server.stop)
+        # Keep every attempt on the engine under test
+        patcher = mock.patch.dict(os.environ, {'FETCH_HEDGE_ENABLED': 'false'})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def serve_page(self, path, html):
+        with open(os.path.join(self.fixtures_dir, f'{self.server.archive.key_for(path)}.html'),
+                  'w', encoding='utf-8') as page_file:
+            page_file.write(html)
+
+    def test_extract_days_from_saved_page(self):
+        url = self.server.base_url + SAVED_PAGE_PATH
+        html = HttpCalendarService().fetch_page(url).text
+
+        days_array = CalendarStateParser.extract_days(html)
+
+        self.assertEqual([day['dateline'] for day in days_array], [1791777600, 1791864000])
+        self.assertEqual(days_array[0]['events'], [])
+        cpi = days_array[1]['events'][1]
+        self.assertEqual(cpi['name'], 'CPI m/m')
+        self.assertEqual(cpi['actual'], '0.3%')
+        self.assertEqual(cpi['notice'], 'Data <b>revised</b> at 8:31am')
+
+    def test_fetch_days_records_parsed_page(self):
+        url = self.server.base_url + SAVED_PAGE_PATH
+        recorded = {}
+
+        async def record(page_url, html):
+            recorded[page_url] = html
+
+        days_array = asyncio.run(HttpCalendarService().fetch_days_async(url, on_page=record))
+
+        self.assertEqual(len(days_array), 2)
+        self.assertEqual(list(recorded), [url])
+        self.assertEqual(CalendarStateParser.extract_days(recorded[url]), days_array)
+
+    def test_unrecognized_markup_raises(self):
+        self.serve_page('/calendar?week=next', '<html><script>window.calendarComponentStates[1] = '
+                                               'buildCalendarState();</script></html>')
+        html = HttpCalendarService().fetch_page(self.server.base_url + '/calendar?week=next').text
+
+        with self.assertRaises(CalendarMarkupError):
+            CalendarStateParser.extract_days(html)
+
+    def test_unrecognized_markup_falls_back_to_playwright(self):
+        self.serve_page('/calendar?week=next', '<html><script>window.calendarComponentStates[1] = '
+                                               'buildCalendarState();</script></html>')
+        url = self.server.base_url + '/calendar?week=next'
+        browser_days = [{'date': 'Sun <span>Oct 18</span>', 'dateline': 1792382400, 'events': []}]
+        browser_metrics = FetchMetrics(url=url, engine=FetchEngine.to_text(FetchEngine.PLAYWRIGHT))
+        scraper = ForexFactoryScraperService(url=url, engine=FetchEngine.HTTP)
+
+        with mock.patch.object(ForexFactoryScraperService, '_fetch_calendar',
+                               mock.AsyncMock(return_value=(browser_days, browser_metrics))) as fetch_in_browser:
+            days_array = asyncio.run(scraper.get_calendar_async())
+
+        fetch_in_browser.assert_awaited_once_with(url)
+        self.assertEqual(days_array, browser_days)
+        self.assertIs(scraper.last_fetch_metrics, browser_metrics)
+
+    def test_recognized_markup_does_not_launch_playwright(self):
+        url = self.server.base_url + SAVED_PAGE_PATH
+        scraper = ForexFactoryScraperService(url=url, engine=FetchEngine.HTTP)
+
+        with mock.patch.object(ForexFactoryScraperService, '_fetch_calendar', mock.AsyncMock()) as fetch_in_browser:
+            days_array = asyncio.run(scraper.get_calendar_async())
+
+        fetch_in_browser.assert_not_awaited()
+        # The scraper projects events to CalendarFields
+        self.assertNotIn('notice', days_array[1]['events'][1])
+        self.assertEqual(days_array[1]['events'][1]['forecast'], '0.2%')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+
+import pandas as pd
+
+from app.helpers.keyword_matcher import KeywordMatcher
+from app.services import DataService
+
+
+def events(*rows):
+    return pd.DataFrame(rows, columns=['currency', 'name'])
+
+
+class KeywordMatcherTest(unittest.TestCase):
+
+    def test_metacharacters_are_matched_literally(self):
+        matcher = KeywordMatcher({'USD': ['Non-Farm', 'S&P', 'm/m (Prelim)', '.']})
+        df = events(
+            ('USD', 'Non-Farm Employment Change'),
+            ('USD', 'S&P Global Services PMI'),
+            ('USD', 'Core CPI m/m (Prelim)'),
+            ('USD', 'Core CPI m/m'),
+            ('USD', 'NonXFarm Payrolls'),
+        )
+
+        matched = matcher.match(df).tolist()
+
+        # '.' only matches a literal dot, and '(Prelim)' is not a regex group
+        self.assertEqual(matched, ['Non-Farm', 'S&P', 'm/m (Prelim)', None, None])
+
+    def test_matching_ignores_case_and_reports_the_keyword_as_written(self):
+        matcher = KeywordMatcher({'USD': ['non-farm'], 'EUR': ['CPI']})
+        df = events(
+            ('USD', 'NON-FARM Employment Change'),
+            ('EUR', 'German Prelim cpi m/m'),
+            ('EUR', 'Non-Farm Employment Change'),
+        )
+
+        self.assertEqual(matcher.match(df).tolist(), ['non-farm', 'CPI', None])
+
+    def test_reports_the_first_keyword_found_in_the_name(self):
+        matcher = KeywordMatcher({'USD': ['Employment', 'Non-Farm']})
+
+        self.assertEqual(matcher.match(events(('USD', 'Non-Farm Employment Change'))).tolist(), ['Non-Farm'])
+
+    def test_currency_without_filters_and_missing_names_do_not_match(self):
+        matcher = KeywordMatcher({'USD': ['CPI']})
+        df = events(('GBP', 'CPI y/y'), ('USD', None))
+
+        self.assertEqual(matcher.match(df).tolist(), [None, None])
+
+    def test_filters_with_the_same_content_share_a_matcher(self):
+        first = KeywordMatcher.for_filters({'USD': ['CPI', 'S&P']})
+        second = KeywordMatcher.for_filters({'USD': ('CPI', 'S&P')})
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, KeywordMatcher.for_filters({'USD': ['CPI']}))
+
+    def test_filter_by_currency_keywords(self):
+        df = events(('USD', 'S&P Global PMI'), ('USD', 'Crude Oil Inventories'), ('EUR', 'S&P Global PMI'))
+
+        filtered_df = DataService.filter_by_currency_keywords(df, {'USD': ['s&p']})
+
+        self.assertEqual(list(filtered_df.index), [0])
+        self.assertEqual(filtered_df['matched_keyword'].tolist(), ['s&p'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import asyncio
+import time
+import unittest
+
+from app.runtime import RunQueue
+
+
+class RecordingRunner:
+    """
+    Runs jobs until released, recording their start order and overlap.
+    """
+
+    def __init__(self):
+        self.started = []
+        self.running = set()
+        self.overlaps = []
+        self.releases = {}
+
+    async def run_job(self, task_config):
+        name = task_config['task_name']
+        self.overlaps.append((name, set(self.running)))
+        self.started.append(name)
+        self.running.add(name)
+        try:
+            await self.releases.setdefault(name, asyncio.Event()).wait()
+        finally:
+            self.running.discard(name)
+
+    def release(self, name):
+        self.releases.setdefault(name, asyncio.Event()).set()
+
+
+async def settle():
+    # Let the dispatchers pick up what is eligible
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class RunQueueTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.runner = RecordingRunner()
+
+    async def start_queue(self, concurrency):
+        queue = RunQueue(self.runner.run_job, concurrency)
+        self.addAsyncCleanup(queue.stop)
+        return queue
+
+    async def test_job_past_its_deadline_is_dropped(self):
+        queue = await self.start_queue(1)
+        blocker = queue.submit({'task_name': 'blocker'})
+        await settle()
+        late = queue.submit({'task_name': 'late', 'deadline_seconds': 0.05})
+        on_time = queue.submit({'task_name': 'on_time', 'deadline_seconds': 10})
+
+        # The only slot frees up after the deadline of 'late'
+        await asyncio.sleep(0.1)
+        self.runner.release('blocker')
+        self.runner.release('on_time')
+        await asyncio.wait_for(asyncio.gather(late.finished.wait(), on_time.finished.wait()), 1)
+
+        self.assertEqual(late.status, 'missed')
+        self.assertEqual(on_time.status, 'done')
+        self.assertEqual(queue.misfires['late'], 1)
+        self.assertEqual(self.runner.started, ['blocker', 'on_time'])
+
+    async def test_duplicate_task_names_are_coalesced(self):
+        queue = await self.start_queue(1)
+        queue.submit({'task_name': 'blocker'})
+        await settle()
+
+        scheduled_at = time.monotonic()
+        first = queue.submit({'task_name': 'report', 'deadline_seconds': 10}, scheduled_at)
+        second = queue.submit({'task_name': 'report', 'deadline_seconds': 20}, scheduled_at)
+        self.runner.release('blocker')
+        self.runner.release('report')
+        await asyncio.wait_for(first.finished.wait(), 1)
+
+        self.assertIs(first, second)
+        self.assertEqual(first.coalesced, 1)
+        self.assertEqual(queue.coalesced['report'], 1)
+        # The coalesced job may start until the later deadline
+        self.assertEqual(first.deadline, scheduled_at + 20)
+        self.assertEqual(self.runner.started, ['blocker', 'report'])
+
+    async def test_exclusive_group_members_do_not_overlap(self):
+        queue = await self.start_queue(3)
+        first = queue.submit({'task_name': 'first', 'exclusive_group': 'site'})
+        second = queue.submit({'task_name': 'second', 'exclusive_group': 'site'})
+        other = queue.submit({'task_name': 'other'})
+        await settle()
+
+        self.assertEqual(self.runner.running, {'first', 'other'})
+        self.runner.release('first')
+        await asyncio.wait_for(first.finished.wait(), 1)
+        await settle()
+        self.assertIn('second', self.runner.running)
+
+        self.runner.release('second')
+        self.runner.release('other')
+        await asyncio.wait_for(asyncio.gather(second.finished.wait(), other.finished.wait()), 1)
+        overlaps = dict(self.runner.overlaps)
+        self.assertNotIn('first', overlaps['second'])
+        self.assertEqual(self.runner.started, ['first', 'other', 'second'])
+
+    async def test_higher_priority_runs_first(self):
+        queue = await self.start_queue(1)
+        queue.submit({'task_name': 'blocker'})
+        await settle()
+        low = queue.submit({'task_name': 'low'})
+        high = queue.submit({'task_name': 'high', 'priority': 5})
+
+        for name in ('blocker', 'low', 'high'):
+            self.runner.release(name)
+        await asyncio.wait_for(asyncio.gather(low.finished.wait(), high.finished.wait()), 1)
+
+        self.assertEqual(self.runner.started, ['blocker', 'high', 'low'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import asyncio
+import tempfile
+import unittest
+from unittest import mock
+
+from app.models.fetch_engine import FetchEngine
+from app.models.fetch_mode import FetchMode
+from app.services import ForexFactoryScraperService, SingleFlightService
+
+URL = 'http://127.0.0.1:8811/calendar?week=this'
+
+
+class SingleFlightServiceTest(unittest.TestCase):
+    """
+    Concurrent calls with the same key share one call.
+    """
+
+    def test_concurrent_callers_share_one_call(self):
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return ['day']
+
+        async def main():
+            return await asyncio.gather(*(SingleFlightService().do('key', work) for _ in range(5)))
+
+        results = asyncio.run(main())
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [['day']] * 5)
+        # Every caller gets the same object
+        self.assertTrue(all(result is results[0] for result in results))
+
+    def test_exception_reaches_every_caller(self):
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            raise RuntimeError('fetch failed')
+
+        async def main():
+            return await asyncio.gather(*(SingleFlightService().do('failing', work) for _ in range(3)),
+                                        return_exceptions=True)
+
+        results = asyncio.run(main())
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(results), 3)
+        for result in results:
+            self.assertIsInstance(result, RuntimeError)
+            self.assertEqual(str(result), 'fetch failed')
+
+    def test_later_call_starts_a_new_flight(self):
+        calls = []
+
+        async def work():
+            calls.append(1)
+            return len(calls)
+
+        async def main():
+            first = await SingleFlightService().do('sequential', work)
+            second = await SingleFlightService().do('sequential', work)
+            return first, second
+
+        self.assertEqual(asyncio.run(main()), (1, 2))
+
+
+class ScraperFlightKeyTest(unittest.TestCase):
+    """
+    Scrapers only share a fetch when they would fetch the same days.
+    """
+
+    def fetch_concurrently(self, scrapers):
+        async def main():
+            return await asyncio.gather(*(scraper.get_calendar_async() for scraper in scrapers))
+
+        return asyncio.run(main())
+
+    def patch_fetch(self, scraper, days_array):
+        async def fetch(url):
+            await asyncio.sleep(0.01)
+            return days_array, None
+
+        fetch_mock = mock.AsyncMock(side_effect=fetch)
+        scraper._fetch_days_uncoalesced = fetch_mock
+        return fetch_mock
+
+    def test_same_settings_share_one_fetch(self):
+        first = ForexFactoryScraperService(URL, engine=FetchEngine.HTTP)
+        second = ForexFactoryScraperService(URL, engine=FetchEngine.HTTP)
+        first_fetch = self.patch_fetch(first, ['http'])
+        second_fetch = self.patch_fetch(second, ['other'])
+
+        results = self.fetch_concurrently([first, second])
+
+        self.assertEqual(results, [['http'], ['http']])
+        self.assertEqual(first_fetch.await_count + second_fetch.await_count, 1)
+
+    def test_engines_do_not_share_a_fetch(self):
+        http_scraper = ForexFactoryScraperService(URL, engine=FetchEngine.HTTP)
+        browser_scraper = ForexFactoryScraperService(URL, engine=FetchEngine.PLAYWRIGHT)
+        self.patch_fetch(http_scraper, ['http'])
+        self.patch_fetch(browser_scraper, ['playwright'])
+
+        results = self.fetch_concurrently([http_scraper, browser_scraper])
+
+        self.assertEqual(results, [['http'], ['playwright']])
+
+    def test_fixtures_directories_do_not_share_a_fetch(self):
+        with tempfile.TemporaryDirectory() as first_dir, tempfile.TemporaryDirectory() as second_dir:
+            first = ForexFactoryScraperService(URL, fetch_mode=FetchMode.REPLAY, fixtures_dir=first_dir)
+            second = ForexFactoryScraperService(URL, fetch_mode=FetchMode.REPLAY, fixtures_dir=second_dir)
+            live = ForexFactoryScraperService(URL)
+            self.patch_fetch(first, ['first'])
+            self.patch_fetch(second, ['second'])
+            self.patch_fetch(live, ['live'])
+
+            results = self.fetch_concurrently([first, second, live])
+
+        self.assertEqual(results, [['first'], ['second'], ['live']])
+
+
+if __name__ == '__main__':
+    unittest.main()
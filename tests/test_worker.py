@@ -0,0 +1,144 @@
+import asyncio
+import os
+import socket
+import stat
+import sys
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from app.models.command_line_args import CommandLineArgs
+from app.models.time_period import TimePeriod
+from app.runtime import WorkerClient, WorkerServer
+from app.services import BrowserPoolService
+
+
+def make_args(output_folder):
+    return CommandLineArgs(impact_classes=[], currencies=[], time_period=TimePeriod.THIS_WEEK,
+                           output_folder=output_folder, nnfx=False, custom_nnfx_filters=None,
+                           custom_calendar_template=None)
+
+
+class HangUpServer:
+    """
+    A worker that reads the job and goes away before replying, as a worker
+    killed mid-job would.
+    """
+
+    def __init__(self, socket_path):
+        self.requests = []
+        self._listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._listener.bind(socket_path)
+        self._listener.listen(1)
+        self._thread = threading.Thread(target=self._serve_one, daemon=True)
+        self._thread.start()
+
+    def _serve_one(self):
+        connection, _ = self._listener.accept()
+        with connection:
+            self.requests.append(connection.makefile('rb').readline())
+
+    def close(self):
+        self._thread.join(5)
+        self._listener.close()
+
+
+class WorkerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        work_dir = tempfile.TemporaryDirectory(prefix='news_factory_worker_test_')
+        self.addCleanup(work_dir.cleanup)
+        self.work_dir = work_dir.name
+        self.socket_path = os.path.join(self.work_dir, 'worker.sock')
+
+
+class WorkerServerTest(WorkerTestCase):
+
+    def serve(self, server, client_call):
+        """
+        Start the server, make one blocking client call against it and stop it.
+        """
+        async def main():
+            with mock.patch.object(BrowserPoolService, 'warm_up', mock.AsyncMock()), \
+                    mock.patch.object(BrowserPoolService, 'shutdown', mock.AsyncMock()):
+                await server.start()
+                try:
+                    return await asyncio.to_thread(client_call)
+                finally:
+                    await server.stop()
+
+        return asyncio.run(main())
+
+    def test_socket_is_private_to_the_user(self):
+        server = WorkerServer(self.socket_path)
+
+        mode = self.serve(server, lambda: stat.S_IMODE(os.stat(self.socket_path).st_mode))
+
+        self.assertEqual(mode, 0o600)
+        self.assertFalse(os.path.exists(self.socket_path))
+
+    def test_default_socket_directory_is_private(self):
+        with mock.patch.dict(os.environ, {'XDG_RUNTIME_DIR': self.work_dir, 'WORKER_SOCKET': ''}):
+            server = WorkerServer()
+            reply = self.serve(server, lambda: WorkerClient().request({'action': 'ping'}))
+
+            socket_dir = WorkerClient.default_socket_dir()
+        self.assertEqual(server.socket_path, os.path.join(self.work_dir, 'news_factory', 'worker.sock'))
+        self.assertEqual(stat.S_IMODE(os.stat(socket_dir).st_mode), 0o700)
+        self.assertEqual(reply['status'], 'ok')
+        self.assertEqual(reply['pid'], os.getpid())
+
+    def test_unknown_action_is_an_error(self):
+        reply = self.serve(WorkerServer(self.socket_path),
+                           lambda: WorkerClient(self.socket_path).request({'action': 'reboot'}))
+
+        self.assertEqual(reply['status'], 'error')
+
+
+class WorkerClientTest(WorkerTestCase):
+
+    def test_no_worker_means_run_in_process(self):
+        self.assertIsNone(WorkerClient(self.socket_path).run(make_args(self.work_dir)))
+
+    def test_socket_of_another_user_is_not_used(self):
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.addCleanup(listener.close)
+        listener.bind(self.socket_path)
+        listener.listen(1)
+        listener.setblocking(False)
+
+        with mock.patch('os.getuid', return_value=os.getuid() + 1), \
+                self.assertLogs('app.runtime.worker_client', 'WARNING'):
+            self.assertIsNone(WorkerClient(self.socket_path).run(make_args(self.work_dir)))
+        # The client never connected
+        with self.assertRaises(BlockingIOError):
+            listener.accept()
+
+    def test_job_lost_after_sending_fails_instead_of_running_again(self):
+        server = HangUpServer(self.socket_path)
+
+        with self.assertLogs('app.runtime.worker_client', 'ERROR'):
+            exit_code = WorkerClient(self.socket_path).run(make_args(self.work_dir))
+        server.close()
+
+        self.assertEqual(exit_code, 1)
+        self.assertEqual(len(server.requests), 1)
+
+    def test_entry_point_does_not_run_a_sent_job_in_process(self):
+        import run_async
+        server = HangUpServer(self.socket_path)
+        argv = ['run_async.py', '-t', 'this week', '-o', self.work_dir]
+
+        with mock.patch.dict(os.environ, {'WORKER_SOCKET': self.socket_path, 'WORKER_CLIENT_ENABLED': 'true'}), \
+                mock.patch.object(sys, 'argv', argv), mock.patch('app.host.Host') as host, \
+                self.assertLogs('app.runtime.worker_client', 'ERROR'):
+            exit_code = asyncio.run(run_async.main_async())
+        server.close()
+
+        self.assertEqual(exit_code, 1)
+        host.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
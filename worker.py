@@ -0,0 +1,54 @@
+import argparse
+import asyncio
+import logging
+import signal
+import sys
+
+from app.runtime import WorkerClient, WorkerServer
+
+# Setup logging configuration
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+
+async def main_async(socket_path, concurrency):
+    server_task = asyncio.create_task(
+        WorkerServer(socket_path, concurrency=concurrency).serve_forever())
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, server_task.cancel)
+    try:
+        await server_task
+    except asyncio.CancelledError:
+        logging.info("Worker shut down.")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Keep imports and a browser warm and run jobs sent by run.py / run_async.py.')
+    parser.add_argument(
+        '--socket', '-s',
+        type=str,
+        help='Unix domain socket to listen on (default: WORKER_SOCKET or a file in a private per-user directory)',
+        default=None
+    )
+    parser.add_argument(
+        '--concurrency', '-c',
+        type=int,
+        help='Number of jobs run at the same time (default: WORKER_CONCURRENCY or 2)',
+        default=None
+    )
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(main_async(args.socket or WorkerClient.default_socket_path(), args.concurrency))
+    except RuntimeError as e:
+        logging.error("%s", e)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())